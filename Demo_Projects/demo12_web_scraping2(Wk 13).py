@@ -14,8 +14,14 @@ original name: web_scraping_lab_v2.py
     along with correcting my variable names to lower case and making the file function names more fitting.
     I also changed the file save mode from write binary to just plain write.
 """
+import os
+import sys
+
 from bs4 import BeautifulSoup as soup       # As soup so you don't have to keep typing BeautifulSoup
-import requests
+
+# Pages come from the page cache shared with the Week 12 scrapers, so the poem is only downloaded again when it changed.
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Week12"))
+import page_cache
 
 
 def main():
@@ -58,8 +64,8 @@ def main():
 
 
 def GetWebpage(str_url):
-    # Get web page
-    page_html = requests.get(str_url)
+    # Get web page (through the page cache, set SCRAPER_OFFLINE=1 to only use the saved copy)
+    page_html = page_cache.get_page(str_url)
     # Parse with BeautifulSoup's html parser
     page_soup = soup(page_html.text, "html.parser")
     # Return result in soup format
@@ -4,12 +4,38 @@ Date: 2024-12-19
 Description: Utilize PyInputPlus and downloaded ingredients from URL to calculate the total cost of a custom
              pizza order. Give the user a choice to add pizzas, view current and previous orders, and calculate
              totals including tax and tips (optional for assignment, added this feature for my own development
-             challenge). When the order is done, place the order by writing this order to a new JSON file.
+             challenge). When the order is done, place the order by appending it to the order journal.
 """
 
+import atexit
 import json
-import pyinputplus as pyip
-import requests
+from datetime import datetime
+from lazy_imports import lazy_import
+import catalog_cache
+import inventory
+import menu_memo
+import order_store
+import promotions
+
+# pyinputplus and requests are only loaded when they are first used, so the menu comes up sooner.
+# A fresh catalog in the catalog cache means requests is never loaded at all.
+pyip = lazy_import("pyinputplus")
+requests = lazy_import("requests")
+
+INGREDIENTS_URL = "https://itec-minneapolis.s3.us-west-2.amazonaws.com/ingredients.json"
+ORDER_JOURNAL_DIR = "order_journal"  # Folder where every submitted order is appended
+LEGACY_ORDER_FILE = "order.json"  # Where older versions saved the last order, imported into a new journal
+store = None  # The order history (recent orders in memory, older ones in the journal), opened on first use
+SALES_TAX_RATE = 0.07  # 7% sales tax
+
+# Define tip choices that the user will have to pick from.
+TIP_CHOICES = {
+    '0%': 0.00,
+    '10%': 0.10,
+    '20%': 0.20,
+    '30%': 0.30,
+    '40%': 0.40
+}
 
 
 def main():
@@ -18,9 +44,8 @@ def main():
     """
     # Step 1) The program will load data from URL
     # I will use the try and except block to handle errors and an error message will be displayed to the user.
-    url = "https://itec-minneapolis.s3.us-west-2.amazonaws.com/ingredients.json"
     try:
-        base_options, toppings = load_ingredients(url)
+        base_options, toppings = load_ingredients(INGREDIENTS_URL)
         # Check if the ingredients are loaded properly
         if not base_options and not toppings:
             print("Error: Ingredients file is empty or missing required data.")
@@ -29,15 +54,37 @@ def main():
         print(f"Error: Unable to load ingredients. Reason: {e}")
         return
 
+    # If the shop keeps an inventory file, sold out ingredients are left off the menu and every pizza
+    # reserves its ingredients until the order is submitted. Without the file nothing is counted.
+    try:
+        stock = inventory.load_inventory(inventory.INVENTORY_FILE)
+    except (ValueError, OSError) as e:
+        print(f"Warning: Stock tracking is turned off. Reason: {e}")
+        stock = None
+    reservations = []  # One reservation per pizza in the order
+
+    # Deals from the promotions file (ex: "3rd topping free") are taken off when the order is submitted.
+    # Without the file the order is the plain sum of the pizzas (promotions.example.json is a sample to copy).
+    try:
+        promotion_rules = promotions.load_promotions(promotions.PROMOTIONS_FILE)
+        if promotion_rules:
+            promotions.use_promotions(promotion_rules, base_options, toppings)
+    except ValueError as e:
+        print(f"Warning: Promotions are turned off. Reason: {e}")
+        promotion_rules = None
+
     # Display a cool restaurant menu prior to the user making the choices to add pizza, view order or submit order.
-    display_menu(base_options, toppings)
+    if stock:
+        display_menu(*inventory.in_stock_catalog(stock, base_options, toppings))
+    else:
+        display_menu(base_options, toppings)
 
     pizzas = []  # Create an empty list to store all pizzas in the order
 
     while True:
         # Display the main menu using PyInputPlus
         menu_choice = pyip.inputMenu(
-            ["Add a Pizza", "View Current Order", "View Previous Order", "Submit Order"],
+            ["Add a Pizza", "View Current Order", "View Previous Order", "View Order by Number", "Submit Order"],
             prompt="\nChoose an option:\n",
             numbered=True,
         )
@@ -46,11 +93,25 @@ def main():
             # `len(pizzas)` gives the current number of pizzas in the list, and adding 1 ensures
             # the next pizza is numbered correctly (starting from 1, not 0).
             print(f"\nAdding Pizza #{len(pizzas) + 1}...")
-            ingredients, pizza_cost = get_pizza_ingredients(base_options, toppings)
+            menu_options, menu_toppings = base_options, toppings
+            if stock:
+                # Only offer what is still in stock right now
+                menu_options, menu_toppings = inventory.in_stock_catalog(stock, base_options, toppings)
+                if not all(option["options"] for option in menu_options):
+                    print("Sorry, we are sold out of pizzas right now.")
+                    continue
+            ingredients, pizza_cost = get_pizza_ingredients(menu_options, menu_toppings)
             # Call the `get_pizza_ingredients` function to gather the user's selections for the pizza.
             # The function returns two values:
             # - ingredients: A list of the chosen categories, options, and their prices (ex: crust type, toppings).
             # - pizza_cost: The total price of the pizza based on the user's selections.
+            if stock:
+                # Hold the ingredients for this pizza. Reserving fails if someone else got the last one meanwhile.
+                reservation = inventory.reserve(stock, inventory.pizza_keys(ingredients))
+                if reservation is None:
+                    print("Sorry, one of those ingredients just sold out. Please build the pizza again.")
+                    continue
+                reservations.append(reservation)
             pizzas.append((ingredients, pizza_cost))  # Add the pizza to the list
         elif menu_choice == "View Current Order":
             # if users try to view a current order when no pizzas have been added, it may display an empty summary.
@@ -60,16 +121,21 @@ def main():
             display_order_summary(pizzas)  # Display the current order
         elif menu_choice == "View Previous Order":
             view_previous_order()  # Display the previous order
+        elif menu_choice == "View Order by Number":
+            # Every submitted order is numbered in the order journal, starting at 1.
+            order_number = pyip.inputInt("Enter the order number: ", min=1)
+            view_previous_order(order_number)  # Display that order straight from the journal
         elif menu_choice == "Submit Order":
             # Submit the order and save to JSON file
             if pizzas:  # Check if there are pizzas in the current order.
                 total_order_cost = sum(pizza_cost for unused_value, pizza_cost in pizzas)
-                # Step 2: Calculate the sales tax (7%)
-                tax_amount = total_order_cost * 0.07  # Sales tax is 7% of the total order cost.
-                tax_amount = round(tax_amount, 2)  # Round the tax amount to 2 decimal places for currency formatting.
-
-                # Step 3: Calculate the total cost after tax
-                total_with_tax = round(total_order_cost + tax_amount, 2)  # Add the tax amount to the total cost.
+                applied_promotions = []
+                if promotion_rules:
+                    # Take off the combination of promotions that saves the customer the most
+                    savings, applied_promotions = promotions.apply_promotions(pizzas)
+                    total_order_cost = round(total_order_cost - savings, 2)
+                # Step 2 and 3: Calculate the sales tax (7%) and the total cost after tax
+                tax_amount, total_with_tax = calculate_order_tax(total_order_cost)
 
                 # Step 4: Allow the user to select a tip percentage and calculate the tip amount
                 tip_amount = calculate_total_with_tip(total_with_tax)
@@ -80,14 +146,19 @@ def main():
                 final_total = round(final_total, 2)  # Round the result to 2 decimal places.
 
                 # Step 6: Display the final order summary
-                display_order_summary(pizzas, final_total, tip_amount, tax_amount)
+                display_order_summary(pizzas, final_total, tip_amount, tax_amount, applied_promotions)
                 # This function prints out:
                 # - Each pizza with its ingredients and cost.
                 # - The subtotal, tax, tip, and final total.
 
-                # Step 7: Save the order to a JSON file
-                place_order(pizzas, final_total, tax_amount, tip_amount)
-                # The place_order function writes the order details to "order.json" for record-keeping.
+                # Step 7: Save the order to the order journal
+                place_order(pizzas, final_total, tax_amount, tip_amount, applied_promotions)
+                # The place_order function appends the order details to the order journal for record-keeping.
+                if stock:
+                    # The reserved ingredients are used now, so take them off the shelf and save the new counts.
+                    for reservation in reservations:
+                        inventory.commit(stock, reservation)
+                    inventory.save_inventory(stock, inventory.INVENTORY_FILE)
 
                 # Step 8: Exit the loop after submitting the order
                 print("Your order has been submitted!")
@@ -101,21 +172,17 @@ def main():
 def load_ingredients(url):
     """
     Step 1) Download the ingredients.json file from the URL.
+    The catalog is saved on disk, so later runs reuse it and only ask the server whether it changed.
     :param url: URL of the ingredients.json file.
     :return: Base options and toppings as lists/dictionaries.
     """
     try:
-        # Get JSON data from the URL.
-        # The `requests.get(url)` sends a GET request to retrieve the file contents.
-        response = requests.get(url)
-
-        # Check if the HTTP response indicates success (status code 200-299).
-        # If not, this will raise an HTTPError and jump to the `except` block.
-        response.raise_for_status()
-
-        # Parse the response content as JSON and load it into the `ingredients` dictionary.
+        # Get JSON data from the catalog cache.
+        # The cache sends a GET request only when the saved copy is missing or older than its TTL, and then
+        # only downloads the file again if the server says it changed (conditional GET).
+        # If the server is down but a saved copy exists, the saved copy is used with a warning.
         # If the content is not valid JSON, this will raise a `JSONDecodeError`.
-        ingredients = response.json()
+        ingredients = catalog_cache.load_catalog(url)
 
         # Validate the structure of the JSON data
         base_options = ingredients.get("base_options", [])
@@ -173,33 +240,34 @@ def get_pizza_ingredients(base_options, toppings):
     Step 3) Gather pizza ingredients and calculate the total cost for one pizza.
     Prompts the user to choose crust, sauce, cheese, and toppings.
     """
-    ingredients = []  # List to store chosen ingredients with their costs
-    total_cost = 0  # Initialize total cost for the pizza
+    base_choices = []  # The chosen crust, sauce and cheese, in menu order
+    topping_choices = []  # The chosen toppings
 
     # Step 1: Select base options (ex: crust, sauce, cheese)
     for option in base_options:  # Loop through each category in the base options
         category = option["category"]  # Get the specific category if it is picked.
         choices = option["options"]   # Get the specific options from the ingredients.json file if it is picked.
-        # Step 2a: Prompt the user to choose an option from the category
+        # Step 2: Prompt the user to choose an option from the category
         choice = pyip.inputMenu(list(choices.keys()), prompt=f"\nChoose a {category}:\n", numbered=True)
-        # Step 2b: Add the chosen option to the ingredients list along with its category and price
-        ingredients.append((category.capitalize(), choice, choices[choice]))
-        # Step 2c: Add the price of the chosen option to the total cost
-        total_cost = total_cost + choices[choice]
+        base_choices.append(choice)
 
     # Step 3: Select toppings
     # Check if there are available toppings before prompting the user
     if not toppings:
         print("\nNo toppings are available.")  # Inform the user if no toppings are provided
     else:   # Loop through each available topping
-        for topping, price in toppings.items():  # For every topping, ask the user if they want this topping (yes or no)
+        for topping in toppings:  # For every topping, ask the user if they want this topping (yes or no)
             if pyip.inputYesNo(f"Do you want {topping}? (yes/no): ") == "yes":
-                # If the user selects "yes", add the topping to the ingredients list
-                ingredients.append(("Topping", topping, price))
-                # Add the topping's price to the total cost
-                total_cost = total_cost + price
+                topping_choices.append(topping)
+
+    # Step 4: Price the pizza. Popular pizzas are ordered over and over, so the ingredient list and cost of every
+    # pizza are remembered by its choices and only worked out the first time (the cache is emptied if the
+    # catalog changes). The ingredients come back in menu order with the prices added up in that same order.
+    menu_memo.use_catalog(base_options, toppings)
+    ingredients, total_cost = menu_memo.price_configuration(
+        menu_memo.configuration_key(base_choices, topping_choices))
     # Return the list of selected ingredients and the total cost of the pizza
-    return ingredients, total_cost
+    return list(ingredients), total_cost
 
 
 def process_order(num_pizzas, base_options, toppings):
@@ -234,7 +302,7 @@ def calculate_total_with_tax(total_order):
     :param total_order: The total price before tax.
     :return: A tuple containing the tax amount and total price after tax.
     """
-    tax_rate = 0.07  # Define the tax rate
+    tax_rate = SALES_TAX_RATE  # Define the tax rate
     # Calculate the tax amount
     tax_amount = total_order * tax_rate
     # Calculate the total with tax
@@ -245,26 +313,30 @@ def calculate_total_with_tax(total_order):
     return tax_amount, total_with_tax
 
 
+def calculate_order_tax(total_order_cost):
+    """
+    Calculate the sales tax and the total after tax for a submitted order.
+    :param total_order_cost: Sum of the pizza costs in the order.
+    :return: A tuple containing the tax amount and total price after tax.
+    """
+    tax_amount = total_order_cost * SALES_TAX_RATE  # Sales tax is 7% of the total order cost.
+    tax_amount = round(tax_amount, 2)  # Round the tax amount to 2 decimal places for currency formatting.
+    total_with_tax = round(total_order_cost + tax_amount, 2)  # Add the tax amount to the total cost.
+    return tax_amount, total_with_tax
+
+
 def calculate_total_with_tip(total_with_tax):
     """
     Step 6 (optional) Ask the user to select a tip percentage and add it to the total amount.
     :param total_with_tax: The total price after adding sales tax.
     :return: Total price including the tip.
     """
-    # Define tip choices that the user will have to pick from.
-    tip_choices = {
-        '0%': 0.00,
-        '10%': 0.10,
-        '20%': 0.20,
-        '30%': 0.30,
-        '40%': 0.40
-    }
     # Use pyip.inputMenu to let the user select a tip percentage directly
     tip_choice = pyip.inputMenu(
-        list(tip_choices.keys()),
+        list(TIP_CHOICES.keys()),
         prompt="\nSelect a tip percentage:\n", numbered=True)
     # Get the corresponding tip percentage from the dictionary that is chosen from the user.
-    tip_percentage = tip_choices[tip_choice]
+    tip_percentage = TIP_CHOICES[tip_choice]
     # Calculate the tip amount
     tip_amount = total_with_tax * tip_percentage
     tip_amount = round(tip_amount, 2)
@@ -277,7 +349,7 @@ def calculate_total_with_tip(total_with_tax):
     return tip_amount
 
 
-def display_order_summary(pizzas, final_total=None, tip_amount=None, tax_amount=None):
+def display_order_summary(pizzas, final_total=None, tip_amount=None, tax_amount=None, applied_promotions=None):
     """
     Step 7) Display the summary of the pizza order.
     Provides a detailed summary of the user's pizza order, including ingredients, costs, tax, tip, and the final total.
@@ -285,6 +357,7 @@ def display_order_summary(pizzas, final_total=None, tip_amount=None, tax_amount=
     :param final_total: Final total cost including tax and tip (optional).
     :param tip_amount: The amount the user tipped (optional, default is 0.00).
     :param tax_amount: Calculate the total order times sales tax (7%).
+    :param applied_promotions: Promotions taken off the order, from promotions.apply_promotions() (optional).
     """
 
     print("\n" + "Order Summary:".center(60))  # Header that I want to be center-aligned
@@ -293,15 +366,20 @@ def display_order_summary(pizzas, final_total=None, tip_amount=None, tax_amount=
     for i, (ingredients, pizza_cost) in enumerate(pizzas, start=1):
         print(f"\nPizza #{i}:")  # Display which pizza in the order which the user ordered, followed with ingredients.
 
-        for category, name, price in ingredients:  # Loop through ingredients of the current pizza
-            print(f"{category:<12}     {name:<20}         $ {price:>17.2f}")
-            # For each ingredient (like crust, sauce, or topping), display its category, name, and price
+        # For each ingredient (like crust, sauce, or topping), display its category, name, and price.
+        # The lines of a pizza are formatted once and remembered, since the same pizzas come up again and again.
+        print(menu_memo.ingredient_lines(tuple(map(tuple, ingredients))), end="")
         print("-" * 70)  # Separator for each pizza's subtotal
         print(f"{'Subtotal':<32}              ${pizza_cost:>18.2f}")
         # Display the subtotal for this pizza, which is the sum of all its ingredients.
     print("-" * 70)  # Separator line for the total cost
     # After listing all pizzas, add a separator line to transition into the overall costs like tax and tip.
 
+    # Display every promotion that was used, with the pizzas it was used on
+    for promotion in applied_promotions or []:
+        label = f"{promotion['name']} (#{', #'.join(map(str, promotion['pizzas']))})"
+        print(f"{label:<32}             -${promotion['discount']:>18.2f}")
+
     # Display tax amount (0.00 if None)
     tax_amount = tax_amount if tax_amount is not None else 0.00
     print(f"{'Tax Amount':<32}              ${tax_amount:>18.2f}")
@@ -319,15 +397,18 @@ def display_order_summary(pizzas, final_total=None, tip_amount=None, tax_amount=
     # A double line separator is used to highlight the final amount.
 
 
-def place_order(pizzas, final_total=None, tax_amount=None, tip_amount=None):
+def build_order_data(pizzas, final_total=None, tax_amount=None, tip_amount=None, customer=None,
+                     applied_promotions=None):
     """
-    Step 8) Save the order to a JSON file and display a confirmation message.
+    Create the order summary dictionary that is saved for every submitted order.
     :param pizzas: List of pizzas in the order.
     :param final_total: Final total price including tax and tip.
     :param tax_amount: The total tax amount for the order.
     :param tip_amount: The tip amount added by the user.
+    :param customer: Name of the customer (optional), so staff can look up a customer's orders.
+    :param applied_promotions: Promotions taken off the order (optional).
+    :return: The order summary dictionary.
     """
-    # Create an order summary dictionary
     order_data = {
         "pizzas": [
             {
@@ -339,69 +420,162 @@ def place_order(pizzas, final_total=None, tax_amount=None, tip_amount=None):
         "tax_amount": round(tax_amount, 2) if tax_amount is not None else 0.00,  # Tax amount, 0.00 if None,
         "tip_amount": round(tip_amount, 2) if tip_amount is not None else 0.00,  # Tip amount, 0.00 if None
         "final_total": round(final_total, 2) if final_total is not None else 0.00,  # Final total 0.00 if None
+        "placed_at": datetime.now().isoformat(timespec="seconds"),  # When the order was placed, for sales reports
     }   # Final total, rounded to two decimals
+    if customer:
+        order_data["customer"] = customer
+    if applied_promotions:
+        order_data["promotions"] = applied_promotions
+    return order_data
+
 
-    # Attempt to save the order data to a JSON file
+def get_order_store():
+    """
+    Open the order history the first time it is needed and keep it open until the program ends, so orders that
+    were placed or viewed recently are looked up in memory instead of being read from disk again.
+    :return: The order store from order_store.open_store().
+    """
+    global store
+    if store is None:
+        store = order_store.open_store(ORDER_JOURNAL_DIR)
+        atexit.register(close_order_store)
+        if order_store.count_orders(store) == 0:
+            import_legacy_orders(store, LEGACY_ORDER_FILE)
+    return store
+
+
+def import_legacy_orders(store, path):
+    """
+    Copy the order that older versions of this program saved in order.json into an empty order journal, so it can
+    still be viewed as order #1. The file itself is left as it is.
+    :param store: The order store, with no orders in it yet.
+    :param path: Path of the old order file.
+    """
     try:
-        with open("order.json", 'w') as file:
-            json.dump(order_data, file, indent=2)  # Save the data in a readable JSON format
-        # Display a confirmation message to the user if the file been saved.
-        print("\nYour order has been placed! The details are saved in 'order.json'. Thank you!")
+        with open(path, "r") as file:
+            data = json.load(file)
+    except FileNotFoundError:
+        return  # Nothing was saved by an older version
+    except (OSError, ValueError) as e:
+        print(f"Warning: Unable to import the previous order from '{path}'. Reason: {e}")
+        return
+
+    # order.json holds one order, but accept a list of orders too
+    legacy_orders = [order_data for order_data in (data if isinstance(data, list) else [data])
+                     if isinstance(order_data, dict) and order_data.get("pizzas")]
+    for order_data in legacy_orders:
+        order_store.append_order(store, order_data)
+    if legacy_orders:
+        print(f"Imported {len(legacy_orders)} previous order(s) from '{path}' into '{ORDER_JOURNAL_DIR}'.")
+
+
+def close_order_store():
+    """
+    Close the order history if it is open.
+    """
+    global store
+    if store is not None:
+        order_store.close_store(store)
+        store = None
+
+
+def place_order(pizzas, final_total=None, tax_amount=None, tip_amount=None, applied_promotions=None):
+    """
+    Step 8) Save the order to the order journal and display a confirmation message.
+    :param pizzas: List of pizzas in the order.
+    :param final_total: Final total price including tax and tip.
+    :param tax_amount: The total tax amount for the order.
+    :param tip_amount: The tip amount added by the user.
+    :param applied_promotions: Promotions taken off the order (optional).
+    """
+    # Create an order summary dictionary
+    order_data = build_order_data(pizzas, final_total, tax_amount, tip_amount, applied_promotions=applied_promotions)
+
+    # Attempt to append the order data to the order journal.
+    # Every order is added to the end of the journal, so earlier orders are never overwritten.
+    # The order store also keeps the new order in memory, so viewing it later doesn't read it back from disk.
+    # The confirmation is only shown once the order is safely on disk, so a crash can't lose a confirmed order.
+    try:
+        order_number = order_store.append_order(get_order_store(), order_data)
+        # Display a confirmation message to the user if the order has been saved.
+        print(f"\nYour order has been placed! It is saved as order #{order_number} in '{ORDER_JOURNAL_DIR}'. Thank you!")
     except Exception as e:
         # Handle any unexpected errors
-        print(f"An error occurred: {e}, and was unable to save your order to 'order.json'. Reason: {e}")
+        print(f"An error occurred and we were unable to save your order to '{ORDER_JOURNAL_DIR}'. Reason: {e}")
 
 
-def view_previous_order():
+def view_previous_order(order_number=None):
     """
-    Step 9) View a previously placed order by reading the order.json file.
+    Step 9) View a previously placed order from the order history.
     Displays the pizzas, their ingredients, and the totals.
+    :param order_number: Number of the order to display (optional, default is the most recent order).
     """
     try:
-        # Open the order.json file in read mode.
-        with open("order.json", "r") as file:
-            order_data = json.load(file)  # Load the JSON data
-
-        # Check if the file contains valid order data or if the pizzas list is empty.
-        if not order_data or "pizzas" not in order_data or not order_data["pizzas"]:
-            print("\nYour order is currently empty.")  # Inform the user accordingly, if there's no data to display
+        # Recent orders are kept in memory. Older ones are read from the journal, which seeks straight to the
+        # requested order using its index.
+        if order_number is None:
+            order_data = order_store.get_last_order(get_order_store())
+        else:
+            order_data = order_store.get_order(get_order_store(), order_number)
+
+        if order_data is None:
+            if order_number is None:
+                print("\nError: No previous order found. Please place an order first.")
+            else:
+                print(f"\nError: Order #{order_number} was not found.")
             return
 
-        # Display a header for previous order summary.
-        print("\n===================== Previous Order Summary =====================")
-
-        # Create a for loop to display each pizza in the order, start at 1, no negative values
-        for i, pizza in enumerate(order_data["pizzas"], start=1):
-            print(f"\nPizza #{i}:")  # Print the pizza number to the user for clarity.
-            for ingredient in pizza["ingredients"]:  # Iterate through the list of ingredients.
-                category, name, price = ingredient  # Show the ingredient details
-                print(f"{category:<12}    {name:<20}         $ {price:>17.2f}")
-            print("-" * 70)  # Separator line for readability
-            print(f"{'Subtotal':<32}             ${pizza['subtotal']:>18.2f}")  # Display the pizza subtotal, for each
-        # After listing the pizzas, display the tax, tip, and final total if available.
-        print("-" * 70)
-        # Display tax amount, 0.00 if None
-        tax_amount = order_data.get("tax_amount", 0.00)
-        print(f"{'Tax Amount':<32}             ${tax_amount:>18.2f}")
-        # Display tip amount if greater than 0
-        tip_amount = order_data.get("tip_amount", 0.00)
-        if tip_amount > 0:
-            print("-" * 70)
-            print(f"{'Tip':<32}             ${tip_amount:>18.2f}")
-        # Display final total if greater than 0
-        final_total = order_data.get("final_total", 0.00)
-        if final_total > 0:
-            print("=" * 70)
-            print(f"{'Final Total':<32}             ${final_total:>18.2f}")
-        # Write a message to the user confirming that the order was displayed.
-        print("\nYour previous order has been successfully displayed.")
-    except FileNotFoundError:
-        # Handle the case where the order.json file does not exist.
-        print("\nError: No previous order found. Please place an order first.")
+        display_saved_order(order_data)
+    except OSError as e:
+        # Handle the case where the order journal cannot be opened.
+        print(f"\nError: Unable to read the order journal. Reason: {e}")
     except json.JSONDecodeError:
         # Handle the case where the file content is not valid JSON.
         print("\nError: The order file is not in a valid format. Please try again.")
 
 
+def display_saved_order(order_data):
+    """
+    Display an order that was saved by place_order().
+    :param order_data: The order summary dictionary read back from the order journal.
+    """
+    # Check if the file contains valid order data or if the pizzas list is empty.
+    if not order_data or "pizzas" not in order_data or not order_data["pizzas"]:
+        print("\nYour order is currently empty.")  # Inform the user accordingly, if there's no data to display
+        return
+
+    # Display a header for previous order summary.
+    print("\n===================== Previous Order Summary =====================")
+
+    # Create a for loop to display each pizza in the order, start at 1, no negative values
+    for i, pizza in enumerate(order_data["pizzas"], start=1):
+        print(f"\nPizza #{i}:")  # Print the pizza number to the user for clarity.
+        for ingredient in pizza["ingredients"]:  # Iterate through the list of ingredients.
+            category, name, price = ingredient  # Show the ingredient details
+            print(f"{category:<12}    {name:<20}         $ {price:>17.2f}")
+        print("-" * 70)  # Separator line for readability
+        print(f"{'Subtotal':<32}             ${pizza['subtotal']:>18.2f}")  # Display the pizza subtotal, for each
+    # After listing the pizzas, display the promotions, tax, tip, and final total if available.
+    print("-" * 70)
+    for promotion in order_data.get("promotions", []):
+        label = f"{promotion['name']} (#{', #'.join(map(str, promotion['pizzas']))})"
+        print(f"{label:<32}            -${promotion['discount']:>18.2f}")
+    # Display tax amount, 0.00 if None
+    tax_amount = order_data.get("tax_amount", 0.00)
+    print(f"{'Tax Amount':<32}             ${tax_amount:>18.2f}")
+    # Display tip amount if greater than 0
+    tip_amount = order_data.get("tip_amount", 0.00)
+    if tip_amount > 0:
+        print("-" * 70)
+        print(f"{'Tip':<32}             ${tip_amount:>18.2f}")
+    # Display final total if greater than 0
+    final_total = order_data.get("final_total", 0.00)
+    if final_total > 0:
+        print("=" * 70)
+        print(f"{'Final Total':<32}             ${final_total:>18.2f}")
+    # Write a message to the user confirming that the order was displayed.
+    print("\nYour previous order has been successfully displayed.")
+
+
 if __name__ == "__main__":
     main()
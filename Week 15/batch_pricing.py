@@ -0,0 +1,204 @@
+"""
+Author: Lavell McGrone
+Date: 2026-10-18
+Description: Price pizzas that arrive as data instead of through the interactive PyInputPlus menus. Each pizza is a
+             selection of crust, sauce, cheese and toppings, read from a JSON Lines, JSON or CSV file (or standard
+             input). Every selection is checked against the same base_options/toppings catalog the ordering program
+             uses, and priced into exactly the same (ingredients, pizza_cost) result get_pizza_ingredients() returns.
+             The catalog is turned into lookup tables once, so each pizza only costs a few dictionary lookups.
+
+Usage:       python batch_pricing.py orders.jsonl [--catalog ingredients.json] [--output priced.jsonl]
+             CSV files need the columns crust, sauce, cheese and toppings (toppings separated by ";").
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+
+DEFAULT_CATALOG = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ingredients.json")
+
+
+def load_catalog_file(catalog_source):
+    """
+    Load the base_options and toppings from a local ingredients.json file or from a URL.
+    :param catalog_source: Path or URL of the ingredients.json file.
+    :return: Base options and toppings as lists/dictionaries.
+    """
+    if catalog_source.startswith(("http://", "https://")):
+        import catalog_cache  # Only needed (and only imports requests) when the catalog is online
+        ingredients = catalog_cache.load_catalog(catalog_source)
+    else:
+        with open(catalog_source, "r") as file:
+            ingredients = json.load(file)
+    return ingredients.get("base_options", []), ingredients.get("toppings", {})
+
+
+def build_price_lookup(base_options, toppings):
+    """
+    Turn the catalog into lookup tables that are built once and reused for every pizza.
+    Names are matched without caring about upper/lower case or extra spaces.
+    :param base_options: List of base options with categories and prices.
+    :param toppings: Dictionary of toppings and their prices.
+    :return: A dictionary with the lookup tables.
+    """
+    categories = []
+    for option in base_options:
+        # Each category keeps its options as: lower case name -> (ingredient tuple as the menu would build it)
+        options = {
+            name.strip().lower(): (option["category"].capitalize(), name, price)
+            for name, price in option["options"].items()
+        }
+        categories.append((option["category"].lower(), options))
+
+    # Remember the position of every topping, so toppings always come out in menu order like the yes/no questions
+    topping_lookup = {
+        name.strip().lower(): (position, ("Topping", name, price))
+        for position, (name, price) in enumerate(toppings.items())
+    }
+    return {"categories": categories, "toppings": topping_lookup}
+
+
+def split_toppings(value):
+    """
+    :param value: Toppings as a list, a ";" separated string, or None.
+    :return: A list of topping names.
+    """
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return [name for name in value.split(";") if name.strip()]
+    return list(value)
+
+
+def price_selection(selection, lookup):
+    """
+    Validate one pizza selection and price it.
+    :param selection: Dictionary like {"crust": "Thin", "sauce": "Marinara", "cheese": "Cheddar", "toppings": [...]}.
+    :param lookup: Lookup tables from build_price_lookup().
+    :return: A tuple of (ingredients, pizza_cost), the same as get_pizza_ingredients() returns.
+    :raises ValueError: If a category is missing or a choice is not on the menu.
+    """
+    ingredients = []  # List to store chosen ingredients with their costs
+    total_cost = 0  # Prices are added in the same order as the interactive menu, so the float total is identical
+
+    # Step 1: Base options (crust, sauce, cheese), one choice per category
+    for category, options in lookup["categories"]:
+        choice = selection.get(category)
+        if choice is None or str(choice).strip() == "":
+            raise ValueError(f"missing a choice for '{category}'")
+        ingredient = options.get(str(choice).strip().lower())
+        if ingredient is None:
+            raise ValueError(f"'{choice}' is not a {category} option")
+        ingredients.append(ingredient)
+        total_cost = total_cost + ingredient[2]
+
+    # Step 2: Toppings, sorted into menu order and without duplicates
+    chosen_toppings = []
+    for name in split_toppings(selection.get("toppings")):
+        topping = lookup["toppings"].get(str(name).strip().lower())
+        if topping is None:
+            raise ValueError(f"'{name}' is not a topping")
+        chosen_toppings.append(topping)
+    for unused_position, ingredient in sorted(set(chosen_toppings)):
+        ingredients.append(ingredient)
+        total_cost = total_cost + ingredient[2]
+
+    return ingredients, total_cost
+
+
+def read_selections(path):
+    """
+    Read pizza selections one at a time, so files of any size can be priced.
+    :param path: A .jsonl, .json or .csv file, or "-" for JSON Lines on standard input.
+    :return: A generator of (line number, selection dictionary or error message string) tuples.
+    """
+    if path == "-":
+        yield from read_json_lines(sys.stdin)
+    elif path.lower().endswith(".csv"):
+        with open(path, "r", newline="") as file:
+            for line_number, row in enumerate(csv.DictReader(file), start=2):  # Line 1 is the header
+                yield line_number, {key.strip().lower(): value for key, value in row.items() if key}
+    elif path.lower().endswith(".json"):
+        with open(path, "r") as file:
+            data = json.load(file)
+        for line_number, selection in enumerate(data if isinstance(data, list) else data.get("pizzas", []), start=1):
+            yield line_number, selection
+    else:
+        with open(path, "r") as file:
+            yield from read_json_lines(file)
+
+
+def read_json_lines(file):
+    """
+    :param file: An open text file with one JSON selection per line.
+    :return: A generator of (line number, selection dictionary or error message string) tuples.
+    """
+    for line_number, line in enumerate(file, start=1):
+        if not line.strip():
+            continue  # Skip blank lines
+        try:
+            yield line_number, json.loads(line)
+        except json.JSONDecodeError as e:
+            yield line_number, f"invalid JSON ({e})"
+
+
+def price_selections(selections, lookup):
+    """
+    Price a stream of selections.
+    :param selections: Iterable of (line number, selection) tuples from read_selections().
+    :param lookup: Lookup tables from build_price_lookup().
+    :return: A generator of result dictionaries, with either "ingredients"/"pizza_cost" or "error".
+    """
+    for line_number, selection in selections:
+        if isinstance(selection, str):
+            yield {"line": line_number, "error": selection}
+            continue
+        try:
+            ingredients, pizza_cost = price_selection(selection, lookup)
+            yield {"line": line_number, "ingredients": ingredients, "pizza_cost": pizza_cost}
+        except (ValueError, AttributeError) as e:
+            yield {"line": line_number, "error": str(e)}
+
+
+def main():
+    """
+    Command line entry point: price every selection in a file and write one JSON result per line.
+    """
+    parser = argparse.ArgumentParser(description="Price pizza selections without the interactive menus.")
+    parser.add_argument("selections", help='.jsonl, .json or .csv file of pizza selections ("-" for stdin)')
+    parser.add_argument("--catalog", default=DEFAULT_CATALOG, help="path or URL of ingredients.json")
+    parser.add_argument("--output", default="-", help='file to write priced pizzas to ("-" for stdout)')
+    args = parser.parse_args()
+
+    try:
+        base_options, toppings = load_catalog_file(args.catalog)
+    except Exception as e:
+        print(f"Error: Unable to load ingredients. Reason: {e}", file=sys.stderr)
+        sys.exit(1)
+    lookup = build_price_lookup(base_options, toppings)
+
+    priced = errors = 0
+    start_time = time.perf_counter()
+    output = sys.stdout if args.output == "-" else open(args.output, "w")
+    try:
+        for result in price_selections(read_selections(args.selections), lookup):
+            output.write(json.dumps(result) + "\n")
+            if "error" in result:
+                errors = errors + 1
+            else:
+                priced = priced + 1
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    seconds = time.perf_counter() - start_time
+
+    # The summary goes to stderr, so it never mixes with priced pizzas written to stdout
+    print(f"Priced {priced:,} pizza(s), rejected {errors:,} in {seconds:.2f} seconds "
+          f"({(priced + errors) / seconds if seconds else 0:,.0f} pizzas/sec).", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,451 @@
+"""
+Author: Lavell McGrone
+Date: 2026-10-18
+Description: A compact binary file format for saved pizza orders, plus a memory-mapped reader.
+             In order.json every ingredient is a 3 item list that repeats its category and name as text. Here every
+             distinct ingredient (category, name, price) is stored once in an ingredient table, seeded from the catalog
+             so the IDs follow the menu, and an order only stores small ingredient IDs. Prices are integer cents and
+             every order starts with a fixed-width header. An index of byte offsets at the end of the file lets the
+             reader jump straight to any order without decoding the orders it skips.
+             Customer and promotion names are stored once too, in a name table. An order with a field this format
+             has no place for is refused with a ValueError instead of being written without it. Version 1 files can
+             still be read.
+
+File layout: header     magic "PZOB", version, order count
+             orders     per order: placed_at (seconds, 0 = unknown), tax, tip, final total (cents), pizza count,
+                        promotion count, customer name ID (0xFFFFFFFF = no customer)
+                        per pizza: subtotal (cents), ingredient count, then one 2-byte ingredient ID per ingredient
+                        per promotion: name ID, discount (cents), pizza count, then one 2-byte number per pizza
+             table      the tables as JSON: {"ingredients": [[category, name, price in cents], ...], "names": [...]}
+             index      one 8-byte offset per order
+             footer     offset of the table, offset of the index
+
+Usage:       python binary_orders.py encode <order.json | journal folder> <orders.pzo>
+             python binary_orders.py decode <orders.pzo> <orders.jsonl>
+             python binary_orders.py benchmark [--count 200000]
+"""
+
+import argparse
+import json
+import mmap
+import os
+import struct
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import order_journal
+
+MAGIC = b"PZOB"
+VERSION = 2
+FILE_HEADER = struct.Struct("<4sHQ")  # magic, version, order count
+ORDER_HEADERS = {
+    1: struct.Struct("<qiiiH"),  # placed_at, tax, tip, final total, pizza count
+    2: struct.Struct("<qiiiHHI"),  # placed_at, tax, tip, final total, pizza count, promotion count, customer
+}
+ORDER_HEADER = ORDER_HEADERS[VERSION]
+PIZZA_HEADER = struct.Struct("<iH")  # subtotal, ingredient count
+PROMOTION_HEADER = struct.Struct("<IiH")  # name ID, discount, pizza count
+NO_NAME = 0xFFFFFFFF  # Name ID of an order without a customer
+INDEX_ENTRY = struct.Struct("<Q")
+FOOTER = struct.Struct("<QQ")  # table offset, index offset
+EPOCH = datetime(1970, 1, 1)
+
+# The fields each part of an order can have. Anything else can't be stored, so the order is refused.
+ORDER_FIELDS = {"pizzas", "tax_amount", "tip_amount", "final_total", "placed_at", "customer", "promotions"}
+PIZZA_FIELDS = {"ingredients", "subtotal"}
+PROMOTION_FIELDS = {"name", "pizzas", "discount"}
+
+
+def to_cents(amount):
+    """
+    :param amount: A dollar amount.
+    :return: The amount in whole cents.
+    """
+    return int(round(amount * 100))
+
+
+def new_ingredient_table(base_options=None, toppings=None):
+    """
+    Start an ingredient table with every item on the menu, in menu order.
+    :param base_options: List of base options with categories and prices (optional).
+    :param toppings: Dictionary of toppings and their prices (optional).
+    :return: A dictionary with the list of ingredients and a lookup from ingredient to ID, and the same for names.
+    """
+    table = {"ingredients": [], "ids": {}, "names": [], "name_ids": {}}
+    for option in base_options or []:
+        for name, price in option["options"].items():
+            intern_ingredient(table, option["category"].capitalize(), name, to_cents(price))
+    for name, price in (toppings or {}).items():
+        intern_ingredient(table, "Topping", name, to_cents(price))
+    return table
+
+
+def intern_ingredient(table, category, name, price_cents):
+    """
+    Get the ID of an ingredient, adding it to the table the first time it is seen
+    (ex: toppings from an older menu, or a price that changed since).
+    :param table: The ingredient table.
+    :param category: Ingredient category, ex: "Crust".
+    :param name: Ingredient name, ex: "Thin".
+    :param price_cents: Price in cents.
+    :return: The ingredient ID.
+    """
+    key = (category, name, price_cents)
+    ingredient_id = table["ids"].get(key)
+    if ingredient_id is None:
+        ingredient_id = len(table["ingredients"])
+        if ingredient_id > 0xFFFF:
+            raise ValueError("Too many different ingredients for 2-byte IDs.")
+        table["ingredients"].append(key)
+        table["ids"][key] = ingredient_id
+    return ingredient_id
+
+
+def intern_name(table, name):
+    """
+    Get the ID of a name (a customer or a promotion), adding it to the table the first time it is seen.
+    :param table: The ingredient table.
+    :param name: The name.
+    :return: The name ID.
+    """
+    name_id = table["name_ids"].get(name)
+    if name_id is None:
+        name_id = len(table["names"])
+        table["names"].append(name)
+        table["name_ids"][name] = name_id
+    return name_id
+
+
+def check_fields(what, data, fields):
+    """
+    :param what: What the dictionary is, for the error message, ex: "Order".
+    :param data: The dictionary to check.
+    :param fields: The fields the format can store.
+    :raises ValueError: If the dictionary has a field the format can't store, so it is not silently dropped.
+    """
+    unknown = set(data) - fields
+    if unknown:
+        raise ValueError(f"{what} field(s) {', '.join(sorted(unknown))} can't be stored in a binary order file.")
+
+
+def encode_order(table, order_data):
+    """
+    Turn one order from the JSON schema into bytes.
+    :param table: The ingredient table.
+    :param order_data: Order dictionary as saved by place_order().
+    :return: The encoded order.
+    :raises ValueError: If the order has a field the format can't store.
+    """
+    check_fields("Order", order_data, ORDER_FIELDS)
+    placed_at = 0
+    if order_data.get("placed_at"):
+        placed_at = int((datetime.fromisoformat(order_data["placed_at"]) - EPOCH).total_seconds())
+
+    pizzas = order_data.get("pizzas", [])
+    promotions = order_data.get("promotions", [])
+    customer = intern_name(table, order_data["customer"]) if order_data.get("customer") else NO_NAME
+    parts = [ORDER_HEADER.pack(placed_at, to_cents(order_data.get("tax_amount", 0)),
+                               to_cents(order_data.get("tip_amount", 0)),
+                               to_cents(order_data.get("final_total", 0)), len(pizzas), len(promotions), customer)]
+    for pizza in pizzas:
+        check_fields("Pizza", pizza, PIZZA_FIELDS)
+        ids = [intern_ingredient(table, category, name, to_cents(price))
+               for category, name, price in pizza["ingredients"]]
+        parts.append(PIZZA_HEADER.pack(to_cents(pizza["subtotal"]), len(ids)))
+        parts.append(struct.pack(f"<{len(ids)}H", *ids))
+    for promotion in promotions:
+        check_fields("Promotion", promotion, PROMOTION_FIELDS)
+        numbers = promotion["pizzas"]
+        parts.append(PROMOTION_HEADER.pack(intern_name(table, promotion["name"]), to_cents(promotion["discount"]),
+                                           len(numbers)))
+        parts.append(struct.pack(f"<{len(numbers)}H", *numbers))
+    return b"".join(parts)
+
+
+def write_binary_orders(orders, path, table=None):
+    """
+    Write orders to a binary order file (to a temporary file first, then renamed into place).
+    :param orders: Iterable of order dictionaries in the JSON schema.
+    :param path: File to write.
+    :param table: Ingredient table to start from (default: an empty one).
+    :return: The number of orders written.
+    :raises ValueError: If an order has a field the format can't store (nothing is written then).
+    """
+    table = table or new_ingredient_table()
+    offsets = []
+    temp_path = path + ".tmp"
+    try:
+        with open(temp_path, "wb") as file:
+            file.write(FILE_HEADER.pack(MAGIC, VERSION, 0))  # The count is filled in at the end
+            position = FILE_HEADER.size
+            for order_data in orders:
+                record = encode_order(table, order_data)
+                offsets.append(position)
+                file.write(record)
+                position = position + len(record)
+
+            table_offset = position
+            table_bytes = json.dumps({"ingredients": [list(ingredient) for ingredient in table["ingredients"]],
+                                      "names": table["names"]}).encode("utf-8")
+            file.write(table_bytes)
+            index_offset = table_offset + len(table_bytes)
+            file.write(struct.pack(f"<{len(offsets)}Q", *offsets))
+            file.write(FOOTER.pack(table_offset, index_offset))
+
+            file.seek(0)
+            file.write(FILE_HEADER.pack(MAGIC, VERSION, len(offsets)))
+    except ValueError:
+        os.remove(temp_path)  # Nothing half written is left behind
+        raise
+    os.replace(temp_path, path)
+    return len(offsets)
+
+
+def open_binary_orders(path):
+    """
+    Memory-map a binary order file for reading. Nothing is decoded until an order is asked for.
+    :param path: The binary order file.
+    :return: A reader dictionary used by the other read functions.
+    :raises ValueError: If the file is not a binary order file, or one of a newer version.
+    """
+    file = open(path, "rb")
+    data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, version, count = FILE_HEADER.unpack_from(data, 0)
+    if magic != MAGIC or version not in ORDER_HEADERS:
+        data.close()
+        file.close()
+        raise ValueError(f"'{path}' is not a binary order file of version 1 to {VERSION}.")
+    table_offset, index_offset = FOOTER.unpack_from(data, len(data) - FOOTER.size)
+    tables = json.loads(data[table_offset:index_offset])
+    if version == 1:
+        tables = {"ingredients": tables, "names": []}  # Version 1 only had the ingredient table
+    ingredients = [tuple(ingredient) for ingredient in tables["ingredients"]]
+    return {"file": file, "data": data, "count": count, "index_offset": index_offset, "ingredients": ingredients,
+            "names": tables["names"], "order_header": ORDER_HEADERS[version]}
+
+
+def order_offset(reader, order_number):
+    """
+    :param reader: Reader from open_binary_orders().
+    :param order_number: Number of the order, starting at 1.
+    :return: Byte offset of the order in the file.
+    :raises IndexError: If there is no order with that number.
+    """
+    if order_number < 1 or order_number > reader["count"]:
+        raise IndexError(f"Order #{order_number} was not found.")
+    return INDEX_ENTRY.unpack_from(reader["data"], reader["index_offset"] + (order_number - 1) * INDEX_ENTRY.size)[0]
+
+
+def read_order_totals(reader, order_number):
+    """
+    Read only the fixed-width header of an order, without decoding its pizzas.
+    :param reader: Reader from open_binary_orders().
+    :param order_number: Number of the order, starting at 1.
+    :return: A tuple of (tax, tip, final total) in cents.
+    """
+    unused_time, tax, tip, final = reader["order_header"].unpack_from(reader["data"],
+                                                                      order_offset(reader, order_number))[:4]
+    return tax, tip, final
+
+
+def decode_order_at(reader, position):
+    """
+    Decode the order stored at a byte offset back into the JSON schema.
+    :param reader: Reader from open_binary_orders().
+    :param position: Byte offset of the order.
+    :return: A tuple of (order dictionary, offset right after the order).
+    """
+    data = reader["data"]
+    ingredients = reader["ingredients"]
+    header = reader["order_header"].unpack_from(data, position)
+    placed_at, tax, tip, final, pizza_count = header[:5]
+    promotion_count, customer = header[5:] if len(header) > 5 else (0, NO_NAME)
+    position = position + reader["order_header"].size
+
+    pizzas = []
+    for unused_value in range(pizza_count):
+        subtotal, ingredient_count = PIZZA_HEADER.unpack_from(data, position)
+        position = position + PIZZA_HEADER.size
+        ids = struct.unpack_from(f"<{ingredient_count}H", data, position)
+        position = position + 2 * ingredient_count
+        pizzas.append({
+            "ingredients": [[ingredients[i][0], ingredients[i][1], ingredients[i][2] / 100] for i in ids],
+            "subtotal": subtotal / 100,
+        })
+
+    promotions = []
+    for unused_value in range(promotion_count):
+        name_id, discount, number_count = PROMOTION_HEADER.unpack_from(data, position)
+        position = position + PROMOTION_HEADER.size
+        numbers = struct.unpack_from(f"<{number_count}H", data, position)
+        position = position + 2 * number_count
+        promotions.append({"name": reader["names"][name_id], "pizzas": list(numbers), "discount": discount / 100})
+
+    order_data = {"pizzas": pizzas, "tax_amount": tax / 100, "tip_amount": tip / 100, "final_total": final / 100}
+    if placed_at:
+        order_data["placed_at"] = (EPOCH + timedelta(seconds=placed_at)).isoformat(timespec="seconds")
+    if customer != NO_NAME:
+        order_data["customer"] = reader["names"][customer]
+    if promotions:
+        order_data["promotions"] = promotions
+    return order_data, position
+
+
+def read_binary_order(reader, order_number):
+    """
+    Decode one order, jumping straight to it with the index.
+    :param reader: Reader from open_binary_orders().
+    :param order_number: Number of the order, starting at 1.
+    :return: The order dictionary in the JSON schema.
+    """
+    return decode_order_at(reader, order_offset(reader, order_number))[0]
+
+
+def iter_binary_orders(reader):
+    """
+    Decode every order from first to last.
+    :param reader: Reader from open_binary_orders().
+    :return: A generator of (order number, order dictionary) tuples.
+    """
+    position = FILE_HEADER.size
+    for order_number in range(1, reader["count"] + 1):
+        order_data, position = decode_order_at(reader, position)
+        yield order_number, order_data
+
+
+def close_binary_orders(reader):
+    """
+    :param reader: Reader from open_binary_orders().
+    """
+    reader["data"].close()
+    reader["file"].close()
+
+
+def read_json_orders(source):
+    """
+    Read orders in the current JSON schema.
+    :param source: An order journal folder, a single order.json file, or a JSON Lines file (one order per line).
+    :return: A generator of order dictionaries.
+    """
+    if os.path.isdir(source):
+        journal = order_journal.open_journal(source, read_only=True)
+        try:
+            for unused_number, order_data in order_journal.iter_orders(journal):
+                yield order_data
+        finally:
+            order_journal.close_journal(journal)
+    elif source.lower().endswith(".jsonl"):
+        with open(source, "r") as file:
+            for line in file:
+                if line.strip():
+                    yield json.loads(line)
+    else:
+        with open(source, "r") as file:
+            data = json.load(file)
+        yield from (data if isinstance(data, list) else [data])
+
+
+def catalog_table():
+    """
+    :return: An ingredient table seeded from ingredients.json next to this file, or an empty one if it is missing.
+    """
+    catalog_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ingredients.json")
+    try:
+        with open(catalog_path, "r") as file:
+            catalog = json.load(file)
+        return new_ingredient_table(catalog.get("base_options"), catalog.get("toppings"))
+    except (OSError, ValueError):
+        return new_ingredient_table()
+
+
+def run_benchmark(count=200_000):
+    """
+    Compare size and read speed of JSON Lines and the binary format for the same orders.
+    :param count: How many orders to write.
+    """
+    sample = {
+        "pizzas": [
+            {"ingredients": [["Crust", "Thin", 10.99], ["Sauce", "Marinara", 1.5], ["Cheese", "Mozzarella", 2.0],
+                             ["Topping", "Pepperoni", 2.0], ["Topping", "Mushrooms", 1.5]], "subtotal": 17.99},
+            {"ingredients": [["Crust", "Deep dish", 12.99], ["Sauce", "Alfredo", 2.0], ["Cheese", "vegan", 3.0]],
+             "subtotal": 17.99},
+        ],
+        "tax_amount": 2.52, "tip_amount": 3.98, "final_total": 39.48, "placed_at": "2026-10-18T12:30:00",
+        "promotions": [{"name": "Two Pizza Deal", "pizzas": [1, 2], "discount": 3.0}],
+    }
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        json_path = os.path.join(temp_dir, "orders.jsonl")
+        binary_path = os.path.join(temp_dir, "orders.pzo")
+        with open(json_path, "w") as file:
+            for unused_value in range(count):
+                file.write(json.dumps(sample) + "\n")
+        write_binary_orders((sample for unused_value in range(count)), binary_path, catalog_table())
+
+        start_time = time.perf_counter()
+        with open(json_path, "r") as file:
+            json_count = sum(1 for line in file if json.loads(line))
+        json_seconds = time.perf_counter() - start_time
+
+        reader = open_binary_orders(binary_path)
+        start_time = time.perf_counter()
+        binary_count = sum(1 for unused_value in iter_binary_orders(reader))
+        binary_seconds = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        final_cents = sum(read_order_totals(reader, number)[2] for number in range(1, count + 1))
+        totals_seconds = time.perf_counter() - start_time
+
+        same = read_binary_order(reader, count // 2) == sample
+        close_binary_orders(reader)
+        json_size, binary_size = os.path.getsize(json_path), os.path.getsize(binary_path)
+
+    print(f"\n{'Binary Order Format Benchmark':^60}")
+    print("=" * 60)
+    print(f"{'Orders':<36}{count:>24,}")
+    print(f"{'JSON Lines size (bytes)':<36}{json_size:>24,}")
+    print(f"{'Binary size (bytes)':<36}{binary_size:>24,}")
+    print(f"{'Size reduction':<36}{json_size / binary_size:>23.1f}x")
+    print(f"{'JSON decode (orders/sec)':<36}{json_count / json_seconds:>24,.0f}")
+    print(f"{'Binary decode (orders/sec)':<36}{binary_count / binary_seconds:>24,.0f}")
+    print(f"{'Binary totals only (orders/sec)':<36}{count / totals_seconds:>24,.0f}")
+    print(f"{'Round trip matches the JSON order':<36}{str(same):>24}")
+    print(f"{'Sum of final totals':<36}${final_cents / 100:>23,.2f}")
+    print("=" * 60)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert pizza orders between JSON and the compact binary format.")
+    parser.add_argument("command", choices=["encode", "decode", "benchmark"])
+    parser.add_argument("source", nargs="?", help="encode: order.json, .jsonl or journal folder; decode: .pzo file")
+    parser.add_argument("target", nargs="?", help="file to write")
+    parser.add_argument("--count", type=int, default=200_000, help="orders written by the benchmark")
+    args = parser.parse_args()
+
+    if args.command == "benchmark":
+        run_benchmark(args.count)
+        return
+    if not args.source or not args.target:
+        parser.error(f"{args.command} needs a source and a target")
+
+    if args.command == "encode":
+        try:
+            written = write_binary_orders(read_json_orders(args.source), args.target, catalog_table())
+        except ValueError as e:
+            print(f"Error: {e}")
+            return
+        print(f"Encoded {written:,} order(s) into '{args.target}'.")
+    else:
+        reader = open_binary_orders(args.source)
+        try:
+            with open(args.target, "w") as file:
+                for unused_number, order_data in iter_binary_orders(reader):
+                    file.write(json.dumps(order_data) + "\n")
+        finally:
+            close_binary_orders(reader)
+        print(f"Decoded {reader['count']:,} order(s) into '{args.target}'.")
+
+
+if __name__ == "__main__":
+    main()
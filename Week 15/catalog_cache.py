@@ -0,0 +1,238 @@
+"""
+Author: Lavell McGrone
+Date: 2026-10-18
+Description: On-disk cache for the ingredients.json catalog. The first run downloads the catalog and saves it together
+             with its ETag and Last-Modified headers. Later runs use the saved copy while it is younger than the TTL,
+             and after that ask the server with a conditional GET, which only sends the catalog again if it changed.
+             If the server is slow or down, the saved copy is used with a warning instead of stopping the program.
+             All downloads share one pooled requests.Session, and requests itself is only loaded when a download is
+             needed. Run this file directly to compare cold and warm starts.
+"""
+
+import contextlib
+import hashlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+
+from lazy_imports import lazy_import
+
+requests = lazy_import("requests")  # Only loaded when the network is really needed (the saved copy is missing or old)
+
+CACHE_DIR = "catalog_cache"  # Folder where downloaded catalogs are saved
+CACHE_TTL_SECONDS = 15 * 60  # A saved catalog is used without asking the server for 15 minutes
+REQUEST_TIMEOUT = (3.05, 5)  # (connect, read) seconds before the server counts as "slow or down"
+
+session = None  # One shared session, so connections to the server are reused
+
+
+def get_session():
+    """
+    :return: The shared, pooled requests.Session (created on first use).
+    """
+    global session
+    if session is None:
+        from requests.adapters import HTTPAdapter
+
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=10)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+    return session
+
+
+def cache_paths(cache_dir, url):
+    """
+    Every URL gets its own pair of files, named after a hash of the URL.
+    :param cache_dir: Folder where catalogs are saved.
+    :param url: URL of the catalog.
+    :return: A tuple of (catalog path, metadata path).
+    """
+    key = hashlib.sha256(url.encode("utf-8")).hexdigest()[:32]
+    return os.path.join(cache_dir, key + ".json"), os.path.join(cache_dir, key + ".meta.json")
+
+
+def write_file_atomically(path, data):
+    """
+    Write bytes to a temporary file first and then rename it, so a crash never leaves half a file behind.
+    The data is synced before the rename and the folder after it, so after a crash the file is either the old one or
+    the complete new one.
+    :param path: Path of the file to write.
+    :param data: Bytes to write.
+    """
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as file:
+        file.write(data)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temp_path, path)
+    if os.name != "nt":  # Windows can't open folders
+        directory = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+        try:
+            os.fsync(directory)
+        finally:
+            os.close(directory)
+
+
+def read_cache(cache_dir, url):
+    """
+    Read a saved catalog and its metadata.
+    :param cache_dir: Folder where catalogs are saved.
+    :param url: URL of the catalog.
+    :return: A tuple of (catalog dictionary, metadata dictionary), or (None, None) if nothing usable is saved.
+    """
+    catalog_path, meta_path = cache_paths(cache_dir, url)
+    try:
+        with open(meta_path, "r") as file:
+            meta = json.load(file)
+        with open(catalog_path, "rb") as file:
+            catalog = json.loads(file.read())
+        return catalog, meta
+    except (OSError, ValueError):
+        return None, None
+
+
+def save_cache(cache_dir, url, body, meta):
+    """
+    Save a downloaded catalog and its metadata.
+    :param cache_dir: Folder where catalogs are saved.
+    :param url: URL of the catalog.
+    :param body: Raw bytes of the catalog, or None to only update the metadata.
+    :param meta: Metadata dictionary (ETag, Last-Modified and the time it was checked).
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    catalog_path, meta_path = cache_paths(cache_dir, url)
+    if body is not None:
+        write_file_atomically(catalog_path, body)
+    write_file_atomically(meta_path, json.dumps(meta).encode("utf-8"))
+
+
+def load_catalog(url, cache_dir=CACHE_DIR, ttl=CACHE_TTL_SECONDS, timeout=REQUEST_TIMEOUT):
+    """
+    Get the ingredients catalog, using the saved copy whenever possible.
+    :param url: URL of the ingredients.json file.
+    :param cache_dir: Folder where catalogs are saved.
+    :param ttl: Seconds a saved catalog is used before checking the server again.
+    :param timeout: Timeout for the request to the server.
+    :return: The catalog dictionary (with "base_options" and "toppings").
+    :raises requests.RequestException: If the server can't be reached (or only answers 304) and nothing is saved yet.
+    """
+    catalog, meta = read_cache(cache_dir, url)
+    now = time.time()
+
+    # Step 1: The saved copy is still fresh, so there is no need to touch the network at all.
+    if catalog is not None and now - meta.get("checked_at", 0) < ttl:
+        return catalog
+
+    # Step 2: Ask the server if the saved copy changed, sending back the validators it gave us last time.
+    headers = {}
+    if catalog is not None:
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+
+    try:
+        response = get_session().get(url, headers=headers, timeout=timeout)
+
+        # Step 3a: 304 Not Modified, the saved copy is still correct, only remember when it was checked.
+        if response.status_code == 304 and catalog is not None:
+            meta["checked_at"] = now
+            save_cache(cache_dir, url, None, meta)
+            return catalog
+        if response.status_code == 304:
+            # Nothing is saved, so nothing can be "not modified" (ex: a proxy answered for another client).
+            # Ask again without validators, telling any cache on the way to send the whole catalog.
+            response = get_session().get(url, headers={"Cache-Control": "no-cache"}, timeout=timeout)
+            if response.status_code == 304:
+                raise requests.HTTPError("The server answered 304 Not Modified, but no catalog is saved",
+                                         response=response)
+
+        # Step 3b: A new version was sent, save it together with its validators.
+        response.raise_for_status()
+        new_catalog = response.json()
+        new_meta = {
+            "url": url,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "checked_at": now,
+        }
+        save_cache(cache_dir, url, response.content, new_meta)
+        return new_catalog
+
+    except (requests.RequestException, ValueError) as e:
+        # Step 4: The server is slow, down, or sent something broken. Serve the saved copy if there is one.
+        if catalog is None:
+            raise
+        age_minutes = (now - meta.get("checked_at", now)) / 60
+        print(f"Warning: Unable to refresh the ingredients catalog ({e}). "
+              f"Using the saved copy from {age_minutes:.0f} minute(s) ago.")
+        return catalog
+
+
+def time_to_first_menu(url, cache_dir, ttl):
+    """
+    Measure how long it takes from loading the catalog until the pizza menu has been displayed.
+    :param url: URL of the ingredients.json file.
+    :param cache_dir: Folder where catalogs are saved.
+    :param ttl: Seconds a saved catalog is used before checking the server again.
+    :return: Seconds until the first menu was displayed.
+    """
+    import Final_project  # Imported here, because Final_project imports this module as well
+
+    start_time = time.perf_counter()
+    catalog = load_catalog(url, cache_dir, ttl)
+    with contextlib.redirect_stdout(io.StringIO()):  # Display the menu without filling the console
+        Final_project.display_menu(catalog["base_options"], catalog["toppings"])
+    return time.perf_counter() - start_time
+
+
+def run_benchmark(network_delay=0.05, repeats=20):
+    """
+    Compare a cold start (nothing saved), a warm start (fresh saved copy) and a revalidating start (304 answer)
+    against a local stand-in server that adds a fake network delay to every request.
+    :param network_delay: Seconds the stand-in server waits before answering.
+    :param repeats: How many times each kind of start is measured.
+    """
+    global session
+    from stand_in_server import start_stand_in_server, stop_stand_in_server
+
+    catalog_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ingredients.json")
+    with open(catalog_path, "r") as file:
+        catalog = json.load(file)
+
+    server, base_url = start_stand_in_server({"/ingredients.json": catalog}, delay=network_delay)
+    url = base_url + "/ingredients.json"
+    results = {"Cold start": [], "Warm start": [], "Revalidate (304)": [], "Origin down (stale)": []}
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for repeat in range(repeats):
+            cache_dir = os.path.join(temp_dir, f"cold_{repeat}")
+            session = None  # A cold start also has no open connections yet
+            results["Cold start"].append(time_to_first_menu(url, cache_dir, CACHE_TTL_SECONDS))
+            results["Warm start"].append(time_to_first_menu(url, cache_dir, CACHE_TTL_SECONDS))
+            results["Revalidate (304)"].append(time_to_first_menu(url, cache_dir, 0))
+
+        stop_stand_in_server(server)
+        session = None  # Drop kept-alive connections, so the stopped server really looks down
+        with contextlib.redirect_stdout(io.StringIO()):  # Hide the stale-copy warnings
+            for unused_value in range(repeats):
+                results["Origin down (stale)"].append(time_to_first_menu(url, cache_dir, 0))
+
+    print(f"\n{'Catalog Load: Time to First Menu':^60}")
+    print("=" * 60)
+    print(f"{'Start':<30}{'Median (ms)':>15}{'Best (ms)':>15}")
+    print("-" * 60)
+    for name, timings in results.items():
+        timings.sort()
+        print(f"{name:<30}{timings[len(timings) // 2] * 1000:>15.2f}{timings[0] * 1000:>15.2f}")
+    print("=" * 60)
+    print(f"Stand-in server delay: {network_delay * 1000:.0f} ms per request")
+
+
+if __name__ == "__main__":
+    # Optional argument: the fake network delay in seconds, ex: python catalog_cache.py 0.1
+    run_benchmark(float(sys.argv[1]) if len(sys.argv) > 1 else 0.05)
@@ -0,0 +1,333 @@
+"""
+Author: Lavell McGrone
+Date: 2026-10-18
+Description: Ingredient inventory that many ordering sessions can share at the same time. Every catalog item
+             (ex: "Topping|Bacon") has a count on hand and a count reserved by pizzas that are still being ordered.
+             A session reserves the ingredients of a pizza when it is added, commits them when the order is
+             submitted (they leave the shelf), and releases them if the customer walks away.
+             The items are spread over STRIPE_COUNT locks (lock striping), so two sessions only wait on each other
+             when their ingredients share a lock, instead of every session waiting on one big lock. A pizza locks all
+             of its stripes in the same order, so sessions can't deadlock, and it either gets every ingredient or none.
+             Items that are not in the inventory file are not counted and never run out. Menus and the price index
+             use in_stock_catalog() and hide_out_of_stock() to leave out what is sold out.
+
+Usage:       python inventory.py [--threads 32] [--operations 20000]   (contention benchmark)
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+import zlib
+from collections import Counter
+
+from catalog_cache import write_file_atomically
+
+INVENTORY_FILE = "inventory.json"  # Stock counts, ex: {"Crust|Thin": 40, "Topping|Bacon": 25}
+STRIPE_COUNT = 16  # Number of locks the items are spread over
+
+
+def item_key(category, name):
+    """
+    :param category: Category of the item, ex: "crust" or "Topping".
+    :param name: Name of the item, ex: "Thin".
+    :return: The inventory key, ex: "Crust|Thin" (the same keys the sales report uses).
+    """
+    return category.capitalize() + "|" + name
+
+
+def pizza_keys(ingredients):
+    """
+    :param ingredients: A pizza's ingredients as (category, name, price) tuples.
+    :return: The inventory keys the pizza uses.
+    """
+    return [item_key(category, name) for category, name, unused_price in ingredients]
+
+
+def new_inventory(stock, stripes=STRIPE_COUNT):
+    """
+    :param stock: Dictionary of inventory key -> count on hand.
+    :param stripes: Number of locks to spread the items over.
+    :return: The inventory dictionary.
+    """
+    inventory = {"stripes": [{"lock": threading.Lock(), "on_hand": {}, "reserved": {}}
+                             for unused_value in range(stripes)]}
+    for key, count in stock.items():
+        stripe = get_stripe(inventory, key)
+        stripe["on_hand"][key] = count
+        stripe["reserved"][key] = 0
+    return inventory
+
+
+def stripe_number(inventory, key):
+    """
+    :param inventory: The inventory dictionary.
+    :param key: An inventory key.
+    :return: Which stripe (lock) the item belongs to. crc32 is used instead of hash(), so it is the same every run.
+    """
+    return zlib.crc32(key.encode("utf-8")) % len(inventory["stripes"])
+
+
+def get_stripe(inventory, key):
+    """
+    :param inventory: The inventory dictionary.
+    :param key: An inventory key.
+    :return: The stripe dictionary that holds the item.
+    """
+    return inventory["stripes"][stripe_number(inventory, key)]
+
+
+def available(inventory, key):
+    """
+    :param inventory: The inventory dictionary.
+    :param key: An inventory key.
+    :return: How many can still be reserved, or None if the item is not counted.
+    """
+    stripe = get_stripe(inventory, key)
+    with stripe["lock"]:
+        if key not in stripe["on_hand"]:
+            return None
+        return stripe["on_hand"][key] - stripe["reserved"][key]
+
+
+def in_stock(inventory, key):
+    """
+    :param inventory: The inventory dictionary.
+    :param key: An inventory key.
+    :return: True if at least one can be reserved (items that are not counted are always in stock).
+    """
+    count = available(inventory, key)
+    return count is None or count > 0
+
+
+def locked_stripes(inventory, keys):
+    """
+    :param inventory: The inventory dictionary.
+    :param keys: Inventory keys.
+    :return: The stripes of the keys, without repeats, in lock order. Always locking in this order prevents deadlocks.
+    """
+    numbers = sorted({stripe_number(inventory, key) for key in keys})
+    return [inventory["stripes"][number] for number in numbers]
+
+
+def reserve(inventory, keys):
+    """
+    Reserve every ingredient of a pizza, or nothing if any of them is out of stock.
+    :param inventory: The inventory dictionary.
+    :param keys: Inventory keys the pizza uses (a key may be listed more than once).
+    :return: The reservation (Counter of key -> count), or None if something ran out.
+    """
+    reservation = Counter(keys)
+    stripes = locked_stripes(inventory, reservation)
+    for stripe in stripes:
+        stripe["lock"].acquire()
+    try:
+        for key, count in reservation.items():
+            stripe = get_stripe(inventory, key)
+            if key in stripe["on_hand"] and stripe["on_hand"][key] - stripe["reserved"][key] < count:
+                return None
+        for key, count in reservation.items():
+            stripe = get_stripe(inventory, key)
+            if key in stripe["on_hand"]:
+                stripe["reserved"][key] = stripe["reserved"][key] + count
+        return reservation
+    finally:
+        for stripe in reversed(stripes):
+            stripe["lock"].release()
+
+
+def finish_reservation(inventory, reservation, used):
+    """
+    Take a reservation off the reserved counts, and off the counts on hand too when the ingredients were used.
+    :param inventory: The inventory dictionary.
+    :param reservation: A reservation from reserve().
+    :param used: True to commit (the pizza was ordered), False to release (it was abandoned).
+    """
+    stripes = locked_stripes(inventory, reservation)
+    for stripe in stripes:
+        stripe["lock"].acquire()
+    try:
+        for key, count in reservation.items():
+            stripe = get_stripe(inventory, key)
+            if key in stripe["on_hand"]:
+                stripe["reserved"][key] = stripe["reserved"][key] - count
+                if used:
+                    stripe["on_hand"][key] = stripe["on_hand"][key] - count
+    finally:
+        for stripe in reversed(stripes):
+            stripe["lock"].release()
+
+
+def commit(inventory, reservation):
+    """
+    :param inventory: The inventory dictionary.
+    :param reservation: A reservation from reserve(); its ingredients are used up.
+    """
+    finish_reservation(inventory, reservation, True)
+
+
+def release(inventory, reservation):
+    """
+    :param inventory: The inventory dictionary.
+    :param reservation: A reservation from reserve(); its ingredients go back on the shelf.
+    """
+    finish_reservation(inventory, reservation, False)
+
+
+def restock(inventory, key, count):
+    """
+    :param inventory: The inventory dictionary.
+    :param key: An inventory key (it starts being counted if it wasn't).
+    :param count: How many were delivered.
+    """
+    stripe = get_stripe(inventory, key)
+    with stripe["lock"]:
+        stripe["on_hand"][key] = stripe["on_hand"].get(key, 0) + count
+        stripe["reserved"].setdefault(key, 0)
+
+
+def stock_counts(inventory):
+    """
+    :param inventory: The inventory dictionary.
+    :return: Dictionary of inventory key -> count on hand.
+    """
+    counts = {}
+    for stripe in inventory["stripes"]:
+        with stripe["lock"]:
+            counts.update(stripe["on_hand"])
+    return counts
+
+
+def load_inventory(path=INVENTORY_FILE):
+    """
+    :param path: Path of the inventory file.
+    :return: The inventory dictionary, or None if there is no inventory file (nothing is counted).
+    :raises ValueError: If the file is not valid JSON of ingredient keys and whole counts.
+    :raises OSError: If the file exists but can't be read.
+    """
+    try:
+        with open(path, "r") as file:
+            stock = json.load(file)
+    except FileNotFoundError:
+        return None
+    if not isinstance(stock, dict) or not all(type(count) is int for count in stock.values()):
+        raise ValueError(f"'{path}' should hold ingredient keys with whole counts.")
+    return new_inventory(stock)
+
+
+def save_inventory(inventory, path=INVENTORY_FILE):
+    """
+    :param inventory: The inventory dictionary.
+    :param path: Path of the inventory file.
+    """
+    write_file_atomically(path, json.dumps(stock_counts(inventory), indent=2).encode("utf-8"))
+
+
+def in_stock_catalog(inventory, base_options, toppings):
+    """
+    :param inventory: The inventory dictionary.
+    :param base_options: List of base options with categories and prices.
+    :param toppings: Dictionary of toppings and their prices.
+    :return: Copies of base_options and toppings without the items that are out of stock. A category whose
+             options are all sold out is kept with no options, so callers can tell the customer.
+    """
+    in_stock_options = [
+        {"category": option["category"],
+         "options": {name: price for name, price in option["options"].items()
+                     if in_stock(inventory, item_key(option["category"], name))}}
+        for option in base_options
+    ]
+    in_stock_toppings = {name: price for name, price in toppings.items()
+                         if in_stock(inventory, item_key("Topping", name))}
+    return in_stock_options, in_stock_toppings
+
+
+def hide_out_of_stock(index, inventory, filter_name="in stock"):
+    """
+    Add (or refresh) a menu_index filter that leaves out every pizza with a sold out ingredient.
+    Call it again after stock runs out or is delivered.
+    :param index: A menu index from menu_index.build_menu_index().
+    :param inventory: The inventory dictionary.
+    :param filter_name: Name of the filter to search with.
+    """
+    from menu_index import add_filter
+
+    sold_out_toppings = [name for name in index["toppings"] if not in_stock(inventory, item_key("Topping", name))]
+    sold_out_options = [(option["category"], name) for option in index["base_options"] for name in option["options"]
+                        if not in_stock(inventory, item_key(option["category"], name))]
+    add_filter(index, filter_name, exclude_toppings=sold_out_toppings, exclude_options=sold_out_options)
+
+
+def run_benchmark(threads=32, operations=20_000):
+    """
+    Many threads reserve pizzas heavy on a few popular toppings, then commit or release them.
+    The same work runs with one lock for everything and with STRIPE_COUNT locks, and the counts are checked
+    afterwards: nothing may be oversold and every committed ingredient must be gone from the shelf.
+    :param threads: Number of ordering threads.
+    :param operations: Pizzas each thread tries to order.
+    """
+    keys = [item_key("Crust", name) for name in ("Thin", "Traditional", "Deep dish", "Thick", "Gluten-free")]
+    keys = keys + [item_key("Topping", name) for name in
+                   ("Pepperoni", "Sausage", "Mushrooms", "Onions", "Bell peppers", "Black olives", "Pineapple",
+                    "Bacon", "Spinach", "Jalapenos")]
+    popular = keys[5:8]  # Pepperoni, sausage and mushrooms are on almost every pizza
+    starting_stock = threads * operations // 2  # Enough to run out part way through
+
+    print(f"\n{'Inventory Contention Benchmark':^70}")
+    print("=" * 70)
+    print(f"{'Locks':<10}{'Reserve+finish/sec':>20}{'Sold out':>12}{'Committed':>14}{'Counts OK':>14}")
+    print("-" * 70)
+    for stripes in (1, STRIPE_COUNT):
+        inventory = new_inventory({key: starting_stock for key in keys}, stripes)
+        committed = Counter()
+        sold_out = [0]
+        tally_lock = threading.Lock()
+
+        def worker(seed):
+            generator = random.Random(seed)
+            used = Counter()
+            misses = 0
+            for unused_value in range(operations):
+                pizza = [generator.choice(keys[:5])] + popular[:generator.randint(1, 3)]
+                pizza = pizza + generator.sample(keys[8:], generator.randint(0, 2))
+                reservation = reserve(inventory, pizza)
+                if reservation is None:
+                    misses = misses + 1
+                elif generator.random() < 0.7:
+                    commit(inventory, reservation)
+                    used.update(reservation)
+                else:
+                    release(inventory, reservation)
+            with tally_lock:
+                committed.update(used)
+                sold_out[0] = sold_out[0] + misses
+
+        workers = [threading.Thread(target=worker, args=(seed,)) for seed in range(threads)]
+        start_time = time.perf_counter()
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+        seconds = time.perf_counter() - start_time
+
+        counts = stock_counts(inventory)
+        reserved_left = sum(sum(stripe["reserved"].values()) for stripe in inventory["stripes"])
+        counts_ok = reserved_left == 0 and all(
+            counts[key] == starting_stock - committed[key] and counts[key] >= 0 for key in keys)
+        print(f"{stripes:<10}{threads * operations / seconds:>20,.0f}{sold_out[0]:>12,}"
+              f"{sum(committed.values()):>14,}{str(counts_ok):>14}")
+    print("=" * 70)
+    print(f"{threads} threads, {operations:,} pizzas each, {starting_stock:,} of every item in stock.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inventory contention benchmark.")
+    parser.add_argument("--threads", type=int, default=32, help="number of ordering threads")
+    parser.add_argument("--operations", type=int, default=20_000, help="pizzas each thread tries to order")
+    args = parser.parse_args()
+    run_benchmark(args.threads, args.operations)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,388 @@
+"""
+Author: Lavell McGrone
+Date: 2026-10-18
+Description: Kitchen dispatch for submitted pizza orders. Every pizza of a submitted order goes into a priority queue
+             (a heap, oldest order first, rush orders ahead of the rest) and is sent to the first free oven. An oven
+             holds OVEN_SLOTS pizzas, and identical pizzas that are waiting are baked together in one load, so five
+             of the same pepperoni pizza take one bake instead of five. Bake times depend on the crust, ex: a deep
+             dish takes longer than a thin crust.
+             The kitchen runs as a discrete-event simulation: the clock jumps from one event (an order arrives, an
+             oven finishes) to the next, so a whole Friday night runs in a fraction of a second. That makes it easy to
+             find how many ovens are needed for a peak hour. The report shows throughput, queue depth and how long
+             customers wait for their whole order.
+
+Usage:       python kitchen_scheduler.py simulate [--ovens 8] [--orders-per-hour 15] [--hours 4]
+             python kitchen_scheduler.py size [--orders-per-hour 60] [--target-minutes 30] [--max-ovens 20]
+             python kitchen_scheduler.py journal [--journal order_journal] [--ovens 8]
+"""
+
+import argparse
+import heapq
+import json
+import os
+import random
+from datetime import datetime
+
+import order_journal
+
+# Bake time in seconds for each crust. Crusts that are not listed use DEFAULT_BAKE_SECONDS.
+BAKE_SECONDS = {
+    "Thin": 7 * 60,
+    "Gluten-free": 8 * 60,
+    "Traditional": 10 * 60,
+    "Thick": 12 * 60,
+    "Deep dish": 16 * 60,
+}
+DEFAULT_BAKE_SECONDS = 10 * 60
+OVEN_SLOTS = 4  # Pizzas one oven can bake at the same time (only identical pizzas share a load)
+RUSH_PRIORITY = -1  # Priority of rush orders; normal orders are 0 and lower numbers go first
+
+# Event kinds. When two events happen at the same second, ovens finish before new orders arrive.
+OVEN_DONE = 0
+ORDER_ARRIVES = 1
+
+
+def pizza_key(pizza):
+    """
+    :param pizza: One pizza of an order, {"ingredients": [[category, name, price], ...], "subtotal": ...}.
+    :return: A tuple of (category, name) pairs; identical pizzas have the same key.
+    """
+    return tuple((category, name) for category, name, unused_price in pizza["ingredients"])
+
+
+def bake_seconds(key):
+    """
+    :param key: A pizza key from pizza_key().
+    :return: How long the pizza bakes, depending on its crust.
+    """
+    for category, name in key:
+        if category.lower() == "crust":
+            return BAKE_SECONDS.get(name, DEFAULT_BAKE_SECONDS)
+    return DEFAULT_BAKE_SECONDS
+
+
+def new_kitchen(ovens, slots=OVEN_SLOTS):
+    """
+    :param ovens: Number of ovens.
+    :param slots: Pizzas per oven load.
+    :return: A kitchen dictionary with an empty queue and a clock at 0 seconds.
+    """
+    return {
+        "ovens": ovens,
+        "free_ovens": ovens,
+        "slots": slots,
+        "clock": 0,
+        "sequence": 0,  # Tie breaker, so heap entries never compare dictionaries
+        "queue": [],  # Heap of (priority, arrival time, sequence, pizza)
+        "waiting": {},  # Pizza key -> list of queued pizzas with that key, oldest first
+        "queued": 0,  # Pizzas in the queue that are not in an oven yet
+        "events": [],  # Heap of (time, event kind, sequence, data)
+        # Statistics
+        "orders_done": 0,
+        "pizzas_done": 0,
+        "loads": 0,
+        "latencies": [],  # Seconds from an order arriving until its last pizza comes out
+        "max_queue": 0,
+        "queue_area": 0,  # Queue depth multiplied by time, for the time-weighted average queue depth
+        "busy_area": 0,  # Busy ovens multiplied by time, for oven utilization
+        "last_change": 0,
+    }
+
+
+def next_sequence(kitchen):
+    """
+    :param kitchen: The kitchen dictionary.
+    :return: The next tie breaker number.
+    """
+    kitchen["sequence"] = kitchen["sequence"] + 1
+    return kitchen["sequence"]
+
+
+def schedule_order(kitchen, order_data, arrival_time, priority=0):
+    """
+    Add an order to the simulation; it arrives at arrival_time.
+    :param kitchen: The kitchen dictionary.
+    :param order_data: A submitted order, like the ones saved in the order journal.
+    :param arrival_time: Seconds since the start of the simulation.
+    :param priority: 0 for a normal order, RUSH_PRIORITY for a rush order.
+    """
+    heapq.heappush(kitchen["events"],
+                   (arrival_time, ORDER_ARRIVES, next_sequence(kitchen), (order_data, priority)))
+
+
+def advance_clock(kitchen, now):
+    """
+    Move the clock forward and add the time that just passed to the queue and oven statistics.
+    :param kitchen: The kitchen dictionary.
+    :param now: The new time in seconds.
+    """
+    elapsed = now - kitchen["last_change"]
+    kitchen["queue_area"] = kitchen["queue_area"] + kitchen["queued"] * elapsed
+    kitchen["busy_area"] = kitchen["busy_area"] + (kitchen["ovens"] - kitchen["free_ovens"]) * elapsed
+    kitchen["last_change"] = now
+    kitchen["clock"] = now
+
+
+def order_arrives(kitchen, order_data, priority):
+    """
+    Put every pizza of a new order into the queue.
+    :param kitchen: The kitchen dictionary.
+    :param order_data: The submitted order.
+    :param priority: The order's priority.
+    """
+    pizzas = order_data.get("pizzas", [])
+    if not pizzas:
+        return
+    order = {"arrival": kitchen["clock"], "remaining": len(pizzas)}
+    for pizza_data in pizzas:
+        key = pizza_key(pizza_data)
+        pizza = {"order": order, "key": key, "in_oven": False}
+        heapq.heappush(kitchen["queue"], (priority, kitchen["clock"], next_sequence(kitchen), pizza))
+        kitchen["waiting"].setdefault(key, []).append(pizza)
+    kitchen["queued"] = kitchen["queued"] + len(pizzas)
+    kitchen["max_queue"] = max(kitchen["max_queue"], kitchen["queued"])
+
+
+def start_loads(kitchen):
+    """
+    Fill free ovens. The pizza at the front of the queue goes in first, together with up to OVEN_SLOTS - 1 waiting
+    pizzas that are identical to it. Those pizzas stay in the heap and are skipped when they reach the front.
+    :param kitchen: The kitchen dictionary.
+    """
+    queue = kitchen["queue"]
+    while kitchen["free_ovens"] and queue:
+        pizza = heapq.heappop(queue)[3]
+        if pizza["in_oven"]:
+            continue  # Already baked along with an identical pizza
+        waiting = kitchen["waiting"][pizza["key"]]
+        load = [pizza]
+        waiting.remove(pizza)
+        while waiting and len(load) < kitchen["slots"]:
+            load.append(waiting.pop(0))
+        if not waiting:
+            del kitchen["waiting"][pizza["key"]]
+        for baking in load:
+            baking["in_oven"] = True
+        kitchen["queued"] = kitchen["queued"] - len(load)
+        kitchen["free_ovens"] = kitchen["free_ovens"] - 1
+        kitchen["loads"] = kitchen["loads"] + 1
+        done_time = kitchen["clock"] + bake_seconds(pizza["key"])
+        heapq.heappush(kitchen["events"], (done_time, OVEN_DONE, next_sequence(kitchen), load))
+
+
+def oven_done(kitchen, load):
+    """
+    Take a finished load out of the oven and complete any order whose last pizza was in it.
+    :param kitchen: The kitchen dictionary.
+    :param load: The pizzas that were baking.
+    """
+    kitchen["free_ovens"] = kitchen["free_ovens"] + 1
+    kitchen["pizzas_done"] = kitchen["pizzas_done"] + len(load)
+    for pizza in load:
+        order = pizza["order"]
+        order["remaining"] = order["remaining"] - 1
+        if order["remaining"] == 0:
+            kitchen["orders_done"] = kitchen["orders_done"] + 1
+            kitchen["latencies"].append(kitchen["clock"] - order["arrival"])
+
+
+def run_simulation(kitchen):
+    """
+    Process events in time order until every order is baked.
+    :param kitchen: The kitchen dictionary, with orders added by schedule_order().
+    :return: The kitchen dictionary, with its statistics filled in.
+    """
+    events = kitchen["events"]
+    while events:
+        event_time, kind, unused_sequence, data = heapq.heappop(events)
+        advance_clock(kitchen, event_time)
+        if kind == ORDER_ARRIVES:
+            order_arrives(kitchen, *data)
+        else:
+            oven_done(kitchen, data)
+        start_loads(kitchen)
+    return kitchen
+
+
+def percentile(sorted_values, fraction):
+    """
+    :param sorted_values: Sorted list of numbers.
+    :param fraction: 0.5 for the median, 0.95 for p95.
+    :return: The value at that fraction, or 0 for an empty list.
+    """
+    if not sorted_values:
+        return 0
+    return sorted_values[min(int(len(sorted_values) * fraction), len(sorted_values) - 1)]
+
+
+def summarize(kitchen):
+    """
+    :param kitchen: A kitchen after run_simulation().
+    :return: Dictionary of results, with times in minutes.
+    """
+    latencies = sorted(kitchen["latencies"])
+    hours = kitchen["clock"] / 3600 or 1
+    return {
+        "ovens": kitchen["ovens"],
+        "orders": kitchen["orders_done"],
+        "pizzas": kitchen["pizzas_done"],
+        "loads": kitchen["loads"],
+        "hours": kitchen["clock"] / 3600,
+        "pizzas_per_hour": kitchen["pizzas_done"] / hours,
+        "max_queue": kitchen["max_queue"],
+        "average_queue": kitchen["queue_area"] / kitchen["clock"] if kitchen["clock"] else 0,
+        "utilization": kitchen["busy_area"] / (kitchen["clock"] * kitchen["ovens"]) if kitchen["clock"] else 0,
+        "mean_minutes": sum(latencies) / len(latencies) / 60 if latencies else 0,
+        "p50_minutes": percentile(latencies, 0.5) / 60,
+        "p95_minutes": percentile(latencies, 0.95) / 60,
+        "max_minutes": latencies[-1] / 60 if latencies else 0,
+    }
+
+
+def display_summary(results):
+    """
+    :param results: Dictionary from summarize().
+    """
+    print(f"\n{'Kitchen Simulation':^60}")
+    print("=" * 60)
+    print(f"{'Ovens':<40}{results['ovens']:>20,}")
+    print(f"{'Orders completed':<40}{results['orders']:>20,}")
+    print(f"{'Pizzas baked':<40}{results['pizzas']:>20,}")
+    print(f"{'Oven loads (identical pizzas batched)':<40}{results['loads']:>20,}")
+    print(f"{'Simulated time (hours)':<40}{results['hours']:>20.2f}")
+    print(f"{'Throughput (pizzas/hour)':<40}{results['pizzas_per_hour']:>20,.1f}")
+    print(f"{'Oven utilization':<40}{results['utilization'] * 100:>19.1f}%")
+    print("-" * 60)
+    print(f"{'Average queue depth (pizzas)':<40}{results['average_queue']:>20.1f}")
+    print(f"{'Longest queue (pizzas)':<40}{results['max_queue']:>20,}")
+    print("-" * 60)
+    print(f"{'Order wait, average (minutes)':<40}{results['mean_minutes']:>20.1f}")
+    print(f"{'Order wait, median (minutes)':<40}{results['p50_minutes']:>20.1f}")
+    print(f"{'Order wait, 95th percentile (minutes)':<40}{results['p95_minutes']:>20.1f}")
+    print(f"{'Order wait, longest (minutes)':<40}{results['max_minutes']:>20.1f}")
+    print("=" * 60)
+
+
+def random_orders(orders_per_hour, hours, seed=1150):
+    """
+    Make random orders with random (Poisson) arrival times. About half of the pizzas are one of a few popular
+    pizzas, like on a real menu, so identical pizzas show up close together.
+    :param orders_per_hour: Average number of orders per hour.
+    :param hours: How many hours orders keep coming in.
+    :param seed: Random seed, so runs can be compared.
+    :return: List of (arrival time in seconds, order data, priority) tuples.
+    """
+    with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), "ingredients.json"), "r") as file:
+        catalog = json.load(file)
+    generator = random.Random(seed)
+
+    def random_pizza():
+        ingredients = [[option["category"].capitalize(), generator.choice(list(option["options"])), 0]
+                       for option in catalog["base_options"]]
+        ingredients.extend(["Topping", topping, 0] for topping in catalog["toppings"] if generator.random() < 0.2)
+        return {"ingredients": ingredients}
+
+    popular = [random_pizza() for unused_value in range(5)]
+    orders = []
+    arrival_time = generator.expovariate(orders_per_hour / 3600)
+    while arrival_time < hours * 3600:
+        pizzas = [generator.choice(popular) if generator.random() < 0.5 else random_pizza()
+                  for unused_value in range(generator.randint(1, 4))]
+        priority = RUSH_PRIORITY if generator.random() < 0.05 else 0
+        orders.append((arrival_time, {"pizzas": pizzas}, priority))
+        arrival_time = arrival_time + generator.expovariate(orders_per_hour / 3600)
+    return orders
+
+
+def simulate(orders, ovens, slots=OVEN_SLOTS):
+    """
+    :param orders: List of (arrival time in seconds, order data, priority) tuples.
+    :param ovens: Number of ovens.
+    :param slots: Pizzas per oven load.
+    :return: Dictionary of results from summarize().
+    """
+    kitchen = new_kitchen(ovens, slots)
+    for arrival_time, order_data, priority in orders:
+        schedule_order(kitchen, order_data, arrival_time, priority)
+    return summarize(run_simulation(kitchen))
+
+
+def size_ovens(orders, target_minutes, max_ovens):
+    """
+    Run the same orders with 1, 2, 3... ovens and show the smallest kitchen whose 95th percentile wait meets the target.
+    :param orders: List of (arrival time in seconds, order data, priority) tuples.
+    :param target_minutes: Longest acceptable 95th percentile order wait.
+    :param max_ovens: Largest number of ovens to try.
+    """
+    print(f"\n{'Oven Sizing':^70}")
+    print("=" * 70)
+    print(f"{'Ovens':>6}{'Pizzas/hour':>14}{'Utilization':>14}{'Max queue':>12}{'p95 wait (min)':>18}")
+    print("-" * 70)
+    enough = None
+    for ovens in range(1, max_ovens + 1):
+        results = simulate(orders, ovens)
+        print(f"{ovens:>6}{results['pizzas_per_hour']:>14,.1f}{results['utilization'] * 100:>13.1f}%"
+              f"{results['max_queue']:>12,}{results['p95_minutes']:>18.1f}")
+        if results["p95_minutes"] <= target_minutes:
+            enough = ovens
+            break
+    print("=" * 70)
+    if enough is None:
+        print(f"Even {max_ovens} ovens can't keep the 95th percentile wait under {target_minutes} minutes.")
+    else:
+        print(f"{enough} oven(s) keep the 95th percentile wait under {target_minutes} minutes.")
+
+
+def journal_orders(journal_dir):
+    """
+    Read the submitted orders from the order journal. Their "placed_at" times become the arrival times;
+    orders saved before times were recorded arrive one minute after the order before them.
+    :param journal_dir: Folder that holds the order journal.
+    :return: List of (arrival time in seconds, order data, priority) tuples.
+    """
+    orders = []
+    first_time = None
+    arrival_time = 0
+    journal = order_journal.open_journal(journal_dir, read_only=True)
+    try:
+        for unused_number, order_data in order_journal.iter_orders(journal):
+            placed_at = order_data.get("placed_at")
+            if placed_at:
+                placed_time = datetime.fromisoformat(placed_at).timestamp()
+                first_time = placed_time if first_time is None else first_time
+                arrival_time = max(placed_time - first_time, arrival_time)
+            elif orders:
+                arrival_time = arrival_time + 60
+            orders.append((arrival_time, order_data, 0))
+    finally:
+        order_journal.close_journal(journal)
+    return orders
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Kitchen dispatch simulation for submitted pizza orders.")
+    parser.add_argument("command", choices=["simulate", "size", "journal"])
+    parser.add_argument("--ovens", type=int, default=8, help="number of ovens")
+    parser.add_argument("--orders-per-hour", type=float, default=15, help="average orders per hour")
+    parser.add_argument("--hours", type=float, default=4, help="hours of orders to simulate")
+    parser.add_argument("--target-minutes", type=float, default=30, help="p95 order wait goal for size")
+    parser.add_argument("--max-ovens", type=int, default=20, help="most ovens tried by size")
+    parser.add_argument("--journal", default=order_journal.DEFAULT_JOURNAL_DIR, help="order journal folder")
+    args = parser.parse_args()
+
+    if args.command == "journal":
+        if not os.path.isdir(args.journal):
+            print(f"Error: No order journal found in '{args.journal}'. Please place an order first.")
+            return
+        display_summary(simulate(journal_orders(args.journal), args.ovens))
+        return
+
+    orders = random_orders(args.orders_per_hour, args.hours)
+    if args.command == "simulate":
+        display_summary(simulate(orders, args.ovens))
+    else:
+        size_ovens(orders, args.target_minutes, args.max_ovens)
+
+
+if __name__ == "__main__":
+    main()
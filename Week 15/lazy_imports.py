@@ -0,0 +1,37 @@
+"""
+Author: Lavell McGrone
+Date: 2026-10-18
+Description: Load heavy modules (requests, pyinputplus) only when they are first used. Importing requests alone takes
+             about 100 ms, and a kiosk run that finds a fresh catalog in the catalog cache never touches the network,
+             so it shouldn't pay for it before the first prompt. lazy_import() hands back the module right away
+             (importlib's LazyLoader) and runs the real import on the first attribute lookup, ex: requests.get or
+             pyip.inputMenu. Modules that are already imported are returned as they are.
+             Set the environment variable PIZZA_EAGER_IMPORTS=1 to import everything at start up again, ex: to
+             compare start up times or to find an import error right away.
+"""
+
+import importlib
+import importlib.util
+import os
+import sys
+
+
+def lazy_import(name):
+    """
+    :param name: Name of the module, ex: "requests".
+    :return: The module. Unless it was imported already, its code runs the first time one of its attributes is used.
+    :raises ModuleNotFoundError: If the module is not installed (checked right away, without importing it).
+    """
+    if name in sys.modules:
+        return sys.modules[name]  # Returned as it is: import_module() would look inside it and load a lazy module
+    if os.environ.get("PIZZA_EAGER_IMPORTS") == "1":
+        return importlib.import_module(name)
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named {name!r}", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module  # Later "import name" statements get the same lazy module
+    loader.exec_module(module)
+    return module
@@ -0,0 +1,331 @@
+"""
+Author: Lavell McGrone
+Date: 2026-10-18
+Description: A precomputed price index over every pizza the menu can make. With 5 crusts, 5 sauces, 5 cheeses and
+             any of 10 toppings there are about 128,000 different pizzas. The index keeps all of them sorted by price,
+             so questions like "all pizzas between $20 and $25" or "the 5 cheapest vegetarian pizzas under $15" are a
+             binary search (bisect) plus reading the answers, instead of going through every combination again.
+             Filters like "vegetarian" are added once with add_filter() and keep their own sorted index.
+             When one price on the menu changes, only the pizzas that contain that item move: they are shifted by the
+             price difference and merged back with the rest, without building the cross product again.
+             Run this file directly for example queries and timings.
+"""
+
+import copy
+import heapq
+import json
+import os
+import time
+from bisect import bisect_left, bisect_right
+
+from price_table import compile_price_table, decode_ingredients, to_cents
+
+MEAT_TOPPINGS = {"Pepperoni", "Sausage", "Bacon", "Grilled chicken", "Ham"}  # Left out by the "vegetarian" filter
+
+
+def pack_config(table, ids, mask):
+    """
+    Pack one pizza into a single integer: the base option ids in mixed radix, followed by the topping bits.
+    :param table: The compiled price table.
+    :param ids: Tuple of option ids, one per category.
+    :param mask: Topping bitmask.
+    :return: The packed pizza.
+    """
+    base_code = 0
+    for category_cents, option_id in zip(table["option_cents"], ids):
+        base_code = base_code * len(category_cents) + option_id
+    return (base_code << len(table["topping_names"])) | mask
+
+
+def unpack_config(table, code):
+    """
+    :param table: The compiled price table.
+    :param code: A packed pizza from pack_config().
+    :return: A tuple of (option ids tuple, topping bitmask).
+    """
+    topping_count = len(table["topping_names"])
+    mask = code & ((1 << topping_count) - 1)
+    base_code = code >> topping_count
+    ids = []
+    for category_cents in reversed(table["option_cents"]):
+        base_code, option_id = divmod(base_code, len(category_cents))
+        ids.append(option_id)
+    return tuple(reversed(ids)), mask
+
+
+def build_menu_index(base_options, toppings):
+    """
+    Price every possible pizza once and sort them by price.
+    :param base_options: List of base options with categories and prices.
+    :param toppings: Dictionary of toppings and their prices.
+    :return: The menu index dictionary.
+    """
+    table = compile_price_table(base_options, toppings)
+    topping_count = len(table["topping_names"])
+
+    # Price every topping subset once (1,024 for 10 toppings), and every crust/sauce/cheese combination once (125)
+    subset_prices = [0] * (1 << topping_count)
+    for mask in range(1, len(subset_prices)):
+        lowest_bit = (mask & -mask).bit_length() - 1
+        subset_prices[mask] = subset_prices[mask & (mask - 1)] + table["topping_cents"][lowest_bit]
+    base_combos = [((), 0)]
+    for category_cents in table["option_cents"]:
+        base_combos = [(ids + (option_id,), cents + category_cents[option_id])
+                       for ids, cents in base_combos for option_id in range(len(category_cents))]
+
+    entries = sorted(
+        (base_cents + topping_cents, pack_config(table, ids, mask))
+        for ids, base_cents in base_combos
+        for mask, topping_cents in enumerate(subset_prices)
+    )
+    return {
+        "base_options": copy.deepcopy(base_options),  # Own copies, so update_price() never changes the caller's menu
+        "toppings": dict(toppings),
+        "table": table,
+        "prices": [price for price, unused_code in entries],  # Sorted, searched with bisect
+        "codes": [code for unused_price, code in entries],  # codes[i] is the pizza that costs prices[i]
+        "filters": {},  # Filter name -> its own sorted index
+    }
+
+
+def topping_mask(table, names):
+    """
+    :param table: The compiled price table.
+    :param names: Topping names (names that are not on the menu are ignored).
+    :return: Bitmask with a bit for each of the toppings.
+    """
+    mask = 0
+    for name in names:
+        mask = mask | table["topping_bits"].get(name, 0)
+    return mask
+
+
+def option_digit(table, category, name):
+    """
+    Work out where a base option sits in the mixed radix base code of a packed pizza.
+    :param table: The compiled price table.
+    :param category: A base category like "crust".
+    :param name: Name of the option.
+    :return: A tuple of (radix below the category, radix of the category, option id).
+    :raises ValueError: If the category is not on the menu.
+    :raises KeyError: If the option is not in the category.
+    """
+    position = [category_name.lower() for category_name in table["categories"]].index(category.lower())
+    radix_below = 1
+    for category_cents in table["option_cents"][position + 1:]:
+        radix_below = radix_below * len(category_cents)
+    return radix_below, len(table["option_cents"][position]), table["option_ids"][position][name]
+
+
+def add_filter(index, name, exclude_toppings=(), require_toppings=(), exclude_options=()):
+    """
+    Create (or rebuild) a named filter with its own sorted index, ex: add_filter(index, "vegetarian", MEAT_TOPPINGS).
+    :param index: The menu index.
+    :param name: Name of the filter.
+    :param exclude_toppings: Toppings a matching pizza must not have.
+    :param require_toppings: Toppings a matching pizza must have.
+    :param exclude_options: (category, name) base options a matching pizza must not have, ex: ("crust", "Thin").
+    """
+    table = index["table"]
+    topping_count = len(table["topping_names"])
+    exclude_mask = topping_mask(table, exclude_toppings)
+    require_mask = topping_mask(table, require_toppings)
+    excluded_digits = [option_digit(table, category, option) for category, option in exclude_options]
+    prices = []
+    codes = []
+    for price, code in zip(index["prices"], index["codes"]):
+        if code & exclude_mask == 0 and code & require_mask == require_mask:
+            base_code = code >> topping_count
+            if not any(base_code // radix_below % radix == option_id
+                       for radix_below, radix, option_id in excluded_digits):
+                prices.append(price)
+                codes.append(code)
+    index["filters"][name] = {"exclude_mask": exclude_mask, "require_mask": require_mask,
+                              "exclude_options": list(exclude_options), "prices": prices, "codes": codes}
+
+
+def get_sorted_lists(index, filter_name=None):
+    """
+    :param index: The menu index.
+    :param filter_name: Name of a filter added with add_filter(), or None for every pizza.
+    :return: The sorted (prices, codes) lists to search.
+    """
+    source = index if filter_name is None else index["filters"][filter_name]
+    return source["prices"], source["codes"]
+
+
+def pizzas_in_range(index, low, high, filter_name=None, limit=None):
+    """
+    Find every pizza with a price between low and high dollars (both included), cheapest first.
+    :param index: The menu index.
+    :param low: Lowest price in dollars.
+    :param high: Highest price in dollars.
+    :param filter_name: Optional filter name.
+    :param limit: Optional maximum number of pizzas to return.
+    :return: A list of (price in cents, packed pizza) tuples.
+    """
+    prices, codes = get_sorted_lists(index, filter_name)
+    start = bisect_left(prices, to_cents(low))
+    end = bisect_right(prices, to_cents(high))
+    if limit is not None:
+        end = min(end, start + limit)
+    return list(zip(prices[start:end], codes[start:end]))
+
+
+def cheapest(index, count, filter_name=None, under=None):
+    """
+    :param index: The menu index.
+    :param count: How many pizzas to return.
+    :param filter_name: Optional filter name.
+    :param under: Optional highest price in dollars.
+    :return: The cheapest pizzas as a list of (price in cents, packed pizza) tuples.
+    """
+    prices, codes = get_sorted_lists(index, filter_name)
+    end = len(prices) if under is None else bisect_right(prices, to_cents(under))
+    end = min(end, count)
+    return list(zip(prices[:end], codes[:end]))
+
+
+def most_expensive(index, count, filter_name=None, under=None):
+    """
+    :param index: The menu index.
+    :param count: How many pizzas to return.
+    :param filter_name: Optional filter name.
+    :param under: Optional highest price in dollars.
+    :return: The most expensive pizzas (at or under the limit) as (price in cents, packed pizza) tuples.
+    """
+    prices, codes = get_sorted_lists(index, filter_name)
+    end = len(prices) if under is None else bisect_right(prices, to_cents(under))
+    start = max(end - count, 0)
+    return list(zip(prices[start:end], codes[start:end]))[::-1]
+
+
+def shift_entries(prices, codes, matches, delta):
+    """
+    Move every entry that matches by delta cents and merge the two groups back into one sorted list.
+    Both groups are still sorted on their own, so this is a single merge pass instead of a new sort.
+    :param prices: Sorted prices, replaced in place.
+    :param codes: Codes that go with the prices, replaced in place.
+    :param matches: Function that takes a code and returns True if that pizza changes price.
+    :param delta: Price change in cents.
+    """
+    moved = []
+    kept = []
+    for price, code in zip(prices, codes):
+        if matches(code):
+            moved.append((price + delta, code))
+        else:
+            kept.append((price, code))
+    merged = list(heapq.merge(kept, moved))
+    prices[:] = [price for price, unused_code in merged]
+    codes[:] = [code for unused_price, code in merged]
+
+
+def update_price(index, category, name, new_price):
+    """
+    Change one price on the menu and update the index (and every filter) without rebuilding it.
+    :param index: The menu index.
+    :param category: "topping" or a base category like "crust".
+    :param name: Name of the item whose price changes.
+    :param new_price: The new price in dollars.
+    :raises KeyError: If the item is not on the menu.
+    """
+    table = index["table"]
+    topping_count = len(table["topping_names"])
+
+    if category.lower() == "topping":
+        delta = to_cents(new_price) - to_cents(index["toppings"][name])
+        index["toppings"][name] = new_price
+        bit = table["topping_bits"][name]
+
+        def matches(code):
+            return code & bit
+    else:
+        position = [category_name.lower() for category_name in table["categories"]].index(category.lower())
+        options = index["base_options"][position]["options"]
+        delta = to_cents(new_price) - to_cents(options[name])
+        options[name] = new_price
+        radix_below, radix, option_id = option_digit(table, category, name)
+
+        def matches(code):
+            return (code >> topping_count) // radix_below % radix == option_id
+
+    # The small price table is simply compiled again; it is the big cross product that is never rebuilt
+    index["table"] = compile_price_table(index["base_options"], index["toppings"])
+    if delta == 0:
+        return
+    shift_entries(index["prices"], index["codes"], matches, delta)
+    for sub_index in index["filters"].values():
+        shift_entries(sub_index["prices"], sub_index["codes"], matches, delta)
+
+
+def describe(index, code):
+    """
+    :param index: The menu index.
+    :param code: A packed pizza.
+    :return: A short description, ex: "Thin, Marinara, Cheddar + Bacon, Onions".
+    """
+    ids, mask = unpack_config(index["table"], code)
+    ingredients = decode_ingredients(index["table"], ids, mask)
+    base = ", ".join(name for category, name, unused_price in ingredients if category != "Topping")
+    toppings = ", ".join(name for category, name, unused_price in ingredients if category == "Topping")
+    return base + (" + " + toppings if toppings else "")
+
+
+def display_results(index, title, results):
+    """
+    :param index: The menu index.
+    :param title: Heading for the results.
+    :param results: List of (price in cents, packed pizza) tuples.
+    """
+    print(f"\n{title}")
+    print("-" * 80)
+    for price, code in results:
+        print(f"${price / 100:>7.2f}   {describe(index, code)}")
+
+
+def main():
+    with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), "ingredients.json"), "r") as file:
+        catalog = json.load(file)
+
+    start_time = time.perf_counter()
+    index = build_menu_index(catalog["base_options"], catalog["toppings"])
+    add_filter(index, "vegetarian", exclude_toppings=MEAT_TOPPINGS)
+    build_seconds = time.perf_counter() - start_time
+    print(f"Indexed {len(index['prices']):,} pizzas in {build_seconds * 1000:.1f} ms.")
+
+    display_results(index, "5 cheapest vegetarian pizzas under $15:", cheapest(index, 5, "vegetarian", under=15))
+    display_results(index, "5 most expensive vegetarian pizzas under $15:",
+                    most_expensive(index, 5, "vegetarian", under=15))
+    in_range = pizzas_in_range(index, 20, 25)
+    print(f"\n{len(in_range):,} pizzas cost between $20.00 and $25.00.")
+
+    queries = 10_000
+    start_time = time.perf_counter()
+    for unused_value in range(queries):
+        cheapest(index, 5, "vegetarian", under=15)
+        pizzas_in_range(index, 20, 25, limit=10)
+    query_seconds = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    update_price(index, "topping", "Bacon", 3.25)
+    update_seconds = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    rebuilt = build_menu_index(index["base_options"], index["toppings"])
+    add_filter(rebuilt, "vegetarian", exclude_toppings=MEAT_TOPPINGS)
+    rebuild_seconds = time.perf_counter() - start_time
+    same = rebuilt["prices"] == index["prices"] and sorted(zip(rebuilt["prices"], rebuilt["codes"])) == sorted(
+        zip(index["prices"], index["codes"]))
+
+    print(f"\n{'Menu Price Index Timings':^60}")
+    print("=" * 60)
+    print(f"{'Query pairs per second':<40}{queries / query_seconds:>20,.0f}")
+    print(f"{'Incremental price update (ms)':<40}{update_seconds * 1000:>20.1f}")
+    print(f"{'Full rebuild (ms)':<40}{rebuild_seconds * 1000:>20.1f}")
+    print(f"{'Update matches a full rebuild':<40}{str(same):>20}")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""
+Author: Lavell McGrone
+Date: 2026-10-18
+Description: Remember pizzas that were already priced. In real traffic a handful of pizzas (pepperoni on thin crust,
+             the plain cheese pizza, ...) make up most orders, but get_pizza_ingredients() and display_order_summary()
+             build the ingredient list, add up the price and format the receipt lines from scratch every time.
+             Every pizza gets a canonical configuration key: the crust/sauce/cheese choices in menu order plus the
+             sorted toppings, so the order in which toppings were picked doesn't matter. The priced result (ingredient
+             tuples, cost and receipt lines) is kept in a bounded LRU cache (functools.lru_cache) that counts its hits
+             and misses. The cache belongs to one catalog: use_catalog() compares a fingerprint of the catalog and
+             empties the cache as soon as a price or option changes.
+
+Usage:       python menu_memo.py [--pizzas 1000000]   (benchmark on skewed traffic)
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import random
+import time
+from functools import lru_cache
+
+MAX_CONFIGURATIONS = 4096  # Most pizzas kept; the least recently used one is dropped after that
+
+# The catalog the cached prices belong to
+memo_catalog = {"fingerprint": None, "base_options": [], "toppings": {}}
+
+
+def catalog_fingerprint(base_options, toppings):
+    """
+    :param base_options: List of base options with categories and prices.
+    :param toppings: Dictionary of toppings and their prices.
+    :return: A short hash that changes whenever any category, option, topping or price changes.
+    """
+    text = json.dumps([base_options, toppings], sort_keys=True)
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def use_catalog(base_options, toppings):
+    """
+    Make the cache price pizzas from this catalog. If it differs from the catalog the cache was filled from,
+    every remembered pizza is thrown away.
+    :param base_options: List of base options with categories and prices.
+    :param toppings: Dictionary of toppings and their prices.
+    """
+    fingerprint = catalog_fingerprint(base_options, toppings)
+    if fingerprint != memo_catalog["fingerprint"]:
+        memo_catalog["fingerprint"] = fingerprint
+        memo_catalog["base_options"] = base_options
+        memo_catalog["toppings"] = toppings
+        price_configuration.cache_clear()
+        ingredient_lines.cache_clear()
+
+
+def configuration_key(base_choices, topping_choices):
+    """
+    :param base_choices: The chosen option of every base category, in menu order (crust, sauce, cheese).
+    :param topping_choices: The chosen toppings, in any order.
+    :return: The canonical key, ex: (("Thin", "Marinara", "Cheddar"), ("Bacon", "Onions")).
+    """
+    return tuple(base_choices), tuple(sorted(set(topping_choices)))
+
+
+@lru_cache(maxsize=MAX_CONFIGURATIONS)
+def price_configuration(key):
+    """
+    Price one pizza from the current catalog, exactly like get_pizza_ingredients(): base options first, then
+    the toppings in menu order, added up one price at a time.
+    :param key: A key from configuration_key().
+    :return: A tuple of (ingredients tuple, pizza cost). Shared between callers, so it must not be changed.
+    :raises KeyError: If a choice is not in the catalog.
+    """
+    base_choices, topping_choices = key
+    ingredients = []
+    total_cost = 0
+    for option, choice in zip(memo_catalog["base_options"], base_choices):
+        ingredients.append((option["category"].capitalize(), choice, option["options"][choice]))
+        total_cost = total_cost + option["options"][choice]
+    chosen = set(topping_choices)
+    missing = chosen - set(memo_catalog["toppings"])
+    if missing:
+        raise KeyError(sorted(missing)[0])
+    for topping, price in memo_catalog["toppings"].items():
+        if topping in chosen:
+            ingredients.append(("Topping", topping, price))
+            total_cost = total_cost + price
+    return tuple(ingredients), total_cost
+
+
+@lru_cache(maxsize=MAX_CONFIGURATIONS)
+def ingredient_lines(ingredients):
+    """
+    :param ingredients: A pizza's ingredients as a tuple of (category, name, price) tuples.
+    :return: The ingredient lines of display_order_summary() for this pizza, as one string.
+    """
+    return "".join(f"{category:<12}     {name:<20}         $ {price:>17.2f}\n" for category, name, price in ingredients)
+
+
+def cache_stats():
+    """
+    :return: Dictionary with the hits, misses, size and maximum size of the pizza price cache.
+    """
+    info = price_configuration.cache_info()
+    return {"hits": info.hits, "misses": info.misses, "size": info.currsize, "max_size": info.maxsize}
+
+
+def run_benchmark(pizza_count=1_000_000):
+    """
+    Price skewed traffic (a few popular pizzas make up most orders) with and without the cache.
+    :param pizza_count: How many pizzas to price.
+    """
+    from batch_pricing import build_price_lookup, price_selection
+
+    with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), "ingredients.json"), "r") as file:
+        catalog = json.load(file)
+    base_options, toppings = catalog["base_options"], catalog["toppings"]
+    generator = random.Random(1150)
+
+    def random_pizza():
+        return ([generator.choice(list(option["options"])) for option in base_options],
+                [topping for topping in toppings if generator.random() < 0.2])
+
+    # 20 popular pizzas get about 80% of the orders, the rest is anything on the menu
+    popular = [random_pizza() for unused_value in range(20)]
+    traffic = []
+    for unused_value in range(pizza_count):
+        base_choices, topping_choices = generator.choice(popular) if generator.random() < 0.8 else random_pizza()
+        traffic.append((base_choices, generator.sample(topping_choices, len(topping_choices))))
+
+    lookup = build_price_lookup(base_options, toppings)
+    categories = [option["category"].lower() for option in base_options]
+    start_time = time.perf_counter()
+    for base_choices, topping_choices in traffic:
+        selection = dict(zip(categories, base_choices))
+        selection["toppings"] = topping_choices
+        price_selection(selection, lookup)
+    uncached_seconds = time.perf_counter() - start_time
+
+    use_catalog(base_options, toppings)
+    price_configuration.cache_clear()
+    start_time = time.perf_counter()
+    for base_choices, topping_choices in traffic:
+        price_configuration(configuration_key(base_choices, topping_choices))
+    cached_seconds = time.perf_counter() - start_time
+    stats = cache_stats()
+
+    print(f"\n{'Pizza Configuration Cache':^60}")
+    print("=" * 60)
+    print(f"{'Pizzas priced':<40}{pizza_count:>20,}")
+    print(f"{'Without cache (pizzas/sec)':<40}{pizza_count / uncached_seconds:>20,.0f}")
+    print(f"{'With cache (pizzas/sec)':<40}{pizza_count / cached_seconds:>20,.0f}")
+    print(f"{'Cache hits':<40}{stats['hits']:>20,}")
+    print(f"{'Cache misses':<40}{stats['misses']:>20,}")
+    print(f"{'Hit rate':<40}{stats['hits'] / pizza_count * 100:>19.1f}%")
+    print(f"{'Cached pizzas (max ' + format(stats['max_size'], ',') + ')':<40}{stats['size']:>20,}")
+    print("=" * 60)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the pizza configuration cache.")
+    parser.add_argument("--pizzas", type=int, default=1_000_000, help="pizzas to price")
+    args = parser.parse_args()
+    run_benchmark(args.pizzas)
+
+
+if __name__ == "__main__":
+    main()
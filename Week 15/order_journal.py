@@ -0,0 +1,510 @@
+"""
+Author: Lavell McGrone
+Date: 2026-10-18
+Description: An append-only order journal for the pizza ordering system. Instead of overwriting a single order.json
+             every time an order is submitted, each order is written as one line of JSON (JSON Lines) at the end of a
+             segment file. A small index file next to every segment stores the byte offset of each order, so reading
+             "the previous order" or "order #N" seeks straight to that line instead of parsing the whole history.
+             When a segment grows past a size limit, the journal rolls over to a new segment.
+             The journal is also the write-ahead log for submitted orders: commit_order() only returns once the order
+             is on disk (fsync). Orders submitted at the same time from many threads share one fsync (group commit):
+             the first waiting thread syncs everything appended so far while the others wait for it, and orders that
+             arrive during that fsync are picked up by the next one. On startup recover_segment() repairs the last
+             segment, so an order is either there completely or not at all.
+
+Usage:       python order_journal.py [orders]                               (append/read benchmark, 1,000,000 orders)
+             python order_journal.py commit [--threads 32] [--orders 100]   (fsync per order vs group commit)
+"""
+
+import argparse
+import json
+import os
+import struct
+import sys
+import tempfile
+import threading
+import time
+from bisect import bisect_right
+
+DEFAULT_JOURNAL_DIR = "order_journal"  # Folder where the segments and index files are stored
+MAX_SEGMENT_BYTES = 64 * 1024 * 1024  # Roll over to a new segment after 64 MB
+INDEX_ENTRY = struct.Struct("<Q")  # Every index entry is one 8-byte unsigned byte offset
+
+
+def segment_paths(journal_dir, segment_number):
+    """
+    Build the data and index file paths for one segment.
+    :param journal_dir: Folder that holds the journal.
+    :param segment_number: Number of the segment (1, 2, 3, ...).
+    :return: A tuple of (data path, index path).
+    """
+    base_name = os.path.join(journal_dir, f"segment_{segment_number:06d}")
+    return base_name + ".jsonl", base_name + ".idx"
+
+
+def open_journal(journal_dir=DEFAULT_JOURNAL_DIR, max_segment_bytes=MAX_SEGMENT_BYTES, read_only=False):
+    """
+    Open (or create) an order journal and get it ready for appends and reads.
+    :param journal_dir: Folder that holds the journal.
+    :param max_segment_bytes: Size limit of one segment file before rolling over.
+    :param read_only: Only read the journal (no crash repair and no appends), ex: for report worker processes.
+    :return: A dictionary holding the journal state, passed to the other journal functions.
+    """
+    os.makedirs(journal_dir, exist_ok=True)
+
+    # Find every existing segment by its file name, ex: segment_000003.jsonl -> 3
+    segment_numbers = sorted(
+        int(name[len("segment_"):-len(".jsonl")])
+        for name in os.listdir(journal_dir)
+        if name.startswith("segment_") and name.endswith(".jsonl")
+    )
+    if not segment_numbers:
+        segment_numbers = [1]
+
+    # Every index entry is a fixed 8 bytes, so the number of orders in a segment is just the index size / 8.
+    # first_orders[i] is the order number of the first order stored in segment_numbers[i].
+    first_orders = []
+    next_order = 1
+    for segment_number in segment_numbers[:-1]:
+        unused_data_path, index_path = segment_paths(journal_dir, segment_number)
+        first_orders.append(next_order)
+        next_order = next_order + os.path.getsize(index_path) // INDEX_ENTRY.size
+    first_orders.append(next_order)
+
+    journal = {
+        "dir": journal_dir,
+        "max_segment_bytes": max_segment_bytes,
+        "segment_numbers": segment_numbers,
+        "first_orders": first_orders,
+        "readers": {},  # Open read handles, one per segment, reused between reads
+        "data_file": None,
+        "index_file": None,
+        "active_count": 0,
+        "lock": threading.Lock(),  # Held while appending, so threads never interleave their writes
+        "synced": threading.Condition(),  # Signalled after every group fsync
+        "durable": 0,  # Orders up to this number are known to be on disk
+        "syncing": False,  # True while one thread is running the group fsync
+        "fsyncs": 0,  # Number of group fsyncs, for the benchmark
+    }
+    if read_only:
+        unused_data_path, index_path = segment_paths(journal_dir, segment_numbers[-1])
+        if os.path.exists(index_path):
+            journal["active_count"] = os.path.getsize(index_path) // INDEX_ENTRY.size
+        return journal
+
+    last_count = recover_segment(journal_dir, segment_numbers[-1])
+    open_active_segment(journal, last_count)
+    journal["durable"] = count_orders(journal)  # recover_segment() synced whatever it kept
+    return journal
+
+
+def fsync_directory(path):
+    """
+    Make a new or renamed file name in a folder survive a crash. Windows can't open folders, there it is skipped.
+    :param path: The folder.
+    """
+    if os.name != "nt":
+        directory = os.open(path, os.O_RDONLY)
+        try:
+            os.fsync(directory)
+        finally:
+            os.close(directory)
+
+
+def recover_segment(journal_dir, segment_number):
+    """
+    Make the data and index files of the last segment agree after a crash.
+    Orders that were fully written but are missing from the index get indexed, and a half written last line is cut off.
+    Index entries that point past the end of the data (the index reached the disk before the data did) are dropped.
+    The repaired files are synced, so the orders that are kept stay kept.
+    :param journal_dir: Folder that holds the journal.
+    :param segment_number: Number of the segment to check.
+    :return: The number of orders in the segment.
+    """
+    data_path, index_path = segment_paths(journal_dir, segment_number)
+    with open(data_path, "ab"), open(index_path, "ab"):
+        pass  # Create both files if they do not exist yet
+
+    with open(index_path, "r+b") as index_file, open(data_path, "r+b") as data_file:
+        index_size = os.path.getsize(index_path)
+        data_size = os.path.getsize(data_path)
+        count = index_size // INDEX_ENTRY.size  # A half written index entry at the end is dropped
+
+        # Start scanning right after the last indexed order that is really in the data file
+        position = 0
+        while count:
+            index_file.seek((count - 1) * INDEX_ENTRY.size)
+            data_file.seek(INDEX_ENTRY.unpack(index_file.read(INDEX_ENTRY.size))[0])
+            line = data_file.readline()
+            if line.endswith(b"\n"):
+                position = data_file.tell()
+                break
+            count = count - 1  # The index got ahead of the data
+        index_size = count * INDEX_ENTRY.size
+        index_file.truncate(index_size)
+
+        data_file.seek(position)
+        index_file.seek(index_size)
+        for line in iter(data_file.readline, b""):
+            if not line.endswith(b"\n"):
+                break  # The last order was only partly written, it gets truncated below
+            index_file.write(INDEX_ENTRY.pack(position))
+            position = position + len(line)
+            count = count + 1
+        if position != data_size:
+            data_file.truncate(position)
+        for file in (data_file, index_file):
+            file.flush()
+            os.fsync(file.fileno())
+    fsync_directory(journal_dir)
+    return count
+
+
+def open_active_segment(journal, count):
+    """
+    Open the newest segment for appending.
+    :param journal: The journal dictionary from open_journal().
+    :param count: Number of orders already stored in the newest segment.
+    """
+    data_path, index_path = segment_paths(journal["dir"], journal["segment_numbers"][-1])
+    journal["data_file"] = open(data_path, "ab")
+    journal["index_file"] = open(index_path, "ab")
+    journal["data_size"] = os.path.getsize(data_path)
+    journal["active_count"] = count
+
+
+def roll_over(journal):
+    """
+    Close the active segment and start a new, empty one. The old segment is synced first, since group commits only
+    sync the active segment.
+    :param journal: The journal dictionary from open_journal().
+    """
+    for file in (journal["data_file"], journal["index_file"]):
+        file.flush()
+        os.fsync(file.fileno())
+    journal["data_file"].close()
+    journal["index_file"].close()
+    journal["segment_numbers"].append(journal["segment_numbers"][-1] + 1)
+    journal["first_orders"].append(journal["first_orders"][-1] + journal["active_count"])
+    open_active_segment(journal, 0)
+    fsync_directory(journal["dir"])
+
+
+def append_order(journal, order_data):
+    """
+    Append one order to the end of the journal. The order is handed to the operating system but not synced to disk;
+    use commit_order() (or wait_durable()) when the order has to survive a crash.
+    :param journal: The journal dictionary from open_journal().
+    :param order_data: The order dictionary (same layout place_order() used for order.json).
+    :return: The order number given to this order, starting at 1.
+    """
+    line = (json.dumps(order_data, separators=(",", ":")) + "\n").encode("utf-8")
+
+    with journal["lock"]:
+        # Start a new segment if this order would push the active one past the size limit
+        if journal["data_size"] and journal["data_size"] + len(line) > journal["max_segment_bytes"]:
+            roll_over(journal)
+
+        # Write the order first and its offset second, so a crash in between is repaired by recover_segment()
+        journal["data_file"].write(line)
+        journal["data_file"].flush()
+        journal["index_file"].write(INDEX_ENTRY.pack(journal["data_size"]))
+        journal["index_file"].flush()
+
+        journal["data_size"] = journal["data_size"] + len(line)
+        journal["active_count"] = journal["active_count"] + 1
+        return count_orders(journal)
+
+
+def commit_order(journal, order_data):
+    """
+    Append one order and wait until it is on disk. Threads that commit at the same time share one fsync.
+    :param journal: The journal dictionary from open_journal().
+    :param order_data: The order dictionary.
+    :return: The order number given to this order, starting at 1.
+    """
+    order_number = append_order(journal, order_data)
+    wait_durable(journal, order_number)
+    return order_number
+
+
+def flush_for_sync(journal):
+    """
+    :param journal: The journal dictionary from open_journal().
+    :return: A tuple of (last order number appended, copies of the active data and index file descriptors).
+             The copies stay valid even if the segment rolls over and its files are closed before the fsync.
+    """
+    with journal["lock"]:
+        journal["data_file"].flush()
+        journal["index_file"].flush()
+        return count_orders(journal), (os.dup(journal["data_file"].fileno()), os.dup(journal["index_file"].fileno()))
+
+
+def wait_durable(journal, order_number):
+    """
+    Group commit: wait until every order up to order_number is on disk. If no other thread is syncing, this thread
+    syncs everything appended so far (data first, then the index) for all the threads that are waiting.
+    :param journal: The journal dictionary from open_journal().
+    :param order_number: Number of the order that has to be on disk.
+    """
+    synced = journal["synced"]
+    with synced:
+        while journal["durable"] < order_number:
+            if journal["syncing"]:
+                synced.wait()  # Another thread is syncing, it (or the next one) will cover this order too
+                continue
+            journal["syncing"] = True
+            synced.release()  # Let other threads append and line up while the disk works
+            synced_up_to = 0
+            try:
+                last_order, descriptors = flush_for_sync(journal)
+                try:
+                    for descriptor in descriptors:
+                        os.fsync(descriptor)
+                    synced_up_to = last_order
+                finally:
+                    for descriptor in descriptors:
+                        os.close(descriptor)
+            finally:
+                synced.acquire()
+                if synced_up_to:
+                    journal["durable"] = max(journal["durable"], synced_up_to)
+                    journal["fsyncs"] = journal["fsyncs"] + 1
+                journal["syncing"] = False
+                synced.notify_all()
+
+
+def count_orders(journal):
+    """
+    :param journal: The journal dictionary from open_journal().
+    :return: The total number of orders stored in the journal.
+    """
+    return journal["first_orders"][-1] + journal["active_count"] - 1
+
+
+def get_reader(journal, segment_position):
+    """
+    Get a reusable read handle for a segment.
+    :param journal: The journal dictionary from open_journal().
+    :param segment_position: Position of the segment in journal["segment_numbers"].
+    :return: A tuple of (data file, index file) opened for reading.
+    """
+    segment_number = journal["segment_numbers"][segment_position]
+    if segment_number not in journal["readers"]:
+        data_path, index_path = segment_paths(journal["dir"], segment_number)
+        journal["readers"][segment_number] = (open(data_path, "rb"), open(index_path, "rb"))
+    return journal["readers"][segment_number]
+
+
+def read_order(journal, order_number):
+    """
+    Read one order by its number without reading any other order.
+    :param journal: The journal dictionary from open_journal().
+    :param order_number: Number of the order, starting at 1.
+    :return: The order dictionary, or None if there is no order with that number.
+    """
+    if order_number < 1 or order_number > count_orders(journal):
+        return None
+
+    # Find the segment that holds this order, then look its offset up in the segment's index
+    segment_position = bisect_right(journal["first_orders"], order_number) - 1
+    data_file, index_file = get_reader(journal, segment_position)
+    index_file.seek((order_number - journal["first_orders"][segment_position]) * INDEX_ENTRY.size)
+    data_file.seek(INDEX_ENTRY.unpack(index_file.read(INDEX_ENTRY.size))[0])
+    return json.loads(data_file.readline())
+
+
+def read_last_order(journal):
+    """
+    :param journal: The journal dictionary from open_journal().
+    :return: The most recently appended order, or None if the journal is empty.
+    """
+    return read_order(journal, count_orders(journal))
+
+
+def iter_orders(journal, start=1):
+    """
+    Read orders one at a time from the given order number to the end of the journal.
+    Only one order is held in memory at a time, so this works for any history size.
+    :param journal: The journal dictionary from open_journal().
+    :param start: Order number to start from.
+    :return: A generator of (order number, order dictionary) tuples.
+    """
+    last_order = count_orders(journal)
+    if start < 1:
+        start = 1
+    if start > last_order:
+        return
+
+    segment_position = bisect_right(journal["first_orders"], start) - 1
+    order_number = start
+    while order_number <= last_order:
+        data_file, index_file = get_reader(journal, segment_position)
+        index_file.seek((order_number - journal["first_orders"][segment_position]) * INDEX_ENTRY.size)
+        data_file.seek(INDEX_ENTRY.unpack(index_file.read(INDEX_ENTRY.size))[0])
+        # Orders inside a segment are stored back to back, so keep reading lines until the segment ends
+        for line in data_file:
+            if order_number > last_order:
+                return
+            yield order_number, json.loads(line)
+            order_number = order_number + 1
+        segment_position = segment_position + 1
+
+
+def close_journal(journal):
+    """
+    Sync and close every file the journal has open.
+    :param journal: The journal dictionary from open_journal().
+    """
+    if journal["data_file"] is not None and not journal["data_file"].closed:
+        wait_durable(journal, count_orders(journal))
+        journal["data_file"].close()
+        journal["index_file"].close()
+    for data_file, index_file in journal["readers"].values():
+        data_file.close()
+        index_file.close()
+    journal["readers"].clear()
+
+
+def run_benchmark(num_orders=1_000_000, max_segment_bytes=MAX_SEGMENT_BYTES):
+    """
+    Write and read back a large number of orders in a temporary folder and display the timings.
+    :param num_orders: How many orders to write.
+    :param max_segment_bytes: Segment size limit used for the benchmark.
+    """
+    sample_order = {
+        "pizzas": [
+            {
+                "ingredients": [
+                    ["Crust", "Thin", 10.99], ["Sauce", "Marinara", 1.5], ["Cheese", "Mozzarella", 2.0],
+                    ["Topping", "Pepperoni", 2.0], ["Topping", "Mushrooms", 1.5],
+                ],
+                "subtotal": 17.99,
+            }
+        ],
+        "tax_amount": 1.26,
+        "tip_amount": 1.93,
+        "final_total": 21.18,
+    }
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        journal = open_journal(os.path.join(temp_dir, "journal"), max_segment_bytes)
+
+        start_time = time.perf_counter()
+        for unused_value in range(num_orders):
+            append_order(journal, sample_order)
+        write_seconds = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        read_count = sum(1 for unused_value in iter_orders(journal))
+        scan_seconds = time.perf_counter() - start_time
+
+        # Random lookups jump around the whole history, like "view order N" would
+        lookups = min(num_orders, 100_000)
+        step = max(num_orders // lookups, 1)
+        start_time = time.perf_counter()
+        for order_number in range(1, num_orders + 1, step):
+            read_order(journal, order_number)
+        lookup_seconds = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        read_last_order(journal)
+        last_seconds = time.perf_counter() - start_time
+
+        segments = len(journal["segment_numbers"])
+        close_journal(journal)
+
+    print(f"\n{'Order Journal Benchmark':^60}")
+    print("=" * 60)
+    print(f"{'Orders written':<30}{num_orders:>30,}")
+    print(f"{'Segments':<30}{segments:>30,}")
+    print(f"{'Append rate (orders/sec)':<30}{num_orders / write_seconds:>30,.0f}")
+    print(f"{'Scan rate (orders/sec)':<30}{read_count / scan_seconds:>30,.0f}")
+    print(f"{'Lookup rate (orders/sec)':<30}{len(range(1, num_orders + 1, step)) / lookup_seconds:>30,.0f}")
+    print(f"{'Previous order lookup (ms)':<30}{last_seconds * 1000:>30.3f}")
+    print("=" * 60)
+
+
+def commit_with_own_fsync(journal, order_data):
+    """
+    The way without group commit, for the benchmark: every order is appended and synced on its own.
+    :param journal: The journal dictionary from open_journal().
+    :param order_data: The order dictionary.
+    :return: The order number given to this order.
+    """
+    order_number = append_order(journal, order_data)
+    with journal["lock"]:
+        os.fsync(journal["data_file"].fileno())
+        os.fsync(journal["index_file"].fileno())
+        journal["fsyncs"] = journal["fsyncs"] + 1
+    return order_number
+
+
+def run_commit_benchmark(threads=32, orders_per_thread=100):
+    """
+    Many threads submit orders at the same time, each waiting until its order is on disk. Compare one fsync per order
+    with group commit, and check that every order made it into the journal.
+    :param threads: Number of submitting threads.
+    :param orders_per_thread: Orders each thread submits.
+    """
+    order_data = {"pizzas": [{"ingredients": [["Crust", "Thin", 10.99], ["Sauce", "Marinara", 1.5],
+                                              ["Cheese", "Mozzarella", 2.0], ["Topping", "Pepperoni", 2.0]],
+                              "subtotal": 16.49}],
+                  "tax_amount": 1.15, "tip_amount": 3.53, "final_total": 21.17}
+
+    print(f"\n{'Order Commit Benchmark (every order synced to disk)':^84}")
+    print("=" * 84)
+    print(f"{'Commit':<18}{'Threads':>9}{'Orders/sec':>14}{'fsyncs':>10}{'Orders/fsync':>14}"
+          f"{'p99 wait (ms)':>15}{'Saved':>10}")
+    print("-" * 84)
+    for thread_count in sorted({1, threads}):
+        for name, commit in (("fsync per order", commit_with_own_fsync), ("group commit", commit_order)):
+            with tempfile.TemporaryDirectory() as temp_dir:
+                journal = open_journal(os.path.join(temp_dir, "journal"))
+                latencies = []
+
+                def submit():
+                    waits = []
+                    for unused_value in range(orders_per_thread):
+                        start = time.perf_counter()
+                        commit(journal, order_data)
+                        waits.append(time.perf_counter() - start)
+                    latencies.extend(waits)
+
+                workers = [threading.Thread(target=submit) for unused_value in range(thread_count)]
+                start_time = time.perf_counter()
+                for thread in workers:
+                    thread.start()
+                for thread in workers:
+                    thread.join()
+                seconds = time.perf_counter() - start_time
+                fsyncs = journal["fsyncs"]
+                close_journal(journal)
+
+                # Reopen the journal like a restart would, and count what is there
+                journal = open_journal(os.path.join(temp_dir, "journal"))
+                saved = count_orders(journal)
+                close_journal(journal)
+
+            orders = thread_count * orders_per_thread
+            latencies.sort()
+            print(f"{name:<18}{thread_count:>9}{orders / seconds:>14,.0f}{fsyncs:>10,}{orders / fsyncs:>14.1f}"
+                  f"{latencies[int(len(latencies) * 0.99)] * 1000:>15.2f}{str(saved == orders):>10}")
+    print("=" * 84)
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "commit":
+        parser = argparse.ArgumentParser(description="Compare one fsync per order with group commit.")
+        parser.add_argument("command", choices=["commit"])
+        parser.add_argument("--threads", type=int, default=32, help="threads submitting orders at the same time")
+        parser.add_argument("--orders", type=int, default=100, help="orders each thread submits")
+        args = parser.parse_args()
+        run_commit_benchmark(args.threads, args.orders)
+    else:
+        # Optional argument: the number of orders to benchmark, ex: python order_journal.py 10000
+        run_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,502 @@
+"""
+Author: Lavell McGrone
+Date: 2026-10-18
+Description: Serve the pizza ordering menu to many customers at the same time. The Add/View Current/View Previous/
+             Submit menu from Final_project.main() is rebuilt as a small state machine per customer session, so nothing
+             waits on input(). An asyncio TCP server speaks a simple line protocol: the server sends text ending with a
+             "> " prompt line, and the customer answers with one line (a menu number, a name, or yes/no). All sessions
+             share one in-memory catalog, one order store (recent orders in memory, the rest in the journal) and, if
+             the shop keeps an inventory file, one inventory: sold out ingredients are not offered, pizzas reserve
+             their ingredients, and the reservations are committed when the order is submitted or released when the
+             customer hangs up. Deals from the promotions file are taken off every submitted order. An order is
+             confirmed once it is on disk, and orders submitted at the same moment share one fsync (group commit).
+
+Usage:       python order_server.py serve [--port 8765]          (try it with: telnet 127.0.0.1 8765)
+             python order_server.py load [--clients 200] [--orders 5]
+             The load command starts a server in a temporary folder (its own journal, and copies of the inventory
+             and promotions files) and runs simulated customers against it, then reports orders/sec and p50/p99
+             submit latency. The shop's own files are never touched.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import random
+import shutil
+import tempfile
+import time
+
+import inventory
+import order_store
+import promotions
+from batch_pricing import DEFAULT_CATALOG, load_catalog_file
+from Final_project import (ORDER_JOURNAL_DIR, TIP_CHOICES, build_order_data, calculate_order_tax, display_menu,
+                           display_order_summary, display_saved_order)
+
+PROMPT = "\n> "  # Every reply from the server ends with this, so clients know when to answer
+MAX_LINE = 1024  # Longest answer a customer may send, in bytes; a longer line ends the session
+MENU_CHOICES = ["Add a Pizza", "View Current Order", "View Previous Order", "View Order by Number", "Submit Order"]
+
+
+def captured(function, *args):
+    """
+    Run one of the Final_project display functions and return what it printed instead of printing it.
+    The event loop runs one session step at a time, so redirecting stdout here never mixes two customers.
+    :param function: The display function to call.
+    :param args: Arguments for the display function.
+    :return: The printed text.
+    """
+    buffer = io.StringIO()
+    with contextlib.redirect_stdout(buffer):
+        function(*args)
+    return buffer.getvalue()
+
+
+def numbered_menu(choices, prompt):
+    """
+    :param choices: List of choices.
+    :param prompt: Text shown above the choices.
+    :return: The menu text, numbered the same way pyip.inputMenu(numbered=True) does it.
+    """
+    return prompt + "\n".join(f"{number}. {choice}" for number, choice in enumerate(choices, start=1))
+
+
+def pick(choices, answer):
+    """
+    Match an answer against a menu, by number or by name.
+    :param choices: List of choices.
+    :param answer: What the customer typed.
+    :return: The chosen item, or None if the answer does not match.
+    """
+    answer = answer.strip()
+    # isdecimal(), not isdigit(): "²" is a digit too, but int() can't read it
+    if answer.isdecimal() and 1 <= int(answer) <= len(choices):
+        return choices[int(answer) - 1]
+    for choice in choices:
+        if choice.lower() == answer.lower():
+            return choice
+    return None
+
+
+def new_session(catalog, store):
+    """
+    Create the state for one customer.
+    :param catalog: Shared catalog dictionary with "base_options", "toppings", "inventory" (None if not counted) and
+                    "promotions" (None without a promotions file).
+    :param store: Shared order store from order_store.open_store().
+    :return: The session dictionary.
+    """
+    return {
+        "catalog": catalog,
+        "menu": catalog,  # What the pizza being built can choose from (only what was in stock when it was started)
+        "reservations": [],  # Inventory reservations, one per pizza in the order
+        "store": store,
+        "state": "menu",  # menu, base, topping, order_number, tip or done
+        "pizzas": [],  # Pizzas in the current order, as (ingredients, pizza_cost)
+        "ingredients": [],  # The pizza that is being built
+        "pizza_cost": 0,
+        "step": 0,  # Which base option or topping is being asked about
+        "promotions": [],  # Promotions taken off the order when it is submitted
+        "unsynced_order": None,  # Number of the submitted order until it is on disk
+        "tax_amount": 0,
+        "total_with_tax": 0,
+    }
+
+
+def start_session(session):
+    """
+    :param session: The session dictionary.
+    :return: The welcome text: the restaurant menu followed by the main menu.
+    """
+    catalog = session["catalog"]
+    base_options, toppings = catalog["base_options"], catalog["toppings"]
+    if catalog.get("inventory"):
+        base_options, toppings = inventory.in_stock_catalog(catalog["inventory"], base_options, toppings)
+    return captured(display_menu, base_options, toppings) + main_menu_text()
+
+
+def main_menu_text():
+    """
+    :return: The main menu question.
+    """
+    return numbered_menu(MENU_CHOICES, "\nChoose an option:\n")
+
+
+def base_option_text(session):
+    """
+    :param session: The session dictionary.
+    :return: The question for the base option (crust, sauce, cheese) the session is on.
+    """
+    option = session["menu"]["base_options"][session["step"]]
+    return numbered_menu(list(option["options"].keys()), f"\nChoose a {option['category']}:\n")
+
+
+def topping_text(session):
+    """
+    :param session: The session dictionary.
+    :return: The yes/no question for the topping the session is on.
+    """
+    topping = list(session["menu"]["toppings"].keys())[session["step"]]
+    return f"Do you want {topping}? (yes/no): "
+
+
+def handle_line(session, line):
+    """
+    Move one session forward by one answer from the customer.
+    :param session: The session dictionary.
+    :param line: The line the customer sent.
+    :return: The reply text to send back.
+    """
+    state = session["state"]
+    catalog = session["menu"]
+
+    if state == "menu":
+        choice = pick(MENU_CHOICES, line)
+        if choice is None:
+            return "Please select one of the numbered options." + main_menu_text()
+
+        if choice == "Add a Pizza":
+            stock = session["catalog"].get("inventory")
+            if stock:
+                base_options, toppings = inventory.in_stock_catalog(
+                    stock, session["catalog"]["base_options"], session["catalog"]["toppings"])
+                if not all(option["options"] for option in base_options):
+                    return "\nSorry, we are sold out of pizzas right now." + main_menu_text()
+                session["menu"] = {"base_options": base_options, "toppings": toppings}
+            session["state"], session["step"] = "base", 0
+            session["ingredients"], session["pizza_cost"] = [], 0
+            return f"\nAdding Pizza #{len(session['pizzas']) + 1}..." + base_option_text(session)
+
+        if choice == "View Current Order":
+            reply = "\nYour current order is empty. " if not session["pizzas"] else ""
+            return reply + captured(display_order_summary, session["pizzas"]) + main_menu_text()
+
+        if choice == "View Previous Order":
+            last_order = order_store.count_orders(session["store"])
+            if last_order == 0:
+                return "\nError: No previous order found. Please place an order first." + main_menu_text()
+            return view_order(session, last_order)
+
+        if choice == "View Order by Number":
+            session["state"] = "order_number"
+            return "Enter the order number: "
+
+        # Submit Order
+        if not session["pizzas"]:
+            return "\nYou cannot submit an empty order." + main_menu_text()
+        total_order_cost = sum(pizza_cost for unused_value, pizza_cost in session["pizzas"])
+        if session["catalog"].get("promotions"):
+            savings, session["promotions"] = promotions.apply_promotions(session["pizzas"])
+            total_order_cost = round(total_order_cost - savings, 2)
+        session["tax_amount"], session["total_with_tax"] = calculate_order_tax(total_order_cost)
+        session["state"] = "tip"
+        return numbered_menu(list(TIP_CHOICES.keys()), "\nSelect a tip percentage:\n")
+
+    if state == "base":
+        option = catalog["base_options"][session["step"]]
+        choice = pick(list(option["options"].keys()), line)
+        if choice is None:
+            return "Please select one of the numbered options." + base_option_text(session)
+        session["ingredients"].append((option["category"].capitalize(), choice, option["options"][choice]))
+        session["pizza_cost"] = session["pizza_cost"] + option["options"][choice]
+        session["step"] = session["step"] + 1
+        if session["step"] < len(catalog["base_options"]):
+            return base_option_text(session)
+        session["state"], session["step"] = "topping", 0
+        if not catalog["toppings"]:
+            return finish_pizza(session, "\nNo toppings are available.")
+        return topping_text(session)
+
+    if state == "topping":
+        answer = line.strip().lower()
+        if answer not in ("y", "yes", "n", "no"):
+            return "Please enter yes or no.\n" + topping_text(session)
+        topping_names = list(catalog["toppings"].keys())
+        if answer in ("y", "yes"):
+            topping = topping_names[session["step"]]
+            session["ingredients"].append(("Topping", topping, catalog["toppings"][topping]))
+            session["pizza_cost"] = session["pizza_cost"] + catalog["toppings"][topping]
+        session["step"] = session["step"] + 1
+        if session["step"] < len(topping_names):
+            return topping_text(session)
+        return finish_pizza(session, "")
+
+    if state == "order_number":
+        if not line.strip().isdecimal() or int(line) < 1:
+            return "Please enter a whole number of 1 or more.\nEnter the order number: "
+        return view_order(session, int(line))
+
+    if state == "tip":
+        choice = pick(list(TIP_CHOICES.keys()), line)
+        if choice is None:
+            return "Please select one of the numbered options." + numbered_menu(
+                list(TIP_CHOICES.keys()), "\nSelect a tip percentage:\n")
+        return submit_order(session, round(session["total_with_tax"] * TIP_CHOICES[choice], 2))
+
+    return "Your order has been submitted! Goodbye."
+
+
+def finish_pizza(session, reply):
+    """
+    Add the pizza that was being built to the order and go back to the main menu.
+    :param session: The session dictionary.
+    :param reply: Text to send before the main menu.
+    :return: The reply text.
+    """
+    session["state"] = "menu"
+    stock = session["catalog"].get("inventory")
+    if stock:
+        reservation = inventory.reserve(stock, inventory.pizza_keys(session["ingredients"]))
+        if reservation is None:
+            return (reply + "\nSorry, one of those ingredients just sold out. Please build the pizza again."
+                    + main_menu_text())
+        session["reservations"].append(reservation)
+    session["pizzas"].append((session["ingredients"], session["pizza_cost"]))
+    return reply + main_menu_text()
+
+
+def view_order(session, order_number):
+    """
+    Show a saved order from the shared order store and go back to the main menu.
+    :param session: The session dictionary.
+    :param order_number: Number of the order to show.
+    :return: The reply text.
+    """
+    session["state"] = "menu"
+    order_data = order_store.get_order(session["store"], order_number)
+    if order_data is None:
+        reply = f"\nError: Order #{order_number} was not found."
+    else:
+        reply = captured(display_saved_order, order_data)
+    return reply + main_menu_text()
+
+
+def submit_order(session, tip_amount):
+    """
+    Finish the order the same way the Submit Order branch of main() does and save it to the shared order store.
+    :param session: The session dictionary.
+    :param tip_amount: The tip for this order.
+    :return: The reply text.
+    """
+    tax_amount = session["tax_amount"]
+    final_total = round(session["total_with_tax"] + tip_amount, 2)
+    reply = ""
+    if tip_amount > 0:
+        reply = f"Thank you so much for the generous tip of ${tip_amount:.2f}!\n"
+    reply = reply + captured(display_order_summary, session["pizzas"], final_total, tip_amount, tax_amount,
+                             session["promotions"])
+
+    order_data = build_order_data(session["pizzas"], final_total, tax_amount, tip_amount,
+                                  applied_promotions=session["promotions"])
+    # Don't wait for the disk here (that would stop every session); serve_customer() waits before replying
+    order_number = order_store.append_order(session["store"], order_data, wait=False)
+    session["unsynced_order"] = order_number
+    stock = session["catalog"].get("inventory")
+    if stock:
+        for reservation in session["reservations"]:
+            inventory.commit(stock, reservation)
+        session["reservations"] = []
+    session["state"] = "done"
+    return reply + f"\nYour order has been placed as order #{order_number}. Thank you!\nYour order has been submitted!"
+
+
+async def serve_customer(reader, writer, catalog, store):
+    """
+    Run one customer's session over a TCP connection.
+    :param reader: asyncio stream reader of the connection.
+    :param writer: asyncio stream writer of the connection.
+    :param catalog: Shared catalog dictionary.
+    :param store: Shared order store.
+    """
+    session = new_session(catalog, store)
+    try:
+        writer.write((start_session(session) + PROMPT).encode("utf-8"))
+        await writer.drain()
+        while session["state"] != "done":
+            try:
+                line = await reader.readline()
+            except ValueError:  # Longer than MAX_LINE (the stream's limit), not an answer to any question
+                writer.write("\nError: That answer is too long. Goodbye.\n".encode("utf-8"))
+                await writer.drain()
+                break
+            if not line:
+                break  # The customer hung up, the unfinished order is dropped
+            reply = handle_line(session, line.decode("utf-8", errors="replace"))
+            if session.get("unsynced_order"):
+                # Confirm the order only once it is on disk. The wait runs in a thread, so orders submitted
+                # by other sessions meanwhile are synced together with this one (group commit).
+                await asyncio.get_running_loop().run_in_executor(
+                    None, order_store.wait_durable, store, session.pop("unsynced_order"))
+            ending = "\n" if session["state"] == "done" else PROMPT
+            writer.write((reply + ending).encode("utf-8"))
+            await writer.drain()
+    except ConnectionError:
+        pass
+    finally:
+        # Anything still reserved belongs to an order that was never submitted, so put it back on the shelf
+        stock = catalog.get("inventory")
+        if stock:
+            for reservation in session["reservations"]:
+                inventory.release(stock, reservation)
+        writer.close()
+        with contextlib.suppress(ConnectionError):
+            await writer.wait_closed()
+
+
+async def start_server(catalog, store, host="127.0.0.1", port=8765):
+    """
+    :param catalog: Shared catalog dictionary.
+    :param store: Shared order store.
+    :param host: Address to listen on.
+    :param port: Port to listen on (0 picks a free one).
+    :return: The running asyncio server.
+    """
+    return await asyncio.start_server(
+        lambda reader, writer: serve_customer(reader, writer, catalog, store), host, port, backlog=1024,
+        limit=MAX_LINE)
+
+
+async def simulated_customer(host, port, orders, catalog, latencies):
+    """
+    One simulated customer: builds random pizzas and submits them, once per order.
+    :param host: Server address.
+    :param port: Server port.
+    :param orders: How many orders this customer places (one connection per order).
+    :param catalog: The catalog, used to pick random answers.
+    :param latencies: List that receives the submit latency of every order in seconds.
+    """
+    prompt = PROMPT.encode("utf-8")
+
+    for unused_value in range(orders):
+        reader, writer = await asyncio.open_connection(host, port)
+
+        async def ask(answer):
+            writer.write((answer + "\n").encode("utf-8"))
+            await writer.drain()
+            return await reader.readuntil(prompt)
+
+        await reader.readuntil(prompt)  # Welcome menu
+        for unused_pizza in range(random.randint(1, 3)):
+            await ask("1")  # Add a Pizza
+            for option in catalog["base_options"]:
+                await ask(str(random.randint(1, len(option["options"]))))
+            for unused_topping in catalog["toppings"]:
+                await ask(random.choice(("yes", "no")))
+        await ask("5")  # Submit Order
+
+        start_time = time.perf_counter()
+        writer.write((str(random.randint(1, len(TIP_CHOICES))) + "\n").encode("utf-8"))
+        await writer.drain()
+        await reader.read()  # The server closes the connection after the order is submitted
+        latencies.append(time.perf_counter() - start_time)
+        writer.close()
+        await writer.wait_closed()
+
+
+def load_test_catalog(base_options, toppings, temp_dir):
+    """
+    Build the catalog for the load test from copies of the shop's inventory and promotions files, so the simulated
+    orders use up the copies' stock instead of the real one.
+    :param base_options: List of base options with categories and prices.
+    :param toppings: Dictionary of toppings and their prices.
+    :param temp_dir: Temporary folder for the copies.
+    :return: The catalog dictionary.
+    """
+    paths = {}
+    for name in (inventory.INVENTORY_FILE, promotions.PROMOTIONS_FILE):
+        paths[name] = os.path.join(temp_dir, os.path.basename(name))
+        if os.path.exists(name):
+            shutil.copyfile(name, paths[name])
+    catalog = {"base_options": base_options, "toppings": toppings,
+               "inventory": inventory.load_inventory(paths[inventory.INVENTORY_FILE]),
+               "promotions": promotions.load_promotions(paths[promotions.PROMOTIONS_FILE])}
+    if catalog["promotions"]:
+        promotions.use_promotions(catalog["promotions"], base_options, toppings)
+    return catalog
+
+
+async def run_load_test(clients, orders, base_options, toppings):
+    """
+    Start a server in a temporary folder and run many simulated customers against it at the same time.
+    :param clients: Number of customers connected at the same time.
+    :param orders: Orders each customer places.
+    :param base_options: List of base options with categories and prices.
+    :param toppings: Dictionary of toppings and their prices.
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        catalog = load_test_catalog(base_options, toppings, temp_dir)
+        store = order_store.open_store(os.path.join(temp_dir, "journal"))
+        server = await start_server(catalog, store, port=0)
+        port = server.sockets[0].getsockname()[1]
+
+        latencies = []
+        start_time = time.perf_counter()
+        await asyncio.gather(*(simulated_customer("127.0.0.1", port, orders, catalog, latencies)
+                               for unused_value in range(clients)))
+        seconds = time.perf_counter() - start_time
+
+        server.close()
+        await server.wait_closed()
+        saved = order_store.count_orders(store)
+        order_store.close_store(store)
+
+    latencies.sort()
+    print(f"\n{'Order Server Load Test':^60}")
+    print("=" * 60)
+    print(f"{'Simulated customers':<40}{clients:>20,}")
+    print(f"{'Orders submitted':<40}{len(latencies):>20,}")
+    print(f"{'Orders saved to the journal':<40}{saved:>20,}")
+    print(f"{'Orders/sec':<40}{len(latencies) / seconds:>20,.1f}")
+    print(f"{'p50 submit latency (ms)':<40}{latencies[len(latencies) // 2] * 1000:>20.2f}")
+    print(f"{'p99 submit latency (ms)':<40}{latencies[int(len(latencies) * 0.99)] * 1000:>20.2f}")
+    print("=" * 60)
+
+
+async def serve_forever(catalog, port):
+    """
+    Run the ordering server until it is stopped with Ctrl+C.
+    :param catalog: Shared catalog dictionary.
+    :param port: Port to listen on.
+    """
+    store = order_store.open_store(ORDER_JOURNAL_DIR)
+    server = await start_server(catalog, store, port=port)
+    print(f"Pizza ordering server is listening on port {port}. Press Ctrl+C to stop.")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        order_store.close_store(store)
+        if catalog.get("inventory"):
+            inventory.save_inventory(catalog["inventory"], inventory.INVENTORY_FILE)  # Keep the new stock counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the pizza ordering menu to many customers at once.")
+    parser.add_argument("command", choices=["serve", "load"], help="run the server, or run a load test against one")
+    parser.add_argument("--catalog", default=DEFAULT_CATALOG, help="path or URL of ingredients.json")
+    parser.add_argument("--port", type=int, default=8765, help="port for the serve command")
+    parser.add_argument("--clients", type=int, default=200, help="simulated customers for the load command")
+    parser.add_argument("--orders", type=int, default=5, help="orders per simulated customer")
+    args = parser.parse_args()
+
+    base_options, toppings = load_catalog_file(args.catalog)
+
+    try:
+        if args.command == "serve":
+            # Loaded once and shared by every session
+            catalog = {"base_options": base_options, "toppings": toppings,
+                       "inventory": inventory.load_inventory(inventory.INVENTORY_FILE),
+                       "promotions": promotions.load_promotions(promotions.PROMOTIONS_FILE)}
+            if catalog["promotions"]:
+                promotions.use_promotions(catalog["promotions"], base_options, toppings)  # Compiled once for all
+            asyncio.run(serve_forever(catalog, args.port))
+        else:
+            asyncio.run(run_load_test(args.clients, args.orders, base_options, toppings))
+    except KeyboardInterrupt:
+        print("\nServer stopped.")
+
+
+if __name__ == "__main__":
+    main()
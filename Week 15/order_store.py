@@ -0,0 +1,355 @@
+"""
+Author: Lavell McGrone
+Date: 2026-10-18
+Description: Order history in two tiers. The most recent orders (HOT_ORDERS of them) are kept decoded in memory in a
+             ring buffer, and everything older stays on disk in the order journal (the cold tier). Looking up a recent
+             order by its number is a dictionary lookup and never touches the disk; older orders are read from the
+             journal through its index, one order at a time.
+             Orders can also be found by time range (their "placed_at" time) and by customer name. Orders are appended
+             in time order, so a time range is found with a binary search over the order numbers instead of reading
+             the whole history. The customer index is built from the journal the first time it is needed and kept up
+             to date after that.
+             New orders are committed to the journal (the write-ahead log) and are on disk before append_order()
+             returns. The customer index is saved in a snapshot file (written to a temporary file and renamed, so it
+             is never half written) when the store is closed and every SNAPSHOT_EVERY orders. On startup the snapshot
+             is loaded and the orders the journal has after it are replayed, instead of reading the whole history.
+
+Usage:       python order_store.py [--orders 200000] [--hot 1000]   (lookup latency benchmark)
+"""
+
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+from collections import deque
+from datetime import datetime, timedelta
+
+import order_journal
+from catalog_cache import write_file_atomically
+
+HOT_ORDERS = 1000  # Most recent orders kept decoded in memory
+SNAPSHOT_FILE = "snapshot.json"  # Saved customer index, in the journal folder
+SNAPSHOT_EVERY = 10_000  # Orders between snapshots while the store is open
+
+
+def open_store(journal_dir=order_journal.DEFAULT_JOURNAL_DIR, hot_size=HOT_ORDERS, read_only=False):
+    """
+    Open the order journal and load the most recent orders into the hot tier.
+    :param journal_dir: Folder that holds the order journal.
+    :param hot_size: How many recent orders to keep in memory.
+    :param read_only: Open the journal without appending (ex: for reports).
+    :return: The store dictionary, passed to the other functions.
+    """
+    store = {
+        "journal": order_journal.open_journal(journal_dir, read_only=read_only),
+        "hot": deque(maxlen=hot_size),  # Ring buffer of order numbers, oldest first
+        "hot_orders": {},  # Order number -> decoded order, for every number in the ring buffer
+        "customers": None,  # Customer name (lower case) -> list of order numbers, built on first use
+        "hot_hits": 0,
+        "cold_reads": 0,  # Orders read from disk
+        "read_only": read_only,
+        "snapshot_at": 0,  # Number of orders the last snapshot covered
+    }
+    first_hot = order_journal.count_orders(store["journal"]) - hot_size + 1
+    for order_number, order_data in order_journal.iter_orders(store["journal"], first_hot):
+        remember(store, order_number, order_data)
+    recover_snapshot(store)
+    return store
+
+
+def snapshot_path(store):
+    """
+    :param store: The store dictionary.
+    :return: Path of the store's snapshot file.
+    """
+    return os.path.join(store["journal"]["dir"], SNAPSHOT_FILE)
+
+
+def recover_snapshot(store):
+    """
+    Load the customer index from the snapshot and replay the orders that were committed after it was taken.
+    A missing, broken or newer-than-the-journal snapshot is ignored; the index is then built on first use.
+    :param store: The store dictionary.
+    """
+    try:
+        with open(snapshot_path(store), "r") as file:
+            snapshot = json.load(file)
+        snapshot_count = snapshot["order_count"]
+        customers = snapshot["customers"]
+    except (OSError, ValueError, KeyError, TypeError):
+        return
+    if not isinstance(customers, dict) or not 0 <= snapshot_count <= count_orders(store):
+        return
+    for order_number, order_data in order_journal.iter_orders(store["journal"], snapshot_count + 1):
+        if order_data.get("customer"):
+            customers.setdefault(order_data["customer"].lower(), []).append(order_number)
+    store["customers"] = customers
+    store["snapshot_at"] = snapshot_count
+
+
+def save_snapshot(store):
+    """
+    Save the customer index and the number of orders it covers. The file is replaced in one rename, so a crash
+    leaves either the old snapshot or the new one.
+    :param store: The store dictionary.
+    """
+    order_count = count_orders(store)
+    snapshot = {"order_count": order_count, "customers": customer_index(store)}
+    write_file_atomically(snapshot_path(store), json.dumps(snapshot, separators=(",", ":")).encode("utf-8"))
+    store["snapshot_at"] = order_count
+
+
+def remember(store, order_number, order_data):
+    """
+    Put an order into the hot tier. When the ring buffer is full, the oldest order drops back to the cold tier only.
+    :param store: The store dictionary.
+    :param order_number: Number of the order.
+    :param order_data: The decoded order.
+    """
+    hot = store["hot"]
+    if hot.maxlen == 0:
+        return
+    if len(hot) == hot.maxlen:
+        del store["hot_orders"][hot[0]]  # The deque pushes this one out on append
+    hot.append(order_number)
+    store["hot_orders"][order_number] = order_data
+
+
+def append_order(store, order_data, wait=True):
+    """
+    Save a new order to the journal and keep it in the hot tier.
+    :param store: The store dictionary.
+    :param order_data: The order dictionary.
+    :param wait: Wait until the order is on disk. Callers that pass False must call wait_durable() before they tell
+                 the customer the order was placed.
+    :return: The order number given to this order.
+    """
+    order_number = order_journal.append_order(store["journal"], order_data)
+    if wait:
+        wait_durable(store, order_number)
+    remember(store, order_number, order_data)
+    if store["customers"] is not None and order_data.get("customer"):
+        store["customers"].setdefault(order_data["customer"].lower(), []).append(order_number)
+    if order_number - store["snapshot_at"] >= SNAPSHOT_EVERY:
+        save_snapshot(store)
+    return order_number
+
+
+def wait_durable(store, order_number):
+    """
+    Wait until an order is on disk. Orders placed at the same time by other threads share the same fsync.
+    :param store: The store dictionary.
+    :param order_number: Number of the order.
+    """
+    order_journal.wait_durable(store["journal"], order_number)
+
+
+def count_orders(store):
+    """
+    :param store: The store dictionary.
+    :return: The number of orders in the history.
+    """
+    return order_journal.count_orders(store["journal"])
+
+
+def get_order(store, order_number):
+    """
+    :param store: The store dictionary.
+    :param order_number: Number of the order, starting at 1.
+    :return: The order dictionary, or None if there is no order with that number.
+    """
+    order_data = store["hot_orders"].get(order_number)
+    if order_data is not None:
+        store["hot_hits"] = store["hot_hits"] + 1
+        return order_data
+    order_data = order_journal.read_order(store["journal"], order_number)
+    if order_data is not None:
+        store["cold_reads"] = store["cold_reads"] + 1
+    return order_data
+
+
+def get_last_order(store):
+    """
+    :param store: The store dictionary.
+    :return: The most recent order, or None if there are no orders yet.
+    """
+    return get_order(store, count_orders(store))
+
+
+def placed_at(store, order_number):
+    """
+    :param store: The store dictionary.
+    :param order_number: Number of the order.
+    :return: The order's "placed_at" time (ex: "2026-10-18T13:45:00"), or "" for orders saved without one.
+    """
+    return get_order(store, order_number).get("placed_at") or ""
+
+
+def orders_between(store, start_time, end_time):
+    """
+    Find every order placed between two times (both included), oldest first.
+    :param store: The store dictionary.
+    :param start_time: Earliest time, as an ISO string like "2026-10-18T12:00:00" or a datetime.
+    :param end_time: Latest time, in the same form.
+    :return: A list of (order number, order dictionary) tuples.
+    """
+    if isinstance(start_time, datetime):
+        start_time = start_time.isoformat(timespec="seconds")
+    if isinstance(end_time, datetime):
+        end_time = end_time.isoformat(timespec="seconds")
+
+    # ISO times sort the same as text, and orders are appended in time order, so binary search the order numbers
+    # for the first order at or after start_time. Searches that start inside the hot tier never touch the disk.
+    low = store["hot"][0] if store["hot"] and placed_at(store, store["hot"][0]) < start_time else 1
+    high = count_orders(store) + 1
+    while low < high:
+        middle = (low + high) // 2
+        if placed_at(store, middle) < start_time:
+            low = middle + 1
+        else:
+            high = middle
+
+    results = []
+    order_number = low
+    while order_number <= count_orders(store):
+        order_data = get_order(store, order_number)
+        if (order_data.get("placed_at") or "") > end_time:
+            break
+        results.append((order_number, order_data))
+        order_number = order_number + 1
+    return results
+
+
+def customer_orders(store, customer):
+    """
+    :param store: The store dictionary.
+    :param customer: Customer name (upper/lower case doesn't matter).
+    :return: A list of (order number, order dictionary) tuples for the customer, oldest first.
+    """
+    return [(order_number, get_order(store, order_number))
+            for order_number in customer_index(store).get(customer.lower(), [])]
+
+
+def customer_index(store):
+    """
+    :param store: The store dictionary.
+    :return: Dictionary of customer name (lower case) -> list of order numbers.
+    """
+    if store["customers"] is None:
+        # Build the customer index once by reading the history, then keep it current in append_order()
+        customers = {}
+        for order_number, order_data in order_journal.iter_orders(store["journal"]):
+            if order_data.get("customer"):
+                customers.setdefault(order_data["customer"].lower(), []).append(order_number)
+        store["customers"] = customers
+    return store["customers"]
+
+
+def close_store(store):
+    """
+    Save a snapshot (unless the store is read only) and close the journal.
+    :param store: The store dictionary.
+    """
+    if not store["read_only"] and count_orders(store) != store["snapshot_at"]:
+        save_snapshot(store)
+    order_journal.close_journal(store["journal"])
+    store["hot"].clear()
+    store["hot_orders"].clear()
+
+
+def time_lookups(function, arguments):
+    """
+    :param function: Lookup function to time.
+    :param arguments: List of argument tuples, one call each.
+    :return: Average microseconds per call.
+    """
+    start_time = time.perf_counter()
+    for args in arguments:
+        function(*args)
+    return (time.perf_counter() - start_time) / len(arguments) * 1_000_000
+
+
+def run_benchmark(max_orders=200_000, hot_size=HOT_ORDERS):
+    """
+    Fill journals of growing size and time recent, old, time range and customer lookups.
+    :param max_orders: Size of the largest history.
+    :param hot_size: Orders kept in the hot tier.
+    """
+    sample_order = {
+        "pizzas": [{"ingredients": [["Crust", "Thin", 10.99], ["Sauce", "Marinara", 1.5],
+                                    ["Cheese", "Mozzarella", 2.0], ["Topping", "Pepperoni", 2.0]],
+                    "subtotal": 16.49}],
+        "tax_amount": 1.15, "tip_amount": 3.53, "final_total": 21.17,
+    }
+    customers = [f"Customer {number}" for number in range(500)]
+    sizes = sorted({size for size in (10_000, 50_000, max_orders) if size <= max_orders})
+    lookups = 2000
+    generator = random.Random(1150)
+
+    print(f"\n{'Order Store Lookup Latency (microseconds per lookup)':^84}")
+    print("=" * 84)
+    print(f"{'History':>10}{'Recent ID':>12}{'Disk reads':>12}{'Old ID':>12}{'Last hour':>12}"
+          f"{'Customer':>12}{'Open (ms)':>14}")
+    print("-" * 84)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        journal_dir = os.path.join(temp_dir, "journal")
+        journal = order_journal.open_journal(journal_dir)
+        first_time = datetime(2026, 10, 18, 11, 0, 0)
+        written = 0
+        for size in sizes:
+            while written < size:
+                order_data = dict(sample_order)
+                order_data["placed_at"] = (first_time + timedelta(seconds=written * 10)).isoformat(timespec="seconds")
+                order_data["customer"] = generator.choice(customers)
+                order_journal.append_order(journal, order_data)
+                written = written + 1
+
+            start_time = time.perf_counter()
+            store = open_store(journal_dir, hot_size, read_only=True)
+            open_ms = (time.perf_counter() - start_time) * 1000
+
+            recent = [(store, generator.randint(size - hot_size + 1, size)) for unused_value in range(lookups)]
+            recent_us = time_lookups(get_order, recent)
+            recent_disk_reads = store["cold_reads"]
+            old = [(store, generator.randint(1, size - hot_size)) for unused_value in range(lookups)]
+            old_us = time_lookups(get_order, old)
+            last_time = first_time + timedelta(seconds=(size - 1) * 10)
+            last_hour = [(store, last_time - timedelta(hours=1), last_time)] * 20
+            range_us = time_lookups(orders_between, last_hour)
+            start_time = time.perf_counter()
+            customer_orders(store, customers[0])  # Builds the customer index once
+            first_customer_ms = open_ms + (time.perf_counter() - start_time) * 1000
+            by_customer = [(store, generator.choice(customers)) for unused_value in range(20)]
+            customer_us = time_lookups(customer_orders, by_customer)
+            if size == sizes[-1]:
+                save_snapshot(store)  # Read only stores don't save one on close
+            close_store(store)
+
+            print(f"{size:>10,}{recent_us:>12.2f}{recent_disk_reads:>12,}{old_us:>12.2f}{range_us:>12.1f}"
+                  f"{customer_us:>12.1f}{open_ms:>14.1f}")
+
+        # Restart with the snapshot: only the orders after it would be replayed
+        start_time = time.perf_counter()
+        store = open_store(journal_dir, hot_size, read_only=True)
+        customer_orders(store, customers[0])
+        snapshot_ms = (time.perf_counter() - start_time) * 1000
+        close_store(store)
+        order_journal.close_journal(journal)
+    print("=" * 84)
+    print(f"{hot_size:,} orders in the hot tier. Recent ID lookups never read the disk.")
+    print(f"Open + first customer lookup at {sizes[-1]:,} orders: {first_customer_ms:,.1f} ms without a snapshot, "
+          f"{snapshot_ms:,.1f} ms with one.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the tiered order store.")
+    parser.add_argument("--orders", type=int, default=200_000, help="size of the largest history")
+    parser.add_argument("--hot", type=int, default=HOT_ORDERS, help="orders kept in memory")
+    args = parser.parse_args()
+    run_benchmark(args.orders, args.hot)
+
+
+if __name__ == "__main__":
+    main()
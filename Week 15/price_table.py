@@ -0,0 +1,215 @@
+"""
+Author: Lavell McGrone
+Date: 2026-10-18
+Description: Compile the ingredients.json catalog into a price table made of integer cents. Every crust, sauce and
+             cheese option gets a small number (its position in the menu) and every topping gets one bit, so a whole
+             pizza is just (crust id, sauce id, cheese id, topping bitmask). Pricing a pizza then takes a few array
+             lookups: one per base option, plus one per 8 toppings from precomputed subset sums. Tax and tip are worked
+             out in whole cents as well, so there is no floating point drift and no repeated round(..., 2) calls.
+             Run this file directly to compare it with the dictionary/float path used by Final_project.py.
+"""
+
+import json
+import os
+import random
+import sys
+import time
+from array import array
+
+CHUNK_BITS = 8  # Toppings are priced 8 at a time, from a table of the 256 possible subsets of those 8
+TAX_RATE_BASIS_POINTS = 700  # 7% sales tax, in hundredths of a percent
+TIP_CHOICES_BASIS_POINTS = {"0%": 0, "10%": 1000, "20%": 2000, "30%": 3000, "40%": 4000}
+
+
+def to_cents(price):
+    """
+    :param price: A dollar price like 10.99.
+    :return: The price in whole cents, like 1099.
+    """
+    return int(round(price * 100))
+
+
+def compile_price_table(base_options, toppings):
+    """
+    Build the price table from the catalog.
+    :param base_options: List of base options with categories and prices.
+    :param toppings: Dictionary of toppings and their prices.
+    :return: A dictionary holding the compiled price table.
+    """
+    categories = []  # Category names, ex: ["crust", "sauce", "cheese"]
+    option_names = []  # option_names[category id][option id] -> option name
+    option_cents = []  # option_cents[category id][option id] -> price in cents
+    option_ids = []  # option_ids[category id][option name] -> option id
+    for option in base_options:
+        names = list(option["options"].keys())
+        categories.append(option["category"])
+        option_names.append(names)
+        option_cents.append(array("q", (to_cents(option["options"][name]) for name in names)))
+        option_ids.append({name: option_id for option_id, name in enumerate(names)})
+
+    topping_names = list(toppings.keys())
+    topping_cents = array("q", (to_cents(toppings[name]) for name in topping_names))
+
+    # For every group of 8 toppings, precompute the price of all 256 ways to pick from that group.
+    # A subset's price is the price of the subset without its lowest bit plus the price of that lowest topping.
+    subset_cents = []
+    for first_bit in range(0, len(topping_names), CHUNK_BITS):
+        group = topping_cents[first_bit:first_bit + CHUNK_BITS]
+        sums = array("q", [0]) * (1 << len(group))
+        for subset in range(1, len(sums)):
+            lowest_bit = (subset & -subset).bit_length() - 1
+            sums[subset] = sums[subset & (subset - 1)] + group[lowest_bit]
+        subset_cents.append(sums)
+
+    return {
+        "categories": categories,
+        "option_names": option_names,
+        "option_cents": option_cents,
+        "option_ids": option_ids,
+        "topping_names": topping_names,
+        "topping_cents": topping_cents,
+        "topping_bits": {name: 1 << bit for bit, name in enumerate(topping_names)},
+        "subset_cents": subset_cents,
+    }
+
+
+def encode_pizza(table, choices, topping_names):
+    """
+    Turn menu names into the compact pizza form.
+    :param table: The compiled price table.
+    :param choices: Dictionary of category -> option name, ex: {"crust": "Thin", "sauce": "Marinara", ...}.
+    :param topping_names: Iterable of topping names.
+    :return: A tuple of (option ids tuple, topping bitmask).
+    :raises KeyError: If a choice or topping is not in the catalog.
+    """
+    ids = tuple(table["option_ids"][position][choices[category]]
+                for position, category in enumerate(table["categories"]))
+    mask = 0
+    for name in topping_names:
+        mask = mask | table["topping_bits"][name]
+    return ids, mask
+
+
+def toppings_cents(table, mask):
+    """
+    :param table: The compiled price table.
+    :param mask: Topping bitmask.
+    :return: Price of all toppings in the mask, in cents.
+    """
+    total = 0
+    for sums in table["subset_cents"]:
+        total = total + sums[mask & 0xFF]
+        mask = mask >> CHUNK_BITS
+    return total
+
+
+def price_cents(table, ids, mask):
+    """
+    Price one pizza.
+    :param table: The compiled price table.
+    :param ids: Tuple of option ids, one per category.
+    :param mask: Topping bitmask.
+    :return: Price of the pizza in cents.
+    """
+    total = toppings_cents(table, mask)
+    for category_cents, option_id in zip(table["option_cents"], ids):
+        total = total + category_cents[option_id]
+    return total
+
+
+def percent_of_cents(cents, basis_points):
+    """
+    Take a percentage of an amount in cents, rounding half a cent up like a cash register.
+    :param cents: Amount in cents.
+    :param basis_points: Percentage in hundredths of a percent (700 = 7%).
+    :return: The percentage of the amount, in whole cents.
+    """
+    return (cents * basis_points + 5000) // 10000
+
+
+def order_totals_cents(subtotal_cents, tip_basis_points=0, tax_basis_points=TAX_RATE_BASIS_POINTS):
+    """
+    Work out tax, tip and final total for an order, all in cents (same steps as the Submit Order branch of main()).
+    :param subtotal_cents: Sum of the pizza prices in cents.
+    :param tip_basis_points: Tip percentage in hundredths of a percent, taken from the total with tax.
+    :param tax_basis_points: Tax rate in hundredths of a percent.
+    :return: A tuple of (tax cents, total with tax cents, tip cents, final total cents).
+    """
+    tax = percent_of_cents(subtotal_cents, tax_basis_points)
+    total_with_tax = subtotal_cents + tax
+    tip = percent_of_cents(total_with_tax, tip_basis_points)
+    return tax, total_with_tax, tip, total_with_tax + tip
+
+
+def decode_ingredients(table, ids, mask):
+    """
+    Rebuild the ingredient list Final_project.py shows, from the compact pizza form.
+    :param table: The compiled price table.
+    :param ids: Tuple of option ids, one per category.
+    :param mask: Topping bitmask.
+    :return: A list of (category, name, price) tuples, prices in dollars.
+    """
+    ingredients = []
+    for position, option_id in enumerate(ids):
+        ingredients.append((table["categories"][position].capitalize(), table["option_names"][position][option_id],
+                            table["option_cents"][position][option_id] / 100))
+    for bit, name in enumerate(table["topping_names"]):
+        if mask >> bit & 1:
+            ingredients.append(("Topping", name, table["topping_cents"][bit] / 100))
+    return ingredients
+
+
+def run_benchmark(num_pizzas=1_000_000):
+    """
+    Price the same random pizzas with the dictionary/float path and with the compiled cents path, then
+    display the timings and how many totals came out different by a cent.
+    :param num_pizzas: How many pizzas to price.
+    """
+    import Final_project  # For calculate_total_with_tax(), the current float path
+    from batch_pricing import build_price_lookup, price_selection
+
+    with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), "ingredients.json"), "r") as file:
+        catalog = json.load(file)
+    base_options, toppings = catalog["base_options"], catalog["toppings"]
+
+    random.seed(1150)
+    selections = []
+    for unused_value in range(num_pizzas):
+        selection = {option["category"]: random.choice(list(option["options"])) for option in base_options}
+        selection["toppings"] = random.sample(list(toppings), random.randint(0, len(toppings)))
+        selections.append(selection)
+
+    # Current path: nested dictionaries, float sums, round(..., 2) for tax
+    lookup = build_price_lookup(base_options, toppings)
+    start_time = time.perf_counter()
+    float_totals = []
+    for selection in selections:
+        unused_ingredients, pizza_cost = price_selection(selection, lookup)
+        unused_tax, total_with_tax = Final_project.calculate_total_with_tax(pizza_cost)
+        float_totals.append(total_with_tax)
+    float_seconds = time.perf_counter() - start_time
+
+    # Compiled path: encode once (like an order arriving), then integer lookups only
+    table = compile_price_table(base_options, toppings)
+    encoded = [encode_pizza(table, selection, selection["toppings"]) for selection in selections]
+    start_time = time.perf_counter()
+    cents_totals = []
+    for ids, mask in encoded:
+        cents_totals.append(order_totals_cents(price_cents(table, ids, mask))[1])
+    cents_seconds = time.perf_counter() - start_time
+
+    differences = sum(1 for float_total, cents in zip(float_totals, cents_totals) if to_cents(float_total) != cents)
+
+    print(f"\n{'Pizza Pricing Benchmark':^60}")
+    print("=" * 60)
+    print(f"{'Pizzas priced (with tax)':<40}{num_pizzas:>20,}")
+    print(f"{'Dictionary/float path (pizzas/sec)':<40}{num_pizzas / float_seconds:>20,.0f}")
+    print(f"{'Compiled cents path (pizzas/sec)':<40}{num_pizzas / cents_seconds:>20,.0f}")
+    print(f"{'Speed up':<40}{float_seconds / cents_seconds:>19.1f}x")
+    print(f"{'Totals that differ by a cent':<40}{differences:>20,}")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    # Optional argument: the number of pizzas to benchmark, ex: python price_table.py 100000
+    run_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
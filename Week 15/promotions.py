@@ -0,0 +1,589 @@
+"""
+Author: Lavell McGrone
+Date: 2026-10-18
+Description: Promotions and combo deals, declared in promotions.json instead of being written into the pricing code.
+             No promotions run until the shop has a promotions.json; promotions.example.json is a sample to copy.
+             A promotion either takes money off one pizza ("3rd topping free", "Deep dish + Alfredo combo",
+             "10% off veggie pizzas") or sells a bundle of pizzas for a fixed price ("2 hand-tossed for $20").
+             Every promotion says which pizzas it applies to: allowed crust/sauce/cheese options, toppings the pizza
+             must have or must not have, a minimum number of toppings, and the days of the week it runs on.
+             The rules are compiled against the price table (price_table.py), so a pizza is (option ids, topping
+             bitmask) and the rules are bits of one big integer. For every option there is a precomputed set of rules
+             that allow it, and for every 8 toppings there are precomputed sets of rules that a present or missing
+             topping rules out (the same subset trick the price table uses for prices). Finding every rule a pizza
+             matches is then a handful of AND operations, no matter if there are 3 rules or 300.
+             Promotions don't stack on one pizza: every pizza gets at most one per-pizza promotion or belongs to at
+             most one bundle, and the combination that saves the most is picked. Pizzas and whole orders are
+             remembered by their configuration (functools.lru_cache), like menu_memo.py does for prices.
+
+Usage:       python promotions.py [--orders 1000000] [--rules 300]   (benchmark)
+             Rules file: {"promotions": [{"name": "2 hand-tossed for $20", "type": "bundle", "count": 2,
+             "price": 20.00, "match": {"crust": ["Thin", "Traditional"]}}, ...]}
+             Types: "bundle" (count, price), "free_topping" (the cheapest topping is free), "amount_off" (amount),
+             "percent_off" (percent). Match keys: a category name with a list of options, "toppings",
+             "without_toppings", "min_toppings" and "days" (ex: ["Tuesday"], every day without it).
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import random
+import time
+from array import array
+from functools import lru_cache
+from itertools import combinations
+
+from price_table import CHUNK_BITS, compile_price_table, encode_pizza, percent_of_cents, price_cents, to_cents
+
+PROMOTIONS_FILE = "promotions.json"
+EXAMPLE_FILE = "promotions.example.json"  # Sample rules, used by the benchmark
+DAYS = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+PROMOTION_TYPES = ("bundle", "free_topping", "amount_off", "percent_off")
+EXACT_PIZZAS = 10  # Larger orders are split into groups of this many pizzas before searching for the best deals
+MAX_PIZZAS = 4096  # Pizza configurations remembered
+MAX_ORDERS = 65536  # Order configurations remembered
+
+# The compiled promotions the caches belong to, the day they were compiled for and what they were compiled from
+active = {"fingerprint": None, "engine": None, "day": None, "source": None}
+
+
+def load_promotions(path=PROMOTIONS_FILE):
+    """
+    :param path: Path of the rules file.
+    :return: The list of promotion rules, or None if there is no rules file (no promotions are running).
+    :raises ValueError: If the file is not valid JSON or a rule is broken.
+    """
+    try:
+        with open(path, "r") as file:
+            rules = json.load(file).get("promotions", [])
+    except FileNotFoundError:
+        return None
+    except (json.JSONDecodeError, AttributeError) as e:
+        raise ValueError(f"'{path}' is not a valid promotions file ({e})")
+    for number, rule in enumerate(rules, start=1):
+        validate_rule(rule, number)
+    return rules
+
+
+def validate_rule(rule, number):
+    """
+    :param rule: One promotion from the rules file.
+    :param number: Position of the rule in the file, for the error message.
+    :raises ValueError: If the rule is missing something or has an unknown type.
+    """
+    if not isinstance(rule, dict) or not rule.get("name"):
+        raise ValueError(f"promotion #{number} has no name")
+    if rule.get("type") not in PROMOTION_TYPES:
+        raise ValueError(f"promotion {rule['name']!r} has an unknown type {rule.get('type')!r}")
+    needed = {"bundle": ("count", "price"), "amount_off": ("amount",), "percent_off": ("percent",)}
+    for field in needed.get(rule["type"], ()):
+        if not isinstance(rule.get(field), (int, float)) or rule[field] < 0:
+            raise ValueError(f"promotion {rule['name']!r} needs a {field}")
+    if rule["type"] == "bundle" and rule["count"] < 1:
+        raise ValueError(f"promotion {rule['name']!r} needs a count of 1 or more")
+    if not isinstance(rule.get("match", {}), dict):
+        raise ValueError(f"promotion {rule['name']!r} has an invalid match")
+    days = rule.get("match", {}).get("days")
+    if days is not None and (not isinstance(days, list) or any(day not in DAYS for day in days)):
+        raise ValueError(f"promotion {rule['name']!r} needs days from {', '.join(DAYS)}")
+
+
+def today():
+    """
+    :return: The name of today, ex: "Tuesday".
+    """
+    return DAYS[time.localtime().tm_wday]
+
+
+def runs_on(rule, day):
+    """
+    :param rule: One promotion rule.
+    :param day: Name of a day, ex: "Tuesday".
+    :return: True if the promotion runs on that day.
+    """
+    return day in rule.get("match", {}).get("days", DAYS)
+
+
+def subset_unions(bit_rules):
+    """
+    For every group of 8 toppings, precompute the rules touched by each of the 256 ways to pick from the group.
+    :param bit_rules: bit_rules[topping bit] -> set of rules (as an integer) for that topping.
+    :return: A list with one table per group of 8 toppings.
+    """
+    tables = []
+    for first_bit in range(0, len(bit_rules), CHUNK_BITS):
+        group = bit_rules[first_bit:first_bit + CHUNK_BITS]
+        unions = [0] * (1 << len(group))
+        for subset in range(1, len(unions)):
+            lowest_bit = (subset & -subset).bit_length() - 1
+            unions[subset] = unions[subset & (subset - 1)] | group[lowest_bit]
+        tables.append(unions)
+    return tables
+
+
+def rule_rank(rule):
+    """
+    :param rule: One promotion rule.
+    :return: Sort key that gives every rule its bit: grouped by type, bundles by size and then cheapest first,
+             money-off rules smallest first. The best rule of a type is then the lowest (bundles) or highest
+             (everything else) bit of that type a pizza matches.
+    """
+    value = {"bundle": rule.get("price", 0), "amount_off": rule.get("amount", 0),
+             "percent_off": rule.get("percent", 0)}.get(rule["type"], 0)
+    return PROMOTION_TYPES.index(rule["type"]), rule.get("count", 1), value
+
+
+def compile_promotions(rules, base_options, toppings):
+    """
+    Compile the rules into bit sets over the price table's option ids and topping bits.
+    :param rules: List of promotion rules.
+    :param base_options: List of base options with categories and prices.
+    :param toppings: Dictionary of toppings and their prices.
+    :return: The engine dictionary.
+    :raises ValueError: If a rule names an option or topping that is not in the catalog.
+    """
+    table = compile_price_table(base_options, toppings)
+    topping_count = len(table["topping_names"])
+    option_rules = [[0] * len(names) for names in table["option_names"]]
+    requiring = [0] * topping_count  # requiring[bit] -> rules that need the topping
+    excluding = [0] * topping_count  # excluding[bit] -> rules that don't allow the topping
+    min_ok = [0] * (topping_count + 1)  # min_ok[count] -> rules a pizza with that many toppings is big enough for
+    type_rules = dict.fromkeys(PROMOTION_TYPES, 0)  # Type -> rules of that type
+    bundle_sizes = {}  # Pizzas in the bundle -> bundle rules of that size
+    compiled = []
+    for number, rule in enumerate(sorted(rules, key=rule_rank)):
+        rule_bit = 1 << number
+        match = rule.get("match", {})
+        unknown = set(match) - set(table["categories"]) - {"toppings", "without_toppings", "min_toppings", "days"}
+        if unknown:
+            raise ValueError(f"promotion {rule['name']!r} matches on an unknown category {sorted(unknown)[0]!r}")
+        for position, category in enumerate(table["categories"]):
+            allowed = match.get(category)
+            for name, option_id in table["option_ids"][position].items():
+                if allowed is None or name in allowed:
+                    option_rules[position][option_id] = option_rules[position][option_id] | rule_bit
+            missing = set(allowed or ()) - set(table["option_ids"][position])
+            if missing:
+                raise ValueError(f"promotion {rule['name']!r}: {sorted(missing)[0]!r} is not a {category} option")
+        for field, bit_rules in (("toppings", requiring), ("without_toppings", excluding)):
+            for name in match.get(field, ()):
+                if name not in table["topping_bits"]:
+                    raise ValueError(f"promotion {rule['name']!r}: {name!r} is not a topping")
+                bit = table["topping_bits"][name].bit_length() - 1
+                bit_rules[bit] = bit_rules[bit] | rule_bit
+        for count in range(max(0, match.get("min_toppings", 0)), topping_count + 1):
+            min_ok[count] = min_ok[count] | rule_bit
+        type_rules[rule["type"]] = type_rules[rule["type"]] | rule_bit
+        if rule["type"] == "bundle":
+            bundle_sizes[int(rule["count"])] = bundle_sizes.get(int(rule["count"]), 0) | rule_bit
+        compiled.append({
+            "name": rule["name"],
+            "type": rule["type"],
+            "match": match,
+            "price_cents": to_cents(rule.get("price", 0)),
+            "amount_cents": to_cents(rule.get("amount", 0)),
+            "basis_points": int(round(rule.get("percent", 0) * 100)),
+        })
+
+    return {
+        "table": table,
+        "rules": compiled,  # In bit order, not file order
+        "all_rules": (1 << len(compiled)) - 1,
+        "type_rules": type_rules,
+        "bundle_sizes": sorted(bundle_sizes.items()),
+        "all_toppings": (1 << topping_count) - 1,
+        "option_rules": option_rules,
+        "requiring": subset_unions(requiring),  # Looked up with the toppings a pizza does NOT have
+        "excluding": subset_unions(excluding),  # Looked up with the toppings a pizza has
+        "min_ok": min_ok,
+        "cheapest_cents": cheapest_topping_table(table),
+    }
+
+
+def cheapest_topping_table(table):
+    """
+    :param table: The compiled price table.
+    :return: For every group of 8 toppings, the price of the cheapest topping in each of the 256 subsets
+             (0 for the empty subset).
+    """
+    tables = []
+    for first_bit in range(0, len(table["topping_names"]), CHUNK_BITS):
+        group = table["topping_cents"][first_bit:first_bit + CHUNK_BITS]
+        cheapest = array("q", [0]) * (1 << len(group))
+        for subset in range(1, len(cheapest)):
+            lowest_bit = (subset & -subset).bit_length() - 1
+            rest = subset & (subset - 1)
+            cheapest[subset] = group[lowest_bit] if not rest else min(cheapest[rest], group[lowest_bit])
+        tables.append(cheapest)
+    return tables
+
+
+def matching_rules(engine, ids, mask):
+    """
+    :param engine: The compiled promotions.
+    :param ids: Tuple of option ids, one per category.
+    :param mask: Topping bitmask.
+    :return: The rules the pizza matches, as an integer with one bit per rule.
+    """
+    rules = engine["all_rules"] & engine["min_ok"][bin(mask).count("1")]
+    for option_rules, option_id in zip(engine["option_rules"], ids):
+        rules = rules & option_rules[option_id]
+    absent = engine["all_toppings"] & ~mask
+    for requiring, excluding in zip(engine["requiring"], engine["excluding"]):
+        rules = rules & ~(requiring[absent & 0xFF] | excluding[mask & 0xFF])
+        absent = absent >> CHUNK_BITS
+        mask = mask >> CHUNK_BITS
+    return rules
+
+
+def cheapest_topping_cents(engine, mask):
+    """
+    :param engine: The compiled promotions.
+    :param mask: Topping bitmask.
+    :return: Price of the cheapest topping on the pizza, or 0 without toppings.
+    """
+    cheapest = 0
+    for group in engine["cheapest_cents"]:
+        price = group[mask & 0xFF]
+        if price and (not cheapest or price < cheapest):
+            cheapest = price
+        mask = mask >> CHUNK_BITS
+    return cheapest
+
+
+def pizza_discount(engine, rule, mask, pizza_cents):
+    """
+    :param engine: The compiled promotions.
+    :param rule: A compiled per-pizza rule.
+    :param mask: Topping bitmask of the pizza.
+    :param pizza_cents: Price of the pizza in cents.
+    :return: How much the rule takes off the pizza, in cents (never more than the pizza costs).
+    """
+    if rule["type"] == "free_topping":
+        discount = cheapest_topping_cents(engine, mask)
+    elif rule["type"] == "amount_off":
+        discount = rule["amount_cents"]
+    else:
+        discount = percent_of_cents(pizza_cents, rule["basis_points"])
+    return min(discount, pizza_cents)
+
+
+def deals_for_rules(engine, ids, mask, rules):
+    """
+    :param engine: The compiled promotions.
+    :param ids: Tuple of option ids, one per category.
+    :param mask: Topping bitmask.
+    :param rules: The rules the pizza matches, one bit per rule.
+    :return: A tuple of (pizza cents, best per-pizza discount cents, number of that rule or -1,
+             the bundle rules the pizza can be part of, one bit per rule).
+    """
+    pizza_cents = price_cents(engine["table"], ids, mask)
+    best_discount = 0
+    best_rule = -1
+    for rule_type in ("free_topping", "amount_off", "percent_off"):
+        typed = rules & engine["type_rules"][rule_type]
+        if typed:
+            # Rules of a type are numbered smallest discount first, so only the highest one needs working out
+            number = typed.bit_length() - 1
+            discount = pizza_discount(engine, engine["rules"][number], mask, pizza_cents)
+            if discount > best_discount:
+                best_discount, best_rule = discount, number
+    return pizza_cents, best_discount, best_rule, rules & engine["type_rules"]["bundle"]
+
+
+def catalog_fingerprint(rules, base_options, toppings):
+    """
+    :param rules: List of promotion rules.
+    :param base_options: List of base options with categories and prices.
+    :param toppings: Dictionary of toppings and their prices.
+    :return: A short hash that changes whenever a rule, option or price changes.
+    """
+    text = json.dumps([rules, base_options, toppings], sort_keys=True)
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def use_promotions(rules, base_options, toppings, day=None):
+    """
+    Compile the rules that run on a day for this catalog, unless they already are. Remembered pizzas and orders are
+    thrown away whenever a rule or price changes, or another day has other promotions.
+    :param rules: List of promotion rules.
+    :param base_options: List of base options with categories and prices.
+    :param toppings: Dictionary of toppings and their prices.
+    :param day: Name of the day (None for today).
+    :return: The engine dictionary.
+    """
+    day = day or today()
+    day_rules = [rule for rule in rules if runs_on(rule, day)]
+    fingerprint = catalog_fingerprint(day_rules, base_options, toppings)
+    if fingerprint != active["fingerprint"]:
+        active["engine"] = compile_promotions(day_rules, base_options, toppings)
+        active["fingerprint"] = fingerprint
+        pizza_deals.cache_clear()
+        best_promotions.cache_clear()
+    active["day"] = day
+    active["source"] = (rules, base_options, toppings)
+    return active["engine"]
+
+
+@lru_cache(maxsize=MAX_PIZZAS)
+def pizza_deals(pizza):
+    """
+    :param pizza: A pizza as (option ids tuple, topping bitmask).
+    :return: The deals of the pizza under the active promotions, see deals_for_rules().
+    """
+    ids, mask = pizza
+    return deals_for_rules(active["engine"], ids, mask, matching_rules(active["engine"], ids, mask))
+
+
+def best_combination(deals, engine):
+    """
+    Find the promotions that save the most on one order. Every pizza gets at most one promotion: its best per-pizza
+    deal, or a place in one bundle. Orders are small, so every split into bundles is tried, starting from the first
+    pizza that is still free; results for the same set of free pizzas are reused.
+    :param deals: List of pizza deals from deals_for_rules(), one per pizza.
+    :param engine: The compiled promotions.
+    :return: A tuple of (total discount cents, tuple of (rule number, pizza positions, discount cents)).
+    """
+    solved = {0: (0, ())}
+
+    def solve(free):
+        if free in solved:
+            return solved[free]
+        first = (free & -free).bit_length() - 1
+        rest = free & ~(1 << first)
+        pizza_cents, discount, rule_number, bundles = deals[first]
+        saved, applied = solve(rest)
+        best = (saved + discount, applied + ((rule_number, (first,), discount),)) if discount else (saved, applied)
+        if bundles:
+            partners = [position for position in range(first + 1, len(deals))
+                        if rest >> position & 1 and deals[position][3] & bundles]
+            for size, size_rules in engine["bundle_sizes"]:
+                if not bundles & size_rules:
+                    continue
+                for group in combinations(partners, size - 1):
+                    shared = bundles & size_rules
+                    group_mask = 0
+                    group_cents = pizza_cents
+                    for position in group:
+                        shared = shared & deals[position][3]
+                        group_mask = group_mask | 1 << position
+                        group_cents = group_cents + deals[position][0]
+                    if not shared:
+                        continue
+                    number = (shared & -shared).bit_length() - 1  # Cheapest bundle every pizza in the group fits
+                    bundle_saved = group_cents - engine["rules"][number]["price_cents"]
+                    if bundle_saved <= 0:
+                        continue
+                    saved, applied = solve(rest & ~group_mask)
+                    if saved + bundle_saved > best[0]:
+                        best = (saved + bundle_saved, applied + ((number, (first,) + group, bundle_saved),))
+        solved[free] = best
+        return best
+
+    return solve((1 << len(deals)) - 1)
+
+
+def order_key(pizzas):
+    """
+    :param pizzas: The pizzas of an order as (option ids tuple, topping bitmask) tuples, in any order.
+    :return: The canonical key of the order: the pizzas sorted, so the same pizzas in another order share a key.
+    """
+    return tuple(sorted(pizzas))
+
+
+@lru_cache(maxsize=MAX_ORDERS)
+def best_promotions(key):
+    """
+    :param key: An order key from order_key().
+    :return: A tuple of (total discount cents, tuple of (rule number, positions in the key, discount cents)).
+    """
+    engine = active["engine"]
+    total = 0
+    applied = ()
+    for first in range(0, len(key), EXACT_PIZZAS):
+        # Huge orders are worked out EXACT_PIZZAS at a time, so the search never grows out of hand
+        group = key[first:first + EXACT_PIZZAS]
+        saved, group_applied = best_combination([pizza_deals(pizza) for pizza in group], engine)
+        total = total + saved
+        applied = applied + tuple((number, tuple(first + position for position in positions), discount)
+                                  for number, positions, discount in group_applied)
+    return total, applied
+
+
+def encode_ingredients(table, ingredients):
+    """
+    :param table: The compiled price table.
+    :param ingredients: A pizza's ingredients as (category, name, price) tuples, like get_pizza_ingredients() makes.
+    :return: The pizza as (option ids tuple, topping bitmask).
+    :raises KeyError: If an ingredient is not in the catalog.
+    """
+    choices = {}
+    topping_names = []
+    for category, name, unused_price in ingredients:
+        if category == "Topping":
+            topping_names.append(name)
+        else:
+            choices[category.lower()] = name
+    return encode_pizza(table, choices, topping_names)
+
+
+def apply_promotions(pizzas):
+    """
+    Find the best promotions for an order with the active promotions (see use_promotions()).
+    :param pizzas: List of (ingredients, pizza_cost) tuples, like main() in Final_project.py keeps.
+    :return: A tuple of (total discount in dollars, list of {"name", "pizzas", "discount"} dictionaries, where
+             "pizzas" are the pizza numbers the promotion was used on, starting at 1).
+    """
+    if active["day"] != today():
+        use_promotions(*active["source"])  # The program ran past midnight: use the new day's promotions
+    engine = active["engine"]
+    encoded = [encode_ingredients(engine["table"], ingredients) for ingredients, unused_cost in pizzas]
+    # Sort the pizza numbers the same way order_key() sorts the pizzas, to map positions back
+    numbers = sorted(range(len(encoded)), key=lambda number: encoded[number])
+    total, applied = best_promotions(order_key(encoded))
+    promotions = [{"name": engine["rules"][rule_number]["name"],
+                   "pizzas": sorted(numbers[position] + 1 for position in positions),
+                   "discount": discount / 100}
+                  for rule_number, positions, discount in applied]
+    promotions.sort(key=lambda promotion: promotion["pizzas"])
+    return total / 100, promotions
+
+
+def scan_every_rule(engine, ids, mask):
+    """
+    The slow way, for the benchmark: check the rules one at a time against the pizza's names.
+    :param engine: The compiled promotions.
+    :param rules: The promotion rules the engine was compiled from.
+    :param ids: Tuple of option ids, one per category.
+    :param mask: Topping bitmask.
+    :return: The rules the pizza matches, one bit per rule.
+    """
+    table = engine["table"]
+    names = {category: table["option_names"][position][option_id]
+             for position, (category, option_id) in enumerate(zip(table["categories"], ids))}
+    topping_names = {name for name, bit in table["topping_bits"].items() if mask & bit}
+    matched = 0
+    for number, rule in enumerate(engine["rules"]):
+        match = rule["match"]
+        if any(category in match and names[category] not in match[category] for category in names):
+            continue
+        if not set(match.get("toppings", ())) <= topping_names or topping_names & set(match.get("without_toppings", ())):
+            continue
+        if len(topping_names) < match.get("min_toppings", 0):
+            continue
+        matched = matched | 1 << number
+    return matched
+
+
+def random_rules(generator, base_options, toppings, count):
+    """
+    :param generator: A random.Random.
+    :param base_options: List of base options with categories and prices.
+    :param toppings: Dictionary of toppings and their prices.
+    :param count: Number of rules to make.
+    :return: A list of made-up promotion rules of every type, for the benchmark.
+    """
+    rules = []
+    for number in range(count):
+        match = {}
+        for option in base_options:
+            if generator.random() < 0.3:
+                match[option["category"]] = generator.sample(list(option["options"]), generator.randint(1, 3))
+        picked = generator.sample(list(toppings), generator.randint(0, 3))
+        if picked:
+            match["toppings"] = picked[:generator.randint(0, len(picked))]
+            match["without_toppings"] = picked[len(match["toppings"]):]
+        rule_type = generator.choice(PROMOTION_TYPES)
+        rule = {"name": f"Promotion {number + 1}", "type": rule_type, "match": match}
+        if rule_type == "bundle":
+            rule["count"] = generator.randint(2, 3)
+            rule["price"] = rule["count"] * generator.choice([9.99, 11.99, 13.99, 15.99])
+        elif rule_type == "free_topping":
+            match["min_toppings"] = generator.randint(2, 4)
+        elif rule_type == "amount_off":
+            rule["amount"] = generator.choice([1.0, 2.0, 3.0, 5.0])
+        else:
+            rule["percent"] = generator.choice([5, 10, 15, 20])
+        rules.append(rule)
+    return rules
+
+
+def run_benchmark(order_count=1_000_000, rule_count=300):
+    """
+    Price skewed traffic (a few popular orders make up most of it) against rule_count promotions: checking every rule
+    one at a time, with the compiled matcher, and with the compiled matcher plus the order cache.
+    Checking one rule at a time is slow, so it only runs on a sample; the sample's discounts must come out the same.
+    :param order_count: Orders to price.
+    :param rule_count: Promotions that are running (the rules file plus made-up ones).
+    """
+    with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), "ingredients.json"), "r") as file:
+        catalog = json.load(file)
+    base_options, toppings = catalog["base_options"], catalog["toppings"]
+    rules = load_promotions(os.path.join(os.path.dirname(os.path.abspath(__file__)), EXAMPLE_FILE)) or []
+    generator = random.Random(1150)
+    rules = rules + random_rules(generator, base_options, toppings, rule_count - len(rules))
+
+    start_time = time.perf_counter()
+    engine = use_promotions(rules, base_options, toppings)
+    compile_ms = (time.perf_counter() - start_time) * 1000
+    table = engine["table"]
+
+    def random_pizza():
+        choices = {option["category"]: generator.choice(list(option["options"])) for option in base_options}
+        return encode_pizza(table, choices, [topping for topping in toppings if generator.random() < 0.25])
+
+    # 50 popular orders get about 80% of the traffic, the rest are random orders of 1 to 4 pizzas
+    popular = [[random_pizza() for unused_value in range(generator.randint(1, 4))] for unused_value in range(50)]
+    traffic = []
+    for unused_value in range(order_count):
+        if generator.random() < 0.8:
+            order = generator.choice(popular)
+            traffic.append(generator.sample(order, len(order)))
+        else:
+            traffic.append([random_pizza() for unused_value in range(generator.randint(1, 4))])
+
+    sample = traffic[:min(order_count, 5000)]
+    start_time = time.perf_counter()
+    scanned = [best_combination([deals_for_rules(engine, ids, mask, scan_every_rule(engine, ids, mask))
+                                 for ids, mask in sorted(order)], engine)[0] for order in sample]
+    scan_seconds = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    compiled = [best_combination([deals_for_rules(engine, ids, mask, matching_rules(engine, ids, mask))
+                                  for ids, mask in sorted(order)], engine)[0] for order in sample]
+    compiled_seconds = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    total_discount = 0
+    for order in traffic:
+        total_discount = total_discount + best_promotions(order_key(order))[0]
+    cached_seconds = time.perf_counter() - start_time
+    cached = [best_promotions(order_key(order))[0] for order in sample]
+    orders = best_promotions.cache_info()
+
+    print(f"\n{'Promotion Engine Benchmark':^60}")
+    print("=" * 60)
+    print(f"{'Promotions running':<40}{len(engine['rules']):>20,}")
+    print(f"{'Compile time (ms)':<40}{compile_ms:>20.1f}")
+    print(f"{'Orders priced':<40}{order_count:>20,}")
+    print(f"{'Check every rule (orders/sec)':<40}{len(sample) / scan_seconds:>20,.0f}")
+    print(f"{'Compiled matcher (orders/sec)':<40}{len(sample) / compiled_seconds:>20,.0f}")
+    print(f"{'Compiled + order cache (orders/sec)':<40}{order_count / cached_seconds:>20,.0f}")
+    print(f"{'Order cache hit rate':<40}{orders.hits / (orders.hits + orders.misses) * 100:>19.1f}%")
+    print(f"{'Total savings':<40}{'$' + format(total_discount / 100, ',.2f'):>20}")
+    print(f"{'Sample results match':<40}{str(scanned == compiled == cached):>20}")
+    print("=" * 60)
+    print(f"The rule-by-rule and compiled-only columns ran on the first {len(sample):,} orders.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the promotion engine.")
+    parser.add_argument("--orders", type=int, default=1_000_000, help="orders to price")
+    parser.add_argument("--rules", type=int, default=300, help="promotions running")
+    args = parser.parse_args()
+    run_benchmark(args.orders, args.rules)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+"""
+Author: Lavell McGrone
+Date: 2026-10-18
+Description: Render receipts in bulk. display_order_summary() and view_previous_order() print every receipt line with
+             its own print() call and rebuild the f-string columns each time, which is fine for one customer but slow
+             when reprinting or exporting a whole day of orders. This module works out the column layout once, builds
+             each receipt as one string, and writes many receipts to a file or stream with a few large writes.
+             The text is exactly the same, byte for byte, as what the two Final_project.py functions print.
+             Receipts can also be exported as a simple HTML page.
+
+Usage:       python receipt_renderer.py export [--journal order_journal] [--output receipts.txt] [--html]
+             python receipt_renderer.py benchmark [--count 100000]
+"""
+
+import argparse
+import contextlib
+import html
+import io
+import os
+import sys
+import tempfile
+import time
+
+import order_journal
+
+WRITE_BUFFER_BYTES = 1024 * 1024  # Receipts are collected until about 1 MB of text, then written at once
+
+# Column layout, worked out once. Each template is a bound str.format, so rendering a line is one call.
+# Current order summary (display_order_summary)
+SUMMARY_HEADER = "\n" + "Order Summary:".center(60) + "\n" + "=" * 70 + "\n"
+SUMMARY_INGREDIENT = "{:<12}     {:<20}         $ {:>17.2f}\n".format
+SUMMARY_SUBTOTAL = ("-" * 70 + "\n" + f"{'Subtotal':<32}              $" + "{:>18.2f}\n").format
+SUMMARY_PROMOTION = ("{:<32}             -$" + "{:>18.2f}\n").format
+SUMMARY_TAX = (f"{'Tax Amount':<32}              $" + "{:>18.2f}\n").format
+SUMMARY_TIP = ("-" * 70 + "\n" + f"{'Tip':<32}              $" + "{:>18.2f}\n").format
+SUMMARY_FINAL = ("=" * 70 + "\n" + f"{'Final Total':<32}              $" + "{:>18.2f}\n").format
+
+# Saved order (view_previous_order), which uses one less space between its columns
+SAVED_HEADER = "\n===================== Previous Order Summary =====================\n"
+SAVED_INGREDIENT = "{:<12}    {:<20}         $ {:>17.2f}\n".format
+SAVED_SUBTOTAL = ("-" * 70 + "\n" + f"{'Subtotal':<32}             $" + "{:>18.2f}\n").format
+SAVED_PROMOTION = ("{:<32}            -$" + "{:>18.2f}\n").format
+SAVED_TAX = (f"{'Tax Amount':<32}             $" + "{:>18.2f}\n").format
+SAVED_TIP = ("-" * 70 + "\n" + f"{'Tip':<32}             $" + "{:>18.2f}\n").format
+SAVED_FINAL = ("=" * 70 + "\n" + f"{'Final Total':<32}             $" + "{:>18.2f}\n").format
+SAVED_EMPTY = "\nYour order is currently empty.\n"
+SAVED_FOOTER = "\nYour previous order has been successfully displayed.\n"
+
+PIZZA_TITLE = "\nPizza #{}:\n".format
+TOTALS_RULE = "-" * 70 + "\n"  # Between the last pizza and the promotions and tax
+
+
+def promotion_label(promotion):
+    """
+    :param promotion: One promotion from promotions.apply_promotions(), ex: {"name": ..., "pizzas": [1, 3], ...}.
+    :return: The promotion name with the pizzas it was used on, ex: "Veggie Tuesday (#1, #3)".
+    """
+    return f"{promotion['name']} (#{', #'.join(map(str, promotion['pizzas']))})"
+
+
+def render_order_summary(pizzas, final_total=None, tip_amount=None, tax_amount=None, applied_promotions=None):
+    """
+    Build the same text display_order_summary() prints.
+    :param pizzas: List of pizzas with their ingredients and costs.
+    :param final_total: Final total cost including tax and tip (optional).
+    :param tip_amount: The amount the user tipped (optional).
+    :param tax_amount: The tax amount (optional).
+    :param applied_promotions: Promotions taken off the order, from promotions.apply_promotions() (optional).
+    :return: The receipt as one string.
+    """
+    parts = [SUMMARY_HEADER]
+    for i, (ingredients, pizza_cost) in enumerate(pizzas, start=1):
+        parts.append(PIZZA_TITLE(i))
+        for category, name, price in ingredients:
+            parts.append(SUMMARY_INGREDIENT(category, name, price))
+        parts.append(SUMMARY_SUBTOTAL(pizza_cost))
+    parts.append(TOTALS_RULE)
+    for promotion in applied_promotions or []:
+        parts.append(SUMMARY_PROMOTION(promotion_label(promotion), promotion["discount"]))
+    parts.append(SUMMARY_TAX(tax_amount if tax_amount is not None else 0.00))
+    if tip_amount is not None and tip_amount > 0:
+        parts.append(SUMMARY_TIP(tip_amount))
+    parts.append(SUMMARY_FINAL(final_total if final_total is not None else 0.00))
+    return "".join(parts)
+
+
+def render_saved_order(order_data):
+    """
+    Build the same text view_previous_order() prints for one saved order.
+    :param order_data: The order summary dictionary read back from the order journal.
+    :return: The receipt as one string.
+    """
+    if not order_data or "pizzas" not in order_data or not order_data["pizzas"]:
+        return SAVED_EMPTY
+
+    parts = [SAVED_HEADER]
+    for i, pizza in enumerate(order_data["pizzas"], start=1):
+        parts.append(PIZZA_TITLE(i))
+        for category, name, price in pizza["ingredients"]:
+            parts.append(SAVED_INGREDIENT(category, name, price))
+        parts.append(SAVED_SUBTOTAL(pizza["subtotal"]))
+    parts.append(TOTALS_RULE)
+    for promotion in order_data.get("promotions", []):
+        parts.append(SAVED_PROMOTION(promotion_label(promotion), promotion["discount"]))
+    parts.append(SAVED_TAX(order_data.get("tax_amount", 0.00)))
+    tip_amount = order_data.get("tip_amount", 0.00)
+    if tip_amount > 0:
+        parts.append(SAVED_TIP(tip_amount))
+    final_total = order_data.get("final_total", 0.00)
+    if final_total > 0:
+        parts.append(SAVED_FINAL(final_total))
+    parts.append(SAVED_FOOTER)
+    return "".join(parts)
+
+
+def to_html(receipt, title):
+    """
+    :param receipt: Receipt text.
+    :param title: Heading shown above the receipt.
+    :return: The receipt as an HTML section, keeping the columns with a <pre> block.
+    """
+    return f"<section>\n<h2>{html.escape(title)}</h2>\n<pre>{html.escape(receipt)}</pre>\n</section>\n"
+
+
+def write_receipts(receipts, stream, as_html=False):
+    """
+    Write many receipts to a stream, collecting them in a buffer so there are only a few large writes.
+    :param receipts: Iterable of (title, receipt text) tuples.
+    :param stream: Text stream to write to (an open file, sys.stdout, ...).
+    :param as_html: Write an HTML page instead of plain text.
+    :return: The number of receipts written.
+    """
+    buffer = []
+    buffered = 0
+    count = 0
+    if as_html:
+        buffer.append("<!DOCTYPE html>\n<html>\n<head><meta charset=\"utf-8\"><title>Receipts</title></head>\n<body>\n")
+
+    for title, receipt in receipts:
+        text = to_html(receipt, title) if as_html else receipt
+        buffer.append(text)
+        buffered = buffered + len(text)
+        count = count + 1
+        if buffered >= WRITE_BUFFER_BYTES:
+            stream.write("".join(buffer))
+            buffer.clear()
+            buffered = 0
+
+    if as_html:
+        buffer.append("</body>\n</html>\n")
+    stream.write("".join(buffer))
+    stream.flush()
+    return count
+
+
+def journal_receipts(journal):
+    """
+    :param journal: The journal dictionary from order_journal.open_journal().
+    :return: A generator of (title, receipt text) tuples for every saved order.
+    """
+    for order_number, order_data in order_journal.iter_orders(journal):
+        yield f"Order #{order_number}", render_saved_order(order_data)
+
+
+def export_journal(journal_dir, output_path, as_html=False):
+    """
+    Export the receipt of every saved order to one file.
+    :param journal_dir: Folder that holds the order journal.
+    :param output_path: File to write, or "-" for the console.
+    :param as_html: Write an HTML page instead of plain text.
+    """
+    journal = order_journal.open_journal(journal_dir, read_only=True)
+    try:
+        if output_path == "-":
+            count = write_receipts(journal_receipts(journal), sys.stdout, as_html)
+        else:
+            with open(output_path, "w", encoding="utf-8") as file:
+                count = write_receipts(journal_receipts(journal), file, as_html)
+            print(f"Exported {count:,} receipt(s) to '{output_path}'.")
+    finally:
+        order_journal.close_journal(journal)
+
+
+def run_benchmark(count=100_000):
+    """
+    Render the same receipts with the print() based Final_project functions and with this module,
+    check that the text is identical, and display the timings.
+    :param count: How many receipts to render.
+    """
+    import Final_project
+
+    pizzas = [
+        ([("Crust", "Thin", 10.99), ("Sauce", "Marinara", 1.5), ("Cheese", "Mozzarella", 2.0),
+          ("Topping", "Pepperoni", 2.0), ("Topping", "Mushrooms", 1.5)], 17.99),
+        ([("Crust", "Deep dish", 12.99), ("Sauce", "Alfredo", 2.0), ("Cheese", "vegan", 3.0)], 17.99),
+    ]
+    order_data = Final_project.build_order_data(pizzas, 42.68, 2.52, 3.98)
+    # An order with promotions too, since they add lines between the pizzas and the tax
+    applied_promotions = [{"name": "Two Deep Dish Deal", "pizzas": [1, 2], "discount": 3.0},
+                          {"name": "Veggie Tuesday", "pizzas": [2], "discount": 1.5}]
+    promotion_order = Final_project.build_order_data(pizzas, 37.86, 2.2, 3.98, applied_promotions=applied_promotions)
+
+    # The text has to match byte for byte before the timings mean anything
+    for render, display, args in ((render_order_summary, Final_project.display_order_summary,
+                                   (pizzas, 42.68, 3.98, 2.52)),
+                                  (render_order_summary, Final_project.display_order_summary,
+                                   (pizzas, 37.86, 3.98, 2.2, applied_promotions)),
+                                  (render_saved_order, Final_project.display_saved_order, (order_data,)),
+                                  (render_saved_order, Final_project.display_saved_order, (promotion_order,))):
+        printed = io.StringIO()
+        with contextlib.redirect_stdout(printed):
+            display(*args)
+        if printed.getvalue() != render(*args):
+            print(f"Error: {render.__name__} does not match {display.__name__}.")
+            return
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        results = []
+        for name, display in (("Current order", Final_project.display_order_summary),
+                              ("Saved order", Final_project.display_saved_order)):
+            args = (pizzas, 42.68, 3.98, 2.52) if display is Final_project.display_order_summary else (order_data,)
+            render = render_order_summary if display is Final_project.display_order_summary else render_saved_order
+
+            # Old path: one print() per line into a line-buffered file, like a terminal
+            with open(os.path.join(temp_dir, "print.txt"), "w", buffering=1) as file:
+                start_time = time.perf_counter()
+                with contextlib.redirect_stdout(file):
+                    for unused_value in range(count):
+                        display(*args)
+                print_seconds = time.perf_counter() - start_time
+
+            # New path: precomputed layout, one string per receipt, large buffered writes
+            with open(os.path.join(temp_dir, "bulk.txt"), "w", buffering=1) as file:
+                start_time = time.perf_counter()
+                write_receipts((("", render(*args)) for unused_value in range(count)), file)
+                bulk_seconds = time.perf_counter() - start_time
+
+            results.append((name, print_seconds, bulk_seconds))
+
+    print(f"\n{'Receipt Rendering Benchmark':^70}")
+    print("=" * 70)
+    print(f"{'Receipts':<22}{'print() (rec/sec)':>16}{'bulk (rec/sec)':>16}{'Speed up':>16}")
+    print("-" * 70)
+    for name, print_seconds, bulk_seconds in results:
+        print(f"{name:<22}{count / print_seconds:>16,.0f}{count / bulk_seconds:>16,.0f}"
+              f"{print_seconds / bulk_seconds:>15.1f}x")
+    print("=" * 70)
+    print(f"{count:,} receipts of each kind, output identical to Final_project.py.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render pizza receipts in bulk.")
+    parser.add_argument("command", choices=["export", "benchmark"])
+    parser.add_argument("--journal", default=order_journal.DEFAULT_JOURNAL_DIR, help="order journal folder")
+    parser.add_argument("--output", default="-", help='file to export to ("-" for the console)')
+    parser.add_argument("--html", action="store_true", help="export an HTML page instead of text")
+    parser.add_argument("--count", type=int, default=100_000, help="receipts rendered by the benchmark")
+    args = parser.parse_args()
+
+    if args.command == "export":
+        export_journal(args.journal, args.output, args.html)
+    else:
+        run_benchmark(args.count)
+
+
+if __name__ == "__main__":
+    main()
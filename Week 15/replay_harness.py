@@ -0,0 +1,370 @@
+"""
+Author: Lavell McGrone
+Date: 2026-10-18
+Description: Replay recorded answer scripts through the ordering programs without anyone at the keyboard.
+             Final_project.py (pizza) and Week10/Sandwhich_Maker.py (sandwich) both ask every question through
+             PyInputPlus, so the harness plugs in a scripted input provider in place of their `pyip` module that
+             answers each inputMenu/inputYesNo/inputInt call from the script. Each session runs the program's real
+             main() in a scratch folder; the console output is captured, the catalog comes from a local stand-in
+             server, and submitted orders land in a scratch order journal. Every run reports timings per phase
+             (catalog load, building, summary rendering, place_order write) and can be compared with an earlier
+             report to catch slowdowns.
+
+Usage:       python replay_harness.py generate scripts.jsonl [--count 1000] [--program pizza|sandwich|both]
+             python replay_harness.py run scripts.jsonl [--transcript out.txt] [--report report.json]
+                                      [--baseline old_report.json]
+             A script file has one session per line: {"program": "pizza", "answers": ["Add a Pizza", "Thin", ...]}
+"""
+
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+import catalog_cache
+import Final_project
+from stand_in_server import start_stand_in_server, stop_stand_in_server
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SANDWICH_PATH = os.path.join(HERE, "..", "Week10", "Sandwhich_Maker.py")
+REGRESSION_THRESHOLD = 1.20  # A phase counts as slower when its mean time grew by more than 20%
+
+# Functions that are timed in each program: phase name -> function name in the program's module
+PIZZA_PHASES = {
+    "Catalog load": "load_ingredients",
+    "Pizza building": "get_pizza_ingredients",
+    "Summary rendering": "display_order_summary",
+    "place_order write": "place_order",
+}
+SANDWICH_PHASES = {
+    "Sandwich building": "get_sandwich_ingredients",
+    "Summary rendering": "display_order_summary",
+}
+
+
+def load_sandwich_module():
+    """
+    Import Week10/Sandwhich_Maker.py from its own folder.
+    :return: The sandwich program module.
+    """
+    spec = importlib.util.spec_from_file_location("Sandwhich_Maker", SANDWICH_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def scripted_input(answers):
+    """
+    Build an input provider with the same functions the programs call on pyinputplus, answering from a script.
+    Prompts and answers are printed, so the captured output reads like a console session.
+    :param answers: List of answers, used in order.
+    :return: A tuple of (provider, function that returns how many answers are left).
+    :raises ValueError: (from the provider) if the script runs out or an answer is not valid for the question.
+    """
+    remaining = iter(answers)
+    used = [0]
+
+    def next_answer(prompt):
+        try:
+            answer = str(next(remaining))
+        except StopIteration:
+            raise ValueError(f"The script ran out of answers at: {prompt.strip()!r}")
+        used[0] = used[0] + 1
+        print(prompt + answer)
+        return answer
+
+    def input_menu(choices, prompt="", numbered=False, **unused_options):
+        if numbered:
+            lines = [f"{number}. {choice}" for number, choice in enumerate(choices, start=1)]
+        else:
+            lines = [f"* {choice}" for choice in choices]
+        answer = next_answer((prompt or "Please select one of the following:\n") + "\n".join(lines) + "\n")
+        if numbered and answer.isdigit() and 1 <= int(answer) <= len(choices):
+            return choices[int(answer) - 1]
+        for choice in choices:
+            if choice.lower() == answer.lower():
+                return choice
+        raise ValueError(f"{answer!r} is not one of {choices}")
+
+    def input_yes_no(prompt="", **unused_options):
+        answer = next_answer(prompt).lower()
+        if answer in ("y", "yes"):
+            return "yes"
+        if answer in ("n", "no"):
+            return "no"
+        raise ValueError(f"{answer!r} is not yes or no")
+
+    def input_int(prompt="", min=None, max=None, **unused_options):
+        value = int(next_answer(prompt))
+        if (min is not None and value < min) or (max is not None and value > max):
+            raise ValueError(f"{value} is outside the allowed range")
+        return value
+
+    def input_str(prompt="", **unused_options):
+        return next_answer(prompt)
+
+    provider = SimpleNamespace(inputMenu=input_menu, inputYesNo=input_yes_no, inputInt=input_int, inputStr=input_str)
+    return provider, lambda: len(answers) - used[0]
+
+
+def install_timers(module, phase_names, timings):
+    """
+    Wrap the program functions of each phase so every call is timed. main() looks its helpers up by name
+    when it calls them, so replacing them on the module is enough.
+    :param module: The program module.
+    :param phase_names: Dictionary of phase name -> function name.
+    :param timings: Dictionary of phase name -> list of call durations in seconds, filled in by the wrappers.
+    :return: Dictionary of the original functions, to put back with restore_functions().
+    """
+    originals = {}
+    for phase, function_name in phase_names.items():
+        original = getattr(module, function_name)
+        originals[function_name] = original
+        durations = timings.setdefault(phase, [])
+
+        def timed(*args, original=original, durations=durations, **kwargs):
+            start_time = time.perf_counter()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                durations.append(time.perf_counter() - start_time)
+
+        setattr(module, function_name, timed)
+    return originals
+
+
+def restore_functions(module, originals):
+    """
+    :param module: The program module.
+    :param originals: Dictionary of function name -> original function.
+    """
+    for function_name, original in originals.items():
+        setattr(module, function_name, original)
+
+
+def run_session(module, answers):
+    """
+    Run one program session from a script.
+    :param module: The program module.
+    :param answers: The session's answers.
+    :return: A tuple of (captured output, error message or None).
+    """
+    provider, answers_left = scripted_input(answers)
+    real_pyip = module.pyip
+    module.pyip = provider
+    buffer = io.StringIO()
+    error = None
+    try:
+        with contextlib.redirect_stdout(buffer):
+            module.main()
+        if answers_left():
+            error = f"{answers_left()} answer(s) were not used"
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    finally:
+        module.pyip = real_pyip
+    return buffer.getvalue(), error
+
+
+def read_scripts(path):
+    """
+    :param path: Script file, one JSON session per line.
+    :return: A generator of (line number, session dictionary) tuples.
+    """
+    with open(path, "r") as file:
+        for line_number, line in enumerate(file, start=1):
+            if line.strip():
+                yield line_number, json.loads(line)
+
+
+def percentile(sorted_values, fraction):
+    """
+    :param sorted_values: Sorted list of numbers.
+    :param fraction: 0.5 for the median, 0.99 for p99.
+    :return: The value at that fraction, or 0 for an empty list.
+    """
+    if not sorted_values:
+        return 0
+    return sorted_values[min(int(len(sorted_values) * fraction), len(sorted_values) - 1)]
+
+
+def replay(script_path, transcript_path=None):
+    """
+    Replay every session in a script file and time the phases.
+    :param script_path: Script file, one JSON session per line.
+    :param transcript_path: Optional file to save the captured output of every session to.
+    :return: The report dictionary.
+    """
+    modules = {"pizza": Final_project, "sandwich": load_sandwich_module()}
+    phase_names = {"pizza": PIZZA_PHASES, "sandwich": SANDWICH_PHASES}
+    timings = {"pizza": {}, "sandwich": {}}
+    originals = {program: install_timers(modules[program], phase_names[program], timings[program])
+                 for program in modules}
+    sessions = {"pizza": 0, "sandwich": 0}
+    failures = []
+
+    with open(os.path.join(HERE, "ingredients.json"), "r") as file:
+        catalog = json.load(file)
+    server, base_url = start_stand_in_server({"/ingredients.json": catalog})
+    real_url = Final_project.INGREDIENTS_URL
+    Final_project.INGREDIENTS_URL = base_url + "/ingredients.json"
+    script_path = os.path.abspath(script_path)
+    transcript = open(transcript_path, "w") if transcript_path else None
+    start_folder = os.getcwd()
+
+    with tempfile.TemporaryDirectory() as scratch:
+        os.chdir(scratch)  # The catalog cache and the order journal are written here, not in the real folders
+        start_time = time.perf_counter()
+        try:
+            for line_number, session in read_scripts(script_path):
+                program = session.get("program", "pizza")
+                if program not in modules:
+                    failures.append((line_number, f"unknown program {program!r}"))
+                    continue
+                output, error = run_session(modules[program], session.get("answers", []))
+                sessions[program] = sessions[program] + 1
+                if error:
+                    failures.append((line_number, error))
+                if transcript:
+                    transcript.write(f"===== Session on line {line_number} ({program}) =====\n{output}\n")
+        finally:
+            total_seconds = time.perf_counter() - start_time
+            Final_project.close_order_store()  # Its journal lives in the scratch folder, which is removed below
+            os.chdir(start_folder)
+            Final_project.INGREDIENTS_URL = real_url
+            for program, module in modules.items():
+                restore_functions(module, originals[program])
+            stop_stand_in_server(server)
+            catalog_cache.session = None
+            if transcript:
+                transcript.close()
+
+        files = {}
+        for folder, unused_folders, file_names in os.walk(scratch):
+            for file_name in file_names:
+                path = os.path.join(folder, file_name)
+                files[os.path.relpath(path, scratch)] = os.path.getsize(path)
+
+    report = {"sessions": sessions, "failures": len(failures), "seconds": total_seconds, "files": files, "phases": {}}
+    for program, program_timings in timings.items():
+        for phase, durations in program_timings.items():
+            if durations:
+                durations.sort()
+                report["phases"][f"{program}: {phase}"] = {
+                    "calls": len(durations),
+                    "total_ms": sum(durations) * 1000,
+                    "mean_ms": sum(durations) / len(durations) * 1000,
+                    "p50_ms": percentile(durations, 0.5) * 1000,
+                    "p99_ms": percentile(durations, 0.99) * 1000,
+                }
+    report["failure_details"] = [f"line {line_number}: {error}" for line_number, error in failures[:20]]
+    return report
+
+
+def display_report(report, baseline=None):
+    """
+    :param report: Report from replay().
+    :param baseline: Optional earlier report to compare the mean phase times with.
+    """
+    print(f"\n{'Replay Report':^90}")
+    print("=" * 90)
+    for program, count in report["sessions"].items():
+        print(f"{program.capitalize() + ' sessions':<30}{count:>12,}")
+    print(f"{'Failed sessions':<30}{report['failures']:>12,}")
+    print(f"{'Total time (seconds)':<30}{report['seconds']:>12.2f}")
+    print("-" * 90)
+    print(f"{'Phase':<32}{'Calls':>10}{'Total ms':>12}{'Mean ms':>10}{'p50 ms':>10}{'p99 ms':>10}  Change")
+    for phase, stats in report["phases"].items():
+        change = ""
+        if baseline and phase in baseline.get("phases", {}):
+            old_mean = baseline["phases"][phase]["mean_ms"]
+            ratio = stats["mean_ms"] / old_mean if old_mean else 1
+            change = f"{(ratio - 1) * 100:+.0f}%" + ("  SLOWER" if ratio > REGRESSION_THRESHOLD else "")
+        print(f"{phase:<32}{stats['calls']:>10,}{stats['total_ms']:>12.1f}{stats['mean_ms']:>10.3f}"
+              f"{stats['p50_ms']:>10.3f}{stats['p99_ms']:>10.3f}  {change}")
+    print("-" * 90)
+    for path, size in sorted(report["files"].items()):
+        print(f"Wrote {path} ({size:,} bytes)")
+    for detail in report["failure_details"]:
+        print(f"Failed: {detail}")
+    print("=" * 90)
+
+
+def generate_scripts(path, count, program):
+    """
+    Write random but valid answer scripts.
+    :param path: Script file to write.
+    :param count: Number of sessions.
+    :param program: "pizza", "sandwich" or "both".
+    """
+    with open(os.path.join(HERE, "ingredients.json"), "r") as file:
+        catalog = json.load(file)
+    sandwich_prices = load_sandwich_module().PRICES
+    random.seed(1150)
+
+    with open(path, "w") as file:
+        for number in range(count):
+            kind = program if program != "both" else ("pizza", "sandwich")[number % 2]
+            answers = []
+            if kind == "pizza":
+                for unused_pizza in range(random.randint(1, 3)):
+                    answers.append("Add a Pizza")
+                    for option in catalog["base_options"]:
+                        answers.append(random.choice(list(option["options"])))
+                    answers.extend(random.choice(("yes", "no")) for unused_topping in catalog["toppings"])
+                answers.append("View Current Order")
+                answers.append("Submit Order")
+                answers.append(random.choice(list(Final_project.TIP_CHOICES)))
+            else:
+                sandwiches = random.randint(1, 3)
+                answers.append(sandwiches)
+                for unused_sandwich in range(sandwiches):
+                    answers.append(random.choice(list(sandwich_prices["bread"])))
+                    answers.append(random.choice(list(sandwich_prices["protein"])))
+                    if random.random() < 0.5:
+                        answers.extend(["yes", random.choice(list(sandwich_prices["cheese"]))])
+                    else:
+                        answers.append("no")
+                    answers.extend(random.choice(("yes", "no")) for unused_extra in sandwich_prices["extras"])
+                answers.append("no")  # Don't start a new order
+            file.write(json.dumps({"program": kind, "answers": answers}) + "\n")
+    print(f"Wrote {count:,} script(s) to '{path}'.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay answer scripts through the ordering programs.")
+    parser.add_argument("command", choices=["generate", "run"])
+    parser.add_argument("scripts", help="script file (one JSON session per line)")
+    parser.add_argument("--count", type=int, default=1000, help="sessions written by generate")
+    parser.add_argument("--program", choices=["pizza", "sandwich", "both"], default="both")
+    parser.add_argument("--transcript", help="file to save the captured output of every session")
+    parser.add_argument("--report", help="file to save the timing report (JSON) to")
+    parser.add_argument("--baseline", help="earlier report (JSON) to compare with")
+    args = parser.parse_args()
+
+    if args.command == "generate":
+        generate_scripts(args.scripts, args.count, args.program)
+        return
+
+    report = replay(args.scripts, args.transcript)
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, "r") as file:
+            baseline = json.load(file)
+    display_report(report, baseline)
+    if args.report:
+        with open(args.report, "w") as file:
+            json.dump(report, file, indent=2)
+    if report["failures"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+"""
+Author: Lavell McGrone
+Date: 2026-10-18
+Description: Sales analytics over the order journal. The report reads the submitted orders one at a time (so memory
+             stays the same no matter how many orders there are) and adds them up: revenue and count for every crust,
+             sauce, cheese and topping, and the number of orders and average ticket for every hour of the day.
+             Large histories are split into ranges of order numbers that are added up in a pool of worker processes,
+             and the partial totals are merged together. The totals are saved next to the journal, so running the
+             report again only reads the orders that were placed since the last run.
+
+Usage:       python sales_report.py [--journal order_journal] [--workers 4] [--rebuild] [--top 5]
+"""
+
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import order_journal
+
+AGGREGATES_FILE = "sales_aggregates.json"  # Saved totals, stored inside the journal folder
+PARALLEL_THRESHOLD = 50_000  # Below this many new orders, one process is faster than starting a pool
+
+
+def to_cents(amount):
+    """
+    Money is added up in whole cents, so totals over millions of orders don't drift.
+    :param amount: A dollar amount.
+    :return: The amount in cents.
+    """
+    return int(round(amount * 100))
+
+
+def empty_aggregates():
+    """
+    :return: Totals for zero orders.
+    """
+    return {
+        "last_order": 0,  # Highest order number that is included in the totals
+        "orders": 0,
+        "pizzas": 0,
+        "subtotal_cents": 0,
+        "discount_cents": 0,  # Taken off by promotions, so subtotals - discounts + tax + tips = final totals
+        "tax_cents": 0,
+        "tip_cents": 0,
+        "final_cents": 0,
+        "items": {},  # "Category|Name" -> [times ordered, revenue in cents]
+        "hours": {},  # "00" to "23" (or "unknown") -> [orders, final total in cents]
+    }
+
+
+def add_order(aggregates, order_data):
+    """
+    Add one order to the totals.
+    :param aggregates: Totals dictionary from empty_aggregates().
+    :param order_data: One order read from the journal.
+    """
+    aggregates["orders"] = aggregates["orders"] + 1
+    items = aggregates["items"]
+    for pizza in order_data.get("pizzas", []):
+        aggregates["pizzas"] = aggregates["pizzas"] + 1
+        aggregates["subtotal_cents"] = aggregates["subtotal_cents"] + to_cents(pizza.get("subtotal", 0))
+        for category, name, price in pizza.get("ingredients", []):
+            key = category + "|" + name
+            item = items.get(key)
+            if item is None:
+                item = items[key] = [0, 0]
+            item[0] = item[0] + 1
+            item[1] = item[1] + to_cents(price)
+
+    for promotion in order_data.get("promotions", []):
+        aggregates["discount_cents"] = aggregates["discount_cents"] + to_cents(promotion["discount"])
+
+    final_cents = to_cents(order_data.get("final_total", 0))
+    aggregates["tax_cents"] = aggregates["tax_cents"] + to_cents(order_data.get("tax_amount", 0))
+    aggregates["tip_cents"] = aggregates["tip_cents"] + to_cents(order_data.get("tip_amount", 0))
+    aggregates["final_cents"] = aggregates["final_cents"] + final_cents
+
+    # "placed_at" looks like 2026-10-18T13:45:00, so the hour is characters 11-12. Older orders have no time.
+    placed_at = order_data.get("placed_at")
+    hour = placed_at[11:13] if placed_at and len(placed_at) >= 13 else "unknown"
+    bucket = aggregates["hours"].get(hour)
+    if bucket is None:
+        bucket = aggregates["hours"][hour] = [0, 0]
+    bucket[0] = bucket[0] + 1
+    bucket[1] = bucket[1] + final_cents
+
+
+def merge_aggregates(total, part):
+    """
+    Add the partial totals of one range of orders into the running totals.
+    :param total: Running totals, changed in place.
+    :param part: Partial totals to add.
+    """
+    for key in ("orders", "pizzas", "subtotal_cents", "discount_cents", "tax_cents", "tip_cents", "final_cents"):
+        total[key] = total[key] + part[key]
+    for group in ("items", "hours"):
+        for key, (count, cents) in part[group].items():
+            entry = total[group].setdefault(key, [0, 0])
+            entry[0] = entry[0] + count
+            entry[1] = entry[1] + cents
+    total["last_order"] = max(total["last_order"], part["last_order"])
+
+
+def aggregate_range(journal_dir, first_order, last_order):
+    """
+    Add up one range of orders. This runs inside a worker process, so it opens its own read-only journal.
+    :param journal_dir: Folder that holds the journal.
+    :param first_order: First order number of the range.
+    :param last_order: Last order number of the range.
+    :return: The partial totals for the range.
+    """
+    aggregates = empty_aggregates()
+    journal = order_journal.open_journal(journal_dir, read_only=True)
+    try:
+        for order_number, order_data in order_journal.iter_orders(journal, first_order):
+            if order_number > last_order:
+                break
+            add_order(aggregates, order_data)
+        aggregates["last_order"] = last_order
+    finally:
+        order_journal.close_journal(journal)
+    return aggregates
+
+
+def load_aggregates(journal_dir):
+    """
+    :param journal_dir: Folder that holds the journal.
+    :return: The saved totals, or empty totals if none are saved yet (or they were saved by an older version,
+             without every total, so the whole history is added up again).
+    """
+    try:
+        with open(os.path.join(journal_dir, AGGREGATES_FILE), "r") as file:
+            aggregates = json.load(file)
+    except (OSError, ValueError):
+        return empty_aggregates()
+    return aggregates if set(aggregates) == set(empty_aggregates()) else empty_aggregates()
+
+
+def save_aggregates(journal_dir, aggregates):
+    """
+    Save the totals (to a temporary file first, so a crash never leaves a broken file).
+    :param journal_dir: Folder that holds the journal.
+    :param aggregates: Totals to save.
+    """
+    path = os.path.join(journal_dir, AGGREGATES_FILE)
+    with open(path + ".tmp", "w") as file:
+        json.dump(aggregates, file)
+    os.replace(path + ".tmp", path)
+
+
+def update_aggregates(journal_dir, workers=None, rebuild=False):
+    """
+    Bring the saved totals up to date with the journal, reading only the orders that are new.
+    :param journal_dir: Folder that holds the journal.
+    :param workers: Number of worker processes (default: one per CPU).
+    :param rebuild: Ignore the saved totals and add up the whole history again.
+    :return: A tuple of (up to date totals, number of orders that were read).
+    """
+    aggregates = empty_aggregates() if rebuild else load_aggregates(journal_dir)
+    journal = order_journal.open_journal(journal_dir, read_only=True)
+    last_order = order_journal.count_orders(journal)
+    order_journal.close_journal(journal)
+
+    first_new = aggregates["last_order"] + 1
+    new_orders = last_order - first_new + 1
+    if new_orders <= 0:
+        return aggregates, 0
+
+    workers = workers or os.cpu_count() or 1
+    if new_orders < PARALLEL_THRESHOLD or workers == 1:
+        merge_aggregates(aggregates, aggregate_range(journal_dir, first_new, last_order))
+    else:
+        # Split the new orders into one range per worker and merge the partial totals as they finish
+        size = -(-new_orders // workers)  # Round up, so the ranges cover every order
+        ranges = [(start, min(start + size - 1, last_order)) for start in range(first_new, last_order + 1, size)]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for part in pool.map(aggregate_range, [journal_dir] * len(ranges),
+                                 [first for first, unused_value in ranges], [last for unused_value, last in ranges]):
+                merge_aggregates(aggregates, part)
+
+    save_aggregates(journal_dir, aggregates)
+    return aggregates, new_orders
+
+
+def display_report(aggregates, top=5):
+    """
+    Display the sales report.
+    :param aggregates: Totals from update_aggregates().
+    :param top: How many crusts/sauces/cheeses/toppings to list per category.
+    """
+    print("\n" + "Sales Report".center(70))
+    print("=" * 70)
+    print(f"{'Orders':<40}{aggregates['orders']:>30,}")
+    print(f"{'Pizzas':<40}{aggregates['pizzas']:>30,}")
+    print(f"{'Pizza subtotals':<40}${aggregates['subtotal_cents'] / 100:>29,.2f}")
+    print(f"{'Promotions':<40}-${aggregates['discount_cents'] / 100:>28,.2f}")
+    print(f"{'Tax':<40}${aggregates['tax_cents'] / 100:>29,.2f}")
+    print(f"{'Tips':<40}${aggregates['tip_cents'] / 100:>29,.2f}")
+    print(f"{'Final totals':<40}${aggregates['final_cents'] / 100:>29,.2f}")
+    if aggregates["orders"]:
+        print(f"{'Average ticket':<40}${aggregates['final_cents'] / 100 / aggregates['orders']:>29,.2f}")
+
+    # Group the items by category and list the best earners first
+    categories = {}
+    for key, (count, cents) in aggregates["items"].items():
+        category, name = key.split("|", 1)
+        categories.setdefault(category, []).append((cents, count, name))
+    for category, items in categories.items():
+        print(f"\nTop {category} by revenue:")
+        print("-" * 70)
+        for cents, count, name in sorted(items, reverse=True)[:top]:
+            print(f"{name:<30}{count:>15,} sold     ${cents / 100:>15,.2f}")
+
+    print("\nAverage ticket per hour:")
+    print("-" * 70)
+    for hour, (orders, cents) in sorted(aggregates["hours"].items()):
+        label = "Unknown time" if hour == "unknown" else f"{hour}:00 - {hour}:59"
+        print(f"{label:<30}{orders:>15,} orders   ${cents / 100 / orders:>15,.2f}")
+    print("=" * 70)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sales report over the pizza order journal.")
+    parser.add_argument("--journal", default=order_journal.DEFAULT_JOURNAL_DIR, help="order journal folder")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes for large histories")
+    parser.add_argument("--rebuild", action="store_true", help="ignore saved totals and read every order again")
+    parser.add_argument("--top", type=int, default=5, help="items listed per category")
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.journal):
+        print(f"Error: No order journal found in '{args.journal}'. Please place an order first.")
+        return
+    aggregates, new_orders = update_aggregates(args.journal, args.workers, args.rebuild)
+    print(f"Read {new_orders:,} new order(s).")
+    display_report(aggregates, args.top)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Author: Lavell McGrone
+Date: 2026-10-18
+Description: A small local HTTP server that stands in for the real ingredients.json host. It serves pages from a
+             dictionary, sends ETag and Last-Modified headers, answers conditional GETs with 304 Not Modified, and can
+             be slowed down on purpose. It runs in a background thread so benchmarks can talk to it without the internet.
+"""
+
+import email.utils
+import hashlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """
+    Answers GET requests from the pages stored on the server.
+    """
+    protocol_version = "HTTP/1.1"  # Keep-alive, so pooled sessions can reuse their connections
+
+    def do_GET(self):
+        settings = self.server.settings
+        settings["requests"] = settings["requests"] + 1
+        if settings["delay"]:
+            time.sleep(settings["delay"])  # Pretend to be a slow origin
+        if settings["stray_304"]:
+            # Misbehave like a proxy that mixes up its clients: 304 Not Modified to a client that has nothing saved
+            settings["stray_304"] = settings["stray_304"] - 1
+            self.send_response(304)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        page = settings["pages"].get(self.path)
+        if page is None:
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        body, content_type, etag, last_modified = page
+        # Conditional GET: the client already has this version, so only send the headers back
+        if self.headers.get("If-None-Match") == etag:
+            settings["not_modified"] = settings["not_modified"] + 1
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", last_modified)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # Keep the console quiet while benchmarks run
+
+
+def make_page(body, content_type="application/json"):
+    """
+    Build a page the stand-in server can serve.
+    :param body: A dictionary/list (sent as JSON), a string, or bytes.
+    :param content_type: Content-Type header of the page.
+    :return: A tuple of (body bytes, content type, ETag, Last-Modified).
+    """
+    if isinstance(body, (dict, list)):
+        body = json.dumps(body)
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+    etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+    return body, content_type, etag, email.utils.formatdate(usegmt=True)
+
+
+def start_stand_in_server(pages, delay=0.0):
+    """
+    Start the stand-in server on a free local port in a background thread.
+    :param pages: Dictionary of path -> body (ex: {"/ingredients.json": {...}}).
+    :param delay: Seconds to wait before answering each request.
+    :return: A tuple of (server, base URL). Use server.settings to change pages or delay while it runs, or set
+             server.settings["stray_304"] to answer that many of the next requests with a 304 no matter what.
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    server.daemon_threads = True
+    server.settings = {
+        "pages": {path: make_page(body) for path, body in pages.items()},
+        "delay": delay,
+        "requests": 0,
+        "not_modified": 0,
+        "stray_304": 0,
+    }
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def stop_stand_in_server(server):
+    """
+    Stop the stand-in server and free its port.
+    :param server: The server returned by start_stand_in_server().
+    """
+    server.shutdown()
+    server.server_close()
@@ -0,0 +1,167 @@
+"""
+Author: Lavell McGrone
+Date: 2026-10-18
+Description: Time-to-first-prompt for every interactive entry point: the pizza ordering program and the Week 12
+             scrapers. Each program is started in a fresh Python process with -X importtime, and the clock stops when
+             its first prompt shows up on the screen. The import times written by -X importtime show how much of that
+             was spent importing, and which heavy modules (requests, bs4, pyinputplus) were loaded before the prompt.
+             Every program runs twice: as it is now (heavy modules loaded on first use) and with the heavy modules
+             imported up front, the way the programs used to start.
+             The ordering program runs in a temporary folder with a fresh copy of the catalog in its catalog cache,
+             like a kiosk that was used a few minutes ago, so it never needs the network before the first prompt.
+
+Usage:       python startup_benchmark.py [--runs 5]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import catalog_cache
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+REPO = os.path.dirname(HERE)
+HEAVY_MODULES = ("requests", "bs4", "pyinputplus")
+# A module loaded by lazy_import() gets no -X importtime line of its own, only the modules it imports do,
+# so each heavy module is recognized by one of its own dependencies.
+LOADED_MARKERS = {"requests": "urllib3", "bs4": "bs4", "pyinputplus": "pysimplevalidate"}
+PROMPT_TIMEOUT = 30  # Seconds to wait for a first prompt before giving up on a program
+
+# Entry point name -> (script path, text of its first prompt, heavy modules it used to import at start up)
+ENTRY_POINTS = {
+    "Final_project.py": (os.path.join(HERE, "Final_project.py"), "Choose an option:", ("pyinputplus", "requests")),
+    "data_download.py": (os.path.join(REPO, "Week12", "data_download.py"), "Enter the URL of the webpage",
+                         HEAVY_MODULES),
+    "weather_data.py": (os.path.join(REPO, "Week12", "weather_data.py"), "Enter the URL for the weather forecast",
+                        HEAVY_MODULES),
+    "weather_data_revised.py": (os.path.join(REPO, "Week12", "weather_data_revised.py"),
+                                "Enter the URL for the weather forecast", HEAVY_MODULES),
+}
+
+
+def seed_catalog_cache(folder):
+    """
+    Put a fresh copy of ingredients.json in the catalog cache of a folder, as if it was downloaded a moment ago.
+    :param folder: Folder the ordering program runs in.
+    """
+    from Final_project import INGREDIENTS_URL  # Cheap now: its heavy modules load on first use
+
+    with open(os.path.join(HERE, "ingredients.json"), "rb") as file:
+        body = file.read()
+    json.loads(body)  # Make sure it is a valid catalog before saving it
+    catalog_cache.save_cache(os.path.join(folder, catalog_cache.CACHE_DIR), INGREDIENTS_URL, body,
+                             {"url": INGREDIENTS_URL, "checked_at": time.time()})
+
+
+def read_import_times(stderr_text):
+    """
+    :param stderr_text: What -X importtime wrote, one line per import: "import time: self | cumulative | name".
+    :return: A tuple of (total import microseconds, set of top level module names that were imported).
+    """
+    total = 0
+    imported = set()
+    for line in stderr_text.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        unused_self, cumulative, name = line[len("import time:"):].split("|")
+        if not name.startswith("  "):  # Nested imports are already part of their parent's cumulative time
+            total = total + int(cumulative)
+        imported.add(name.strip().split(".")[0])
+    return total, imported
+
+
+def time_to_first_prompt(script, prompt, folder, preload=()):
+    """
+    Start a program and wait for its first prompt.
+    :param script: Path of the program.
+    :param prompt: Text of the first prompt.
+    :param folder: Folder to run the program in.
+    :param preload: Modules to import before the program starts (the old, eager start up).
+    :return: A tuple of (seconds until the prompt, import microseconds, set of imported module names).
+    :raises RuntimeError: If the prompt doesn't show up.
+    """
+    code = "".join(f"import {name}\n" for name in preload)
+    code = code + f"import runpy\nrunpy.run_path({script!r}, run_name='__main__')\n"
+    environment = dict(os.environ, PYTHONUNBUFFERED="1", PYTHONPATH=os.path.dirname(script))
+    start_time = time.perf_counter()
+    process = subprocess.Popen([sys.executable, "-X", "importtime", "-c", code], cwd=folder, env=environment,
+                               stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    stderr_chunks = []
+    stderr_reader = threading.Thread(target=lambda: stderr_chunks.append(process.stderr.read()))
+    stderr_reader.start()
+
+    output = b""
+    prompt_seconds = None
+    timer = threading.Timer(PROMPT_TIMEOUT, process.kill)  # A program that never prompts can't hang the benchmark
+    timer.start()
+    try:
+        while prompt_seconds is None:
+            chunk = process.stdout.read1(4096)
+            if not chunk:
+                break  # The program ended (or was killed) without prompting
+            output = output + chunk
+            if prompt.encode("utf-8") in output:
+                prompt_seconds = time.perf_counter() - start_time
+    finally:
+        timer.cancel()
+        process.kill()
+        process.wait()
+        stderr_reader.join()
+        process.stdout.close()
+        process.stderr.close()
+        process.stdin.close()
+    if prompt_seconds is None:
+        raise RuntimeError(f"{os.path.basename(script)} never showed {prompt!r}: {output[-300:]!r}")
+    import_us, imported = read_import_times(stderr_chunks[0].decode("utf-8", errors="replace"))
+    return prompt_seconds, import_us, imported
+
+
+def run_benchmark(runs=5):
+    """
+    Measure every entry point with eager and with on-demand imports, and display the medians.
+    :param runs: Starts per entry point and mode.
+    """
+    print(f"\n{'Time to First Prompt (median of ' + str(runs) + ' starts, milliseconds)':^96}")
+    print("=" * 96)
+    print(f"{'Entry point':<26}{'Eager':>10}{'On demand':>12}{'Saved':>10}{'Imports eager':>16}{'Imports now':>14}"
+          f"  Heavy before prompt")
+    print("-" * 96)
+    with tempfile.TemporaryDirectory() as folder:
+        seed_catalog_cache(folder)
+        for name, (script, prompt, used_to_import) in ENTRY_POINTS.items():
+            results = {}
+            for mode, preload in (("eager", used_to_import), ("lazy", ())):
+                timings = []
+                import_times = []
+                imported = set()
+                for unused_value in range(runs):
+                    seconds, import_us, imported = time_to_first_prompt(script, prompt, folder, preload)
+                    timings.append(seconds)
+                    import_times.append(import_us)
+                timings.sort()
+                import_times.sort()
+                results[mode] = (timings[len(timings) // 2] * 1000, import_times[len(import_times) // 2] / 1000,
+                                 imported)
+            eager_ms, eager_import_ms, unused_value = results["eager"]
+            lazy_ms, lazy_import_ms, imported = results["lazy"]
+            heavy = ", ".join(module for module in HEAVY_MODULES if LOADED_MARKERS[module] in imported) or "none"
+            print(f"{name:<26}{eager_ms:>10.1f}{lazy_ms:>12.1f}{eager_ms - lazy_ms:>10.1f}{eager_import_ms:>16.1f}"
+                  f"{lazy_import_ms:>14.1f}  {heavy}")
+    print("=" * 96)
+    print("Eager imports the heavy modules each program used to import at the top, before running it.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure time-to-first-prompt of every interactive entry point.")
+    parser.add_argument("--runs", type=int, default=5, help="starts per entry point and mode")
+    args = parser.parse_args()
+    run_benchmark(args.runs)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+"""
+Author: Lavell McGrone
+Date: 2026-10-18
+Description: Load the ingredients.json catalogs of many storefronts at the same time and merge them into one catalog
+             that is indexed by store. load_ingredients() in Final_project.py loads one URL and waits for it, so
+             loading 500 stores one after another takes 500 round trips. Here a pool of threads downloads the
+             catalogs in parallel over one pooled requests.Session, with a limit on how many requests go to the same
+             host at once and a timeout on every request. Every catalog is checked against the base_options/toppings
+             layout before it is used; a store whose catalog is missing or broken is reported instead of stopping the
+             others.
+
+Usage:       python store_catalogs.py load stores.json [--output merged_catalog.json]
+             python store_catalogs.py benchmark [--stores 500]
+             stores.json maps a store ID to its catalog URL: {"downtown": "https://.../ingredients.json", ...}
+"""
+
+import argparse
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from catalog_cache import REQUEST_TIMEOUT
+
+MAX_WORKERS = 64  # Catalogs downloaded at the same time
+PER_HOST_LIMIT = 8  # Requests to one host at the same time, so one server is never flooded
+
+
+def make_session(per_host=PER_HOST_LIMIT):
+    """
+    :param per_host: Connections kept open per host.
+    :return: A requests.Session with a connection pool big enough for per_host requests per host.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=MAX_WORKERS, pool_maxsize=per_host)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def validate_catalog(catalog):
+    """
+    Check that a catalog has the layout Final_project.py expects.
+    :param catalog: The downloaded catalog.
+    :return: A list of problems; an empty list means the catalog is valid.
+    """
+    if not isinstance(catalog, dict):
+        return ["the catalog is not a JSON object"]
+    problems = []
+    base_options = catalog.get("base_options", [])
+    toppings = catalog.get("toppings", {})
+    if not base_options and not toppings:
+        problems.append("base_options and toppings are both missing")
+    if not isinstance(base_options, list):
+        problems.append("base_options is not a list")
+        base_options = []
+    for number, option in enumerate(base_options, start=1):
+        if not isinstance(option, dict) or not isinstance(option.get("category"), str):
+            problems.append(f"base option #{number} has no category")
+        elif not isinstance(option.get("options"), dict) or not option["options"]:
+            problems.append(f"{option['category']} has no options")
+        else:
+            problems.extend(f"{option['category']} option {name!r} has an invalid price"
+                            for name, price in option["options"].items() if not valid_price(price))
+    if not isinstance(toppings, dict):
+        problems.append("toppings is not an object")
+    else:
+        problems.extend(f"topping {name!r} has an invalid price"
+                        for name, price in toppings.items() if not valid_price(price))
+    return problems
+
+
+def valid_price(price):
+    """
+    :param price: A price from a catalog.
+    :return: True if it is a number that is 0 or more.
+    """
+    return isinstance(price, (int, float)) and not isinstance(price, bool) and price >= 0
+
+
+def fetch_catalog(session, host_limits, url, timeout):
+    """
+    Download one catalog, waiting for a free slot on its host first.
+    :param session: The pooled session.
+    :param host_limits: Dictionary of host -> semaphore, shared by every thread.
+    :param url: URL of the catalog.
+    :param timeout: Timeout for the request.
+    :return: The catalog dictionary.
+    :raises requests.RequestException: If the download fails.
+    :raises ValueError: If the response is not JSON.
+    """
+    with host_limits[urlsplit(url).netloc]:
+        response = session.get(url, timeout=timeout)
+        response.raise_for_status()
+        return response.json()
+
+
+def load_store_catalogs(stores, per_host=PER_HOST_LIMIT, timeout=REQUEST_TIMEOUT, workers=MAX_WORKERS):
+    """
+    Download and check every store's catalog in parallel.
+    :param stores: Dictionary of store ID -> catalog URL.
+    :param per_host: Requests to one host at the same time.
+    :param timeout: Timeout for each request.
+    :param workers: Catalogs downloaded at the same time.
+    :return: A tuple of (dictionary of store ID -> valid catalog, dictionary of store ID -> error message).
+    """
+    host_limits = {urlsplit(url).netloc: threading.BoundedSemaphore(per_host) for url in stores.values()}
+    session = make_session(per_host)
+    catalogs = {}
+    errors = {}
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(stores)))) as pool:
+            futures = {store_id: pool.submit(fetch_catalog, session, host_limits, url, timeout)
+                       for store_id, url in stores.items()}
+            for store_id, future in futures.items():
+                try:
+                    catalog = future.result()
+                except (requests.RequestException, ValueError) as e:
+                    errors[store_id] = f"Unable to load the catalog: {e}"
+                    continue
+                problems = validate_catalog(catalog)
+                if problems:
+                    errors[store_id] = "Invalid catalog: " + "; ".join(problems)
+                else:
+                    catalogs[store_id] = catalog
+    finally:
+        session.close()
+    return catalogs, errors
+
+
+def merge_catalogs(catalogs):
+    """
+    Build one catalog indexed by store, plus an index of every item across the stores.
+    :param catalogs: Dictionary of store ID -> valid catalog.
+    :return: The merged catalog: {"stores": {store ID: {"base_options", "toppings"}},
+             "items": {"Crust|Thin": {store ID: price, ...}, ...}}.
+    """
+    items = {}
+    for store_id, catalog in catalogs.items():
+        for option in catalog.get("base_options", []):
+            for name, price in option["options"].items():
+                items.setdefault(option["category"].capitalize() + "|" + name, {})[store_id] = price
+        for name, price in catalog.get("toppings", {}).items():
+            items.setdefault("Topping|" + name, {})[store_id] = price
+    stores = {store_id: {"base_options": catalog.get("base_options", []), "toppings": catalog.get("toppings", {})}
+              for store_id, catalog in catalogs.items()}
+    return {"stores": stores, "items": items}
+
+
+def store_menu(merged, store_id):
+    """
+    :param merged: The merged catalog.
+    :param store_id: A store ID.
+    :return: That store's base options and toppings, ready for display_menu() and get_pizza_ingredients().
+    :raises KeyError: If the store has no valid catalog.
+    """
+    store = merged["stores"][store_id]
+    return store["base_options"], store["toppings"]
+
+
+def run_benchmark(store_count=500, delay=0.02, hosts=20):
+    """
+    Serve store_count catalogs from local stand-in servers (each answer takes delay seconds) and compare loading
+    them one after another with loading them in parallel, for a growing number of stores.
+    :param store_count: Largest number of stores.
+    :param delay: Seconds each stand-in server waits before answering.
+    :param hosts: Number of stand-in servers (hosts) the stores are spread over.
+    """
+    from stand_in_server import start_stand_in_server, stop_stand_in_server
+
+    with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), "ingredients.json"), "r") as file:
+        catalog = json.load(file)
+
+    servers = []
+    stores = {}
+    for host_number in range(hosts):
+        pages = {}
+        for store_number in range(host_number, store_count, hosts):
+            store_catalog = json.loads(json.dumps(catalog))
+            store_catalog["toppings"]["Pepperoni"] = round(2.0 + store_number / 100, 2)  # Each store prices its own
+            pages[f"/store/{store_number}/ingredients.json"] = store_catalog
+        server, base_url = start_stand_in_server(pages, delay)
+        servers.append(server)
+        for path in pages:
+            stores[f"store-{path.split('/')[2]}"] = base_url + path
+    stores["broken"] = base_url + "/missing/ingredients.json"  # One store whose catalog is missing
+
+    print(f"\n{'Multi-Store Catalog Loading':^70}")
+    print("=" * 70)
+    print(f"{'Stores':>8}{'One at a time (s)':>22}{'Parallel (s)':>16}{'Loaded':>10}{'Errors':>10}")
+    print("-" * 70)
+    try:
+        for count in sorted({10, 50, 100, store_count}):
+            subset = dict(list(stores.items())[:count])
+            subset["broken"] = stores["broken"]
+            sequential = ""
+            if count <= 50:  # Going one at a time grows with every store, so only measure the small sizes
+                start_time = time.perf_counter()
+                load_store_catalogs(subset, workers=1)
+                sequential = f"{time.perf_counter() - start_time:.2f}"
+            start_time = time.perf_counter()
+            catalogs, errors = load_store_catalogs(subset)
+            merged = merge_catalogs(catalogs)
+            parallel_seconds = time.perf_counter() - start_time
+            print(f"{count:>8,}{sequential:>22}{parallel_seconds:>16.2f}{len(merged['stores']):>10,}"
+                  f"{len(errors):>10,}")
+    finally:
+        for server in servers:
+            stop_stand_in_server(server)
+    print("=" * 70)
+    print(f"{hosts} stand-in hosts answering in {delay * 1000:.0f} ms, "
+          f"up to {PER_HOST_LIMIT} requests per host and {MAX_WORKERS} at once.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load and merge the catalogs of many stores in parallel.")
+    parser.add_argument("command", choices=["load", "benchmark"])
+    parser.add_argument("stores", nargs="?", help="JSON file of store ID -> catalog URL (for load)")
+    parser.add_argument("--output", help="file to save the merged catalog to")
+    parser.add_argument("--stores", dest="store_count", type=int, default=500,
+                        help="stores served by the benchmark")
+    args = parser.parse_args()
+
+    if args.command == "benchmark":
+        run_benchmark(args.store_count)
+        return
+    if not args.stores:
+        parser.error("load needs a stores file")
+
+    with open(args.stores, "r") as file:
+        stores = json.load(file)
+    start_time = time.perf_counter()
+    catalogs, errors = load_store_catalogs(stores)
+    merged = merge_catalogs(catalogs)
+    print(f"Loaded {len(catalogs):,} of {len(stores):,} store catalogs in {time.perf_counter() - start_time:.2f} s.")
+    for store_id, error in errors.items():
+        print(f"Error: {store_id}: {error}")
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(merged, file, indent=2)
+        print(f"Merged catalog saved to '{args.output}'.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+"""
+Author: Lavell McGrone
+Date: 2026-10-18
+Description: Batch tax and tip engine for end-of-day reconciliation. Final_project.py works out tax and tip for one
+             order at a time, always at 7%. This module takes whole columns of subtotals, rate IDs and tip percentages
+             and works out tax, total with tax, tip and final total for all of them in one pass. The tax rates come
+             from a rate table file (tax_rates.json) with a state, county and city part for every jurisdiction, and the
+             file is read and compiled once, then reused until it changes on disk.
+             The rounding steps are exactly the ones calculate_order_tax() and calculate_total_with_tip() use, so
+             every result agrees to the cent with the single-order functions.
+
+Usage:       python tax_engine.py check [--count 1000000]
+             python tax_engine.py reconcile [--journal order_journal] [--rates tax_rates.json]
+"""
+
+import argparse
+import json
+import os
+import random
+import time
+from array import array
+
+import order_journal
+
+DEFAULT_RATE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tax_rates.json")
+
+rate_table_cache = {}  # Rate file path -> (modified time, compiled rate table)
+
+
+def load_rate_table(path=DEFAULT_RATE_FILE):
+    """
+    Read and compile a rate table file. The compiled table is cached and only read again if the file changes.
+    :param path: Path of the rate table file.
+    :return: A dictionary with the rate IDs, a lookup from rate ID to position, and the combined rates.
+    """
+    modified = os.path.getmtime(path)
+    cached = rate_table_cache.get(path)
+    if cached is not None and cached[0] == modified:
+        return cached[1]
+
+    with open(path, "r") as file:
+        data = json.load(file)
+    ids = list(data["jurisdictions"].keys())
+    table = {
+        "ids": ids,
+        "positions": {rate_id: position for position, rate_id in enumerate(ids)},
+        # The combined rate of a jurisdiction is its state + county + city rate
+        "rates": array("d", (sum(data["jurisdictions"][rate_id].get(part, 0) for part in ("state", "county", "city"))
+                             for rate_id in ids)),
+        "default": data.get("default", ids[0]),
+    }
+    rate_table_cache[path] = (modified, table)
+    return table
+
+
+def rate_positions(table, rate_ids):
+    """
+    Turn rate IDs into positions in the compiled table once, so the batch loop only indexes an array.
+    :param table: The compiled rate table.
+    :param rate_ids: List of rate IDs (None means the default rate).
+    :return: An array of positions.
+    :raises KeyError: If a rate ID is not in the table.
+    """
+    positions = table["positions"]
+    default = positions[table["default"]]
+    return array("i", (default if rate_id is None else positions[rate_id] for rate_id in rate_ids))
+
+
+def compute_batch(subtotals, rate_ids, tip_percentages=None, table=None):
+    """
+    Work out tax, total with tax, tip and final total for a whole batch of orders in one pass.
+    :param subtotals: List of order subtotals (sum of the pizza costs) in dollars.
+    :param rate_ids: List of rate IDs, one per order (None means the default rate).
+    :param tip_percentages: List of tip percentages like 0.20, one per order (optional, default is no tip).
+    :param table: Compiled rate table (optional, default is tax_rates.json).
+    :return: A dictionary of arrays: "tax", "total_with_tax", "tip" and "final_total".
+    """
+    table = table or load_rate_table()
+    rates = table["rates"]
+    positions = rate_positions(table, rate_ids)
+    if tip_percentages is None:
+        tip_percentages = [0.0] * len(subtotals)
+
+    taxes = array("d", bytes(8 * len(subtotals)))
+    totals_with_tax = array("d", taxes)
+    tips = array("d", taxes)
+    finals = array("d", taxes)
+    for i, (subtotal, position, tip_percentage) in enumerate(zip(subtotals, positions, tip_percentages)):
+        # Same steps as calculate_order_tax()
+        tax = round(subtotal * rates[position], 2)
+        total_with_tax = round(subtotal + tax, 2)
+        # Same steps as calculate_total_with_tip() and main()
+        tip = round(total_with_tax * tip_percentage, 2)
+        taxes[i] = tax
+        totals_with_tax[i] = total_with_tax
+        tips[i] = tip
+        finals[i] = round(total_with_tax + tip, 2)
+    return {"tax": taxes, "total_with_tax": totals_with_tax, "tip": tips, "final_total": finals}
+
+
+def run_check(count=1_000_000):
+    """
+    Compare the batch engine with the single-order functions in Final_project.py for random orders at 7%.
+    :param count: How many random orders to compare.
+    """
+    import Final_project
+
+    random.seed(1150)
+    tip_values = list(Final_project.TIP_CHOICES.values())
+    subtotals = [round(random.uniform(6.5, 300), 2) for unused_value in range(count)]
+    tips = [random.choice(tip_values) for unused_value in range(count)]
+
+    start_time = time.perf_counter()
+    batch = compute_batch(subtotals, [None] * count, tips)
+    batch_seconds = time.perf_counter() - start_time
+
+    mismatches = 0
+    start_time = time.perf_counter()
+    for i, (subtotal, tip_percentage) in enumerate(zip(subtotals, tips)):
+        tax_amount, total_with_tax = Final_project.calculate_order_tax(subtotal)
+        tip_amount = round(total_with_tax * tip_percentage, 2)
+        final_total = round(total_with_tax + tip_amount, 2)
+        if (tax_amount, total_with_tax, tip_amount, final_total) != (
+                batch["tax"][i], batch["total_with_tax"][i], batch["tip"][i], batch["final_total"][i]):
+            mismatches = mismatches + 1
+    single_seconds = time.perf_counter() - start_time
+
+    print(f"\n{'Tax and Tip Engine Check':^60}")
+    print("=" * 60)
+    print(f"{'Orders compared':<40}{count:>20,}")
+    print(f"{'Batch engine (orders/sec)':<40}{count / batch_seconds:>20,.0f}")
+    print(f"{'Single-order functions (orders/sec)':<40}{count / single_seconds:>20,.0f}")
+    print(f"{'Orders that differ':<40}{mismatches:>20,}")
+    print("=" * 60)
+
+
+def run_reconcile(journal_dir, rate_file):
+    """
+    Recompute the tax of every saved order under every jurisdiction in the rate table and display the totals.
+    :param journal_dir: Folder that holds the order journal.
+    :param rate_file: Path of the rate table file.
+    """
+    table = load_rate_table(rate_file)
+    subtotals = []
+    tip_percentages = []
+    saved_tax = 0
+    journal = order_journal.open_journal(journal_dir, read_only=True)
+    try:
+        for unused_number, order_data in order_journal.iter_orders(journal):
+            # Tax is worked out after the promotions are taken off, the same as in Final_project.py
+            subtotal = sum(pizza["subtotal"] for pizza in order_data.get("pizzas", []))
+            subtotal = round(subtotal - sum(promotion["discount"] for promotion in order_data.get("promotions", [])), 2)
+            total_with_tax = round(subtotal + order_data.get("tax_amount", 0), 2)
+            subtotals.append(subtotal)
+            # Tips are saved as an amount, so work the percentage back out from the saved totals
+            tip_percentages.append(order_data.get("tip_amount", 0) / total_with_tax if total_with_tax else 0)
+            saved_tax = saved_tax + order_data.get("tax_amount", 0)
+    finally:
+        order_journal.close_journal(journal)
+
+    print(f"\n{'Tax Reconciliation':^70}")
+    print("=" * 70)
+    print(f"{'Orders':<30}{len(subtotals):>40,}")
+    print(f"{'Tax saved with the orders':<30}${saved_tax:>39,.2f}")
+    print("-" * 70)
+    print(f"{'Jurisdiction':<24}{'Rate':>10}{'Tax':>18}{'Final totals':>18}")
+    for rate_id, rate in zip(table["ids"], table["rates"]):
+        batch = compute_batch(subtotals, [rate_id] * len(subtotals), tip_percentages, table)
+        print(f"{rate_id:<24}{rate * 100:>9.3f}%{sum(batch['tax']):>18,.2f}{sum(batch['final_total']):>18,.2f}")
+    print("=" * 70)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch tax and tip engine with jurisdiction rate tables.")
+    parser.add_argument("command", choices=["check", "reconcile"])
+    parser.add_argument("--count", type=int, default=1_000_000, help="random orders compared by check")
+    parser.add_argument("--journal", default=order_journal.DEFAULT_JOURNAL_DIR, help="order journal folder")
+    parser.add_argument("--rates", default=DEFAULT_RATE_FILE, help="rate table file")
+    args = parser.parse_args()
+
+    if args.command == "check":
+        run_check(args.count)
+    elif not os.path.isdir(args.journal):
+        print(f"Error: No order journal found in '{args.journal}'. Please place an order first.")
+    else:
+        run_reconcile(args.journal, args.rates)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Author: Lavell McGrone
+Date: 2026-10-18
+Description: Tests of binary_orders.py: orders written to a binary order file read back exactly as they were saved.
+
+Usage:       python -m pytest test_binary_orders.py
+"""
+
+import os
+
+import pytest
+
+import binary_orders
+
+ORDER = {
+    "pizzas": [
+        {"ingredients": [["Crust", "Thin", 10.99], ["Sauce", "Marinara", 1.5], ["Topping", "Pepperoni", 2.0]],
+         "subtotal": 14.49},
+        {"ingredients": [["Crust", "Deep dish", 12.99], ["Cheese", "vegan", 3.0]], "subtotal": 15.99},
+    ],
+    "tax_amount": 1.82, "tip_amount": 2.0, "final_total": 31.3, "placed_at": "2026-10-18T12:30:00",
+    "customer": "Maria",
+    "promotions": [{"name": "Two Pizza Deal", "pizzas": [1, 2], "discount": 3.0}],
+}
+
+
+def write_and_read(tmp_path, orders):
+    path = str(tmp_path / "orders.pzo")
+    binary_orders.write_binary_orders(orders, path, binary_orders.catalog_table())
+    reader = binary_orders.open_binary_orders(path)
+    try:
+        return [order_data for unused_number, order_data in binary_orders.iter_binary_orders(reader)]
+    finally:
+        binary_orders.close_binary_orders(reader)
+
+
+def test_customer_and_promotions_round_trip(tmp_path):
+    plain = {key: value for key, value in ORDER.items() if key not in ("customer", "promotions")}
+    other = dict(ORDER, customer="Sam")
+    assert write_and_read(tmp_path, [ORDER, plain, other, ORDER]) == [ORDER, plain, other, ORDER]
+
+
+def test_orders_are_read_by_number(tmp_path):
+    path = str(tmp_path / "orders.pzo")
+    binary_orders.write_binary_orders([dict(ORDER, customer=f"Customer {number}") for number in range(1, 6)], path)
+    reader = binary_orders.open_binary_orders(path)
+    try:
+        assert binary_orders.read_binary_order(reader, 4)["customer"] == "Customer 4"
+        assert binary_orders.read_order_totals(reader, 4) == (182, 200, 3130)
+    finally:
+        binary_orders.close_binary_orders(reader)
+
+
+def test_unknown_fields_are_refused(tmp_path):
+    path = str(tmp_path / "orders.pzo")
+    with pytest.raises(ValueError):
+        binary_orders.write_binary_orders([ORDER, dict(ORDER, table_number=7)], path)
+    assert os.listdir(tmp_path) == []  # Not even a half written file
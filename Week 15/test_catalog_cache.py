@@ -0,0 +1,99 @@
+"""
+Author: Lavell McGrone
+Date: 2026-10-18
+Description: Tests of catalog_cache.py against the local stand-in server (stand_in_server.py). No internet needed.
+
+Usage:       python -m pytest test_catalog_cache.py
+"""
+
+import os
+
+import pytest
+
+import catalog_cache
+from stand_in_server import make_page, start_stand_in_server, stop_stand_in_server
+
+CATALOG = {"base_options": {"Thin crust": 8.5}, "toppings": {"Pepperoni": 1.25, "Onion": 0.5}}
+
+
+@pytest.fixture
+def server():
+    catalog_cache.session = None  # No connections kept alive from another test
+    server, base_url = start_stand_in_server({"/ingredients.json": CATALOG})
+    yield server, base_url + "/ingredients.json"
+    stop_stand_in_server(server)
+    catalog_cache.session = None
+
+
+def test_fresh_copy_is_used_without_the_network(server, tmp_path):
+    server, url = server
+    assert catalog_cache.load_catalog(url, str(tmp_path)) == CATALOG
+    assert catalog_cache.load_catalog(url, str(tmp_path)) == CATALOG
+    assert server.settings["requests"] == 1
+
+
+def test_old_copy_is_revalidated_with_304(server, tmp_path):
+    server, url = server
+    catalog_cache.load_catalog(url, str(tmp_path))
+    unused_value, meta = catalog_cache.read_cache(str(tmp_path), url)
+
+    assert catalog_cache.load_catalog(url, str(tmp_path), ttl=0) == CATALOG
+    assert server.settings["requests"] == 2
+    assert server.settings["not_modified"] == 1
+    unused_value, new_meta = catalog_cache.read_cache(str(tmp_path), url)
+    assert new_meta["etag"] == meta["etag"]
+    assert new_meta["checked_at"] >= meta["checked_at"]
+
+
+def test_changed_catalog_is_downloaded_again(server, tmp_path):
+    server, url = server
+    catalog_cache.load_catalog(url, str(tmp_path))
+    changed = dict(CATALOG, toppings={"Pepperoni": 1.5})
+    server.settings["pages"]["/ingredients.json"] = make_page(changed)
+
+    assert catalog_cache.load_catalog(url, str(tmp_path), ttl=0) == changed
+    assert catalog_cache.load_catalog(url, str(tmp_path)) == changed
+
+
+def test_stale_copy_is_used_when_the_server_is_down(server, tmp_path, capsys):
+    server, url = server
+    catalog_cache.load_catalog(url, str(tmp_path))
+    stop_stand_in_server(server)
+    catalog_cache.session = None  # Drop the kept-alive connection, so the server really looks down
+
+    assert catalog_cache.load_catalog(url, str(tmp_path), ttl=0) == CATALOG
+    assert "Using the saved copy" in capsys.readouterr().out
+
+
+def test_server_down_and_nothing_saved_raises(server, tmp_path):
+    server, url = server
+    stop_stand_in_server(server)
+    with pytest.raises(catalog_cache.requests.RequestException):
+        catalog_cache.load_catalog(url, str(tmp_path))
+
+
+@pytest.mark.parametrize("broken_file", [0, 1])  # The catalog, or its metadata
+def test_corrupt_cache_file_is_downloaded_again(server, tmp_path, broken_file):
+    server, url = server
+    catalog_cache.load_catalog(url, str(tmp_path))
+    with open(catalog_cache.cache_paths(str(tmp_path), url)[broken_file], "wb") as file:
+        file.write(b'{"base_options": {"Thin cr')  # Cut off in the middle
+
+    assert catalog_cache.load_catalog(url, str(tmp_path)) == CATALOG
+    assert server.settings["requests"] == 2
+    assert catalog_cache.read_cache(str(tmp_path), url)[0] == CATALOG  # Saved again in one piece
+
+
+def test_304_without_a_saved_copy_downloads_the_catalog(server, tmp_path):
+    server, url = server
+    server.settings["stray_304"] = 1
+    assert catalog_cache.load_catalog(url, str(tmp_path)) == CATALOG
+    assert server.settings["requests"] == 2
+    assert os.path.exists(catalog_cache.cache_paths(str(tmp_path), url)[0])
+
+
+def test_only_304_without_a_saved_copy_raises(server, tmp_path):
+    server, url = server
+    server.settings["stray_304"] = 2
+    with pytest.raises(catalog_cache.requests.HTTPError):
+        catalog_cache.load_catalog(url, str(tmp_path))
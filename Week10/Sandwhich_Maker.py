@@ -4,18 +4,104 @@ Author: Lavell McGrone
 Date: 2024-11-14
 Description: Utilize pyinputplus to calculate the total cost of a custom sandwich order by gathering
 ingredient choices, building sandwiches, and display an order summary, based on user input.
+The menu and its prices are loaded from sandwich_catalog.json, so changing the menu never means changing the code.
+Sandwiches that were priced before are remembered (see price_sandwich), because a few favorites make up most orders.
 """
 
+import hashlib   # Importing hashlib to tell when the catalog changed
+import json   # Importing json to read the sandwich catalog file
+import os     # Importing os to find the catalog file next to this program
+from functools import lru_cache   # Importing lru_cache to remember priced sandwiches
+
 import pyinputplus as pyip   # Importing PyInputPlus for input validation
 
+# The catalog file lives in the same folder as this program
+CATALOG_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sandwich_catalog.json")
+
+
+def load_prices(path=CATALOG_FILE):
+    """
+    Load the sandwich menu from the catalog file.
+    :param path: Path of the catalog file.
+    :return: Dictionary of category ("bread", "protein", "cheese", "extras") -> {ingredient: price}.
+             The menus show the ingredients in the same order as the file.
+    """
+    with open(path, "r") as file:
+        return json.load(file)
 
-# Prices dictionary for ingredients
-PRICES = {
-    "bread": {"white": 1.95, "wheat": 2.00, "sourdough": 2.25},
-    "protein": {"chicken": 2.75, "turkey": 2.50, "ham": 2.50, "tofu": 2.00},
-    "cheese": {"cheddar": 1.00, "swiss": 1.25, "mozzarella": 1.25},
-    "extras": {"mayo": 0.10, "mustard": 0.05, "lettuce": 0.50, "tomato": 0.75},
-}
+
+# Prices dictionary for ingredients, loaded once when the program starts
+PRICES = load_prices()
+MAX_SANDWICHES = 1024   # Most sandwich configurations remembered; the least recently used one is dropped after that
+
+
+def prices_fingerprint(prices):
+    """
+    :param prices: A sandwich catalog.
+    :return: A short hash that changes whenever any ingredient or price changes.
+    """
+    return hashlib.sha1(json.dumps(prices, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+# The catalog the remembered sandwiches were priced from
+priced_catalog = {"fingerprint": prices_fingerprint(PRICES)}
+
+
+def use_prices(prices):
+    """
+    Make the program price sandwiches from this catalog. If it differs from the catalog the remembered sandwiches
+    were priced from, they are thrown away. The same catalog with prices changed in place counts as different too.
+    :param prices: The sandwich catalog (PRICES itself, after changing it, is fine).
+    """
+    global PRICES
+    fingerprint = prices_fingerprint(prices)
+    if fingerprint != priced_catalog["fingerprint"]:
+        priced_catalog["fingerprint"] = fingerprint
+        price_sandwich.cache_clear()
+    PRICES = prices
+
+
+def sandwich_key(bread, protein, cheese, extras):
+    """
+    Build the canonical key of a sandwich. The extras are sorted, so the order they were picked in doesn't matter.
+    :param bread: Chosen bread.
+    :param protein: Chosen protein.
+    :param cheese: Chosen cheese, or None for no cheese.
+    :param extras: Chosen extras, in any order.
+    :return: The key, ex: ("wheat", "turkey", "cheddar", ("lettuce",)).
+    """
+    return bread, protein, cheese or "", tuple(sorted(set(extras)))
+
+
+@lru_cache(maxsize=MAX_SANDWICHES)
+def price_sandwich(key):
+    """
+    Work out the ingredients and cost of a sandwich once; after that the answer is remembered (hits and misses
+    are counted by price_sandwich.cache_info()). The prices are added in the order the questions are asked:
+    bread, protein, cheese, then the extras in menu order.
+    :param key: A key from sandwich_key().
+    :return: A tuple of (ingredients tuple, sandwich cost).
+    """
+    bread, protein, cheese, extras = key
+    ingredients = [(bread, PRICES["bread"][bread]), (protein, PRICES["protein"][protein])]
+    total_cost = PRICES["bread"][bread] + PRICES["protein"][protein]
+    if cheese:
+        ingredients.append((cheese, PRICES["cheese"][cheese]))
+        total_cost = total_cost + PRICES["cheese"][cheese]
+    for extra, price in PRICES["extras"].items():
+        if extra in extras:
+            ingredients.append((extra, price))
+            total_cost = total_cost + price
+    return tuple(ingredients), total_cost
+
+
+@lru_cache(maxsize=MAX_SANDWICHES)
+def ingredient_lines(ingredients):
+    """
+    :param ingredients: A sandwich's ingredients as a tuple of (name, price) tuples.
+    :return: The ingredient lines of the order summary for this sandwich, formatted once and remembered.
+    """
+    return "".join(f"{ingredient.capitalize():<15}      $     {price:>6.2f}\n" for ingredient, price in ingredients)
 
 
 def main():
@@ -49,32 +135,18 @@ def get_sandwich_ingredients():
     It prompts the user to choose from available bread, protein, cheese, and extra options.
     """
 
-    ingredients = []   # Initialize an empty list to store chosen ingredients with their costs
-    total_cost = 0     # Initialize the total cost for the sandwich to 0
+    cheese_choice = None   # Stays None if the user doesn't want cheese
+    extras = []            # Initialize an empty list to store the chosen extras
 
     # Step 1: Ask the user to choose a type of bread
     # inputMenu() shows the options and waits for the user to pick one
     # "numbered=True" adds a number to each choice, making it easier for the user to select
-    bread_choice = pyip.inputMenu(["white", "wheat", "sourdough"], numbered=True)
-
-    # Add the bread choice and its price to our list of ingredients as a tuple (bread name, bread price)
-    # This list will help keep track of bread choices in the sandwich.
-    ingredients.append((bread_choice, PRICES["bread"][bread_choice]))
-
-    # Add the price of the chosen bread to the total cost
-    total_cost = total_cost + PRICES["bread"][bread_choice]
+    bread_choice = pyip.inputMenu(list(PRICES["bread"].keys()), numbered=True)
 
     # Step 2: Ask the user to choose a type of protein
     # inputMenu() displays protein options and lets the user select one
     # "numbered=True" adds a number to each choice, making it easier for the user to select
-    protein_choice = pyip.inputMenu(["chicken", "turkey", "ham", "tofu"], numbered=True)
-
-    # This list will keep track of protein choices in the ingredients of the sandwich
-    # Add the chosen protein to the ingredients list as a tuple (protein name, protein price)
-    ingredients.append((protein_choice, PRICES["protein"][protein_choice]))
-
-    # Add the price of the chosen protein to the total cost
-    total_cost = total_cost + PRICES["protein"][protein_choice]
+    protein_choice = pyip.inputMenu(list(PRICES["protein"].keys()), numbered=True)
 
     # Step 3: Ask the user if they want cheese
     # inputYesNo() only accepts "yes" or "no" as valid answers
@@ -82,28 +154,21 @@ def get_sandwich_ingredients():
 
         # If the user wants cheese, show a menu of cheese options to choose from
         # "numbered=True" adds a number to each choice, making it easier for the user to select
-        cheese_choice = pyip.inputMenu(["cheddar", "swiss", "mozzarella"], numbered=True)
-
-        # Add the chosen cheese to the ingredients list with its price
-        ingredients.append((cheese_choice, PRICES["cheese"][cheese_choice]))
-
-        # Add the price of the chosen cheese to the total cost (longhand notation)
-        total_cost = total_cost + PRICES["cheese"][cheese_choice]
+        cheese_choice = pyip.inputMenu(list(PRICES["cheese"].keys()), numbered=True)
 
     # Step 4: Ask the user if they want additional extras (mayo, mustard, lettuce, tomato)
     # Use a loop to ask about each extra individually
-    for extra in ["mayo", "mustard", "lettuce", "tomato"]:
+    for extra in PRICES["extras"]:
 
         # Ask the user if they want the current extra
         if pyip.inputYesNo(f"Do you want {extra}? (yes/no): ") == "yes":
+            extras.append(extra)   # If yes, remember the extra
 
-            # If yes, add the extra and its price to the ingredients list
-            ingredients.append((extra, PRICES["extras"][extra]))
-
-            # Add the price of the extra to the total cost (longhand notation)
-            total_cost = total_cost + PRICES["extras"][extra]
+    # Step 5: Look up the ingredients (name, price) and the total cost of this sandwich.
+    # The same sandwich is only worked out the first time, after that the remembered answer is used.
+    ingredients, total_cost = price_sandwich(sandwich_key(bread_choice, protein_choice, cheese_choice, extras))
 
-    return ingredients, total_cost   # Return the ingredients list and the total cost of the sandwich
+    return list(ingredients), total_cost   # Return the ingredients list and the total cost of the sandwich
 
 
 def process_order(num_sandwiches):
@@ -114,6 +179,7 @@ def process_order(num_sandwiches):
     """
     sandwiches = []        # Start with an empty list to store each sandwich's ingredients and cost.
     total_order_cost = 0   # Set the total order cost to zero initially.
+    use_prices(PRICES)     # If a price was changed since the last order, the remembered sandwiches are thrown away.
 
     # Loop through the number of sandwiches the customer wants.
     for i in range(1, num_sandwiches + 1):  # have num_sandwiches + 1, so it's user-friendly and don't start at 0.
@@ -145,10 +211,9 @@ def display_order_summary(sandwiches, total_order_cost):
     for i, (ingredients, sandwich_cost) in enumerate(sandwiches, start=1):
         print(f"\nSandwich #{i}:")   # Print the sandwich number.
 
-        # Loop through each ingredient and its price in the current sandwich.
-        for ingredient, price in ingredients:
-            # Print the ingredient name (capitalized) and its price formatted to 2 decimal places in a column.
-            print(f"{ingredient.capitalize():<15}      $     {price:>6.2f}")
+        # Print each ingredient name (capitalized) and its price formatted to 2 decimal places in a column.
+        # The lines of a sandwich are formatted once and remembered, since the same sandwiches come up again and again.
+        print(ingredient_lines(tuple(map(tuple, ingredients))), end="")
         print("-" * 40)   # Print a line separator below the list of ingredients for readability.
 
         # Print the subtotal (cost) of the current sandwich formatted to 2 decimal places in a column.
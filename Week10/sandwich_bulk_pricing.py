@@ -0,0 +1,224 @@
+"""
+Author: Lavell McGrone
+Date: 2026-10-18
+Description: Price a whole file of sandwich orders without the interactive menus. The orders are read one at a time
+             and every priced order is written out right away, so memory stays the same no matter how many orders
+             the file has. Each sandwich is priced with the catalog Sandwhich_Maker.py loads (sandwich_catalog.json),
+             adding the prices in the same order the interactive questions do (bread, protein, cheese, then the
+             extras in menu order), so every sandwich cost and order total is exactly what process_order() and
+             display_order_summary() show.
+
+Usage:       python sandwich_bulk_pricing.py orders.jsonl [--catalog sandwich_catalog.json] [--output priced.jsonl]
+             JSON Lines: one order per line, {"order": "A1", "sandwiches": [{"bread": "white", "protein": "ham",
+             "cheese": "swiss", "extras": ["mayo", "tomato"]}]}. Leave out "cheese" (or make it empty) for no cheese.
+             CSV: one sandwich per row with the columns order, bread, protein, cheese and extras (extras separated by
+             ";"). Rows next to each other with the same order ID are one order.
+"""
+
+import argparse
+import csv
+import json
+import sys
+import time
+
+import Sandwhich_Maker
+from Sandwhich_Maker import CATALOG_FILE, load_prices, price_sandwich, sandwich_key
+
+
+def split_extras(value):
+    """
+    :param value: Extras as a list, a ";" separated string, or None.
+    :return: A set of extra names in lower case.
+    """
+    if value is None:
+        return set()
+    if isinstance(value, str):
+        value = value.split(";")
+    return {str(name).strip().lower() for name in value if str(name).strip()}
+
+
+def choose(prices, category, choice):
+    """
+    :param prices: The sandwich catalog.
+    :param category: "bread", "protein" or "cheese".
+    :param choice: The name from the order.
+    :return: A tuple of (name, price), the same tuple get_sandwich_ingredients() stores.
+    :raises ValueError: If the choice is not on the menu.
+    """
+    name = str(choice).strip().lower()
+    if name not in prices[category]:
+        raise ValueError(f"'{choice}' is not a {category} option")
+    return name, prices[category][name]
+
+
+def price_sandwich_spec(spec, prices):
+    """
+    Check one sandwich against the menu and price it the same way get_sandwich_ingredients() does.
+    Sandwiches that were seen before come straight out of Sandwhich_Maker's remembered prices.
+    :param spec: Dictionary like {"bread": "white", "protein": "ham", "cheese": "swiss", "extras": ["mayo"]}.
+    :param prices: The sandwich catalog.
+    :return: A tuple of (ingredients, sandwich_cost).
+    :raises ValueError: If the bread or protein is missing, or something is not on the menu.
+    """
+    for category in ("bread", "protein"):
+        if not spec.get(category):
+            raise ValueError(f"missing a choice for '{category}'")
+    bread = choose(prices, "bread", spec["bread"])[0]
+    protein = choose(prices, "protein", spec["protein"])[0]
+    cheese = choose(prices, "cheese", spec["cheese"])[0] if spec.get("cheese") else None
+
+    extras = split_extras(spec.get("extras"))
+    unknown = extras - set(prices["extras"])
+    if unknown:
+        raise ValueError(f"'{sorted(unknown)[0]}' is not an extra")
+    # The canonical key sorts the extras, and price_sandwich() adds them in menu order like the yes/no questions
+    ingredients, total_cost = price_sandwich(sandwich_key(bread, protein, cheese, extras))
+    return list(ingredients), total_cost
+
+
+def price_order(sandwich_specs, prices):
+    """
+    Price one order the same way process_order() does.
+    :param sandwich_specs: List of sandwich dictionaries.
+    :param prices: The sandwich catalog.
+    :return: A tuple of (sandwiches, total_order_cost).
+    :raises ValueError: If the order has no sandwiches or a sandwich can't be priced.
+    """
+    if not sandwich_specs:
+        raise ValueError("the order has no sandwiches")
+    Sandwhich_Maker.use_prices(prices)  # Remembered prices always belong to the catalog the order is checked against
+    sandwiches = []
+    total_order_cost = 0
+    for number, spec in enumerate(sandwich_specs, start=1):
+        try:
+            ingredients, sandwich_cost = price_sandwich_spec(spec, prices)
+        except (ValueError, AttributeError) as e:
+            raise ValueError(f"sandwich #{number}: {e}")
+        sandwiches.append((ingredients, sandwich_cost))
+        total_order_cost = total_order_cost + sandwich_cost
+    return sandwiches, total_order_cost
+
+
+def read_orders(path):
+    """
+    Read the orders one at a time. Only the order that is being read is kept in memory.
+    :param path: A .jsonl or .csv file, or "-" for JSON Lines on standard input.
+    :return: A generator of (line number, order ID, list of sandwich dictionaries or an error message string).
+    """
+    if path.lower().endswith(".csv"):
+        yield from read_csv_orders(path)
+    elif path == "-":
+        yield from read_json_line_orders(sys.stdin)
+    else:
+        with open(path, "r") as file:
+            yield from read_json_line_orders(file)
+
+
+def read_json_line_orders(file):
+    """
+    :param file: An open text file with one JSON order per line.
+    :return: A generator of (line number, order ID, sandwiches or error message) tuples.
+    """
+    for line_number, line in enumerate(file, start=1):
+        if not line.strip():
+            continue  # Skip blank lines
+        try:
+            order = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield line_number, None, f"invalid JSON ({e})"
+            continue
+        if not isinstance(order, dict) or not isinstance(order.get("sandwiches"), list):
+            yield line_number, None, 'the order needs a "sandwiches" list'
+            continue
+        yield line_number, order.get("order", line_number), order["sandwiches"]
+
+
+def read_csv_orders(path):
+    """
+    :param path: A CSV file with one sandwich per row.
+    :return: A generator of (line number of the first row, order ID, sandwiches) tuples.
+    """
+    with open(path, "r", newline="") as file:
+        order_id = None
+        first_line = 0
+        sandwiches = []
+        for line_number, row in enumerate(csv.DictReader(file), start=2):  # Line 1 is the header
+            row = {key.strip().lower(): (value or "").strip() for key, value in row.items() if key}
+            # Without an order column every row is an order of its own
+            row_order = row.get("order") or f"line {line_number}"
+            if sandwiches and row_order != order_id:
+                yield first_line, order_id, sandwiches
+                sandwiches = []
+            if not sandwiches:
+                order_id, first_line = row_order, line_number
+            sandwiches.append(row)
+        if sandwiches:
+            yield first_line, order_id, sandwiches
+
+
+def price_orders(orders, prices):
+    """
+    :param orders: Iterable of (line number, order ID, sandwiches or error message) from read_orders().
+    :param prices: The sandwich catalog.
+    :return: A generator of result dictionaries, with either "sandwiches"/"total_order_cost" or "error".
+    """
+    for line_number, order_id, sandwich_specs in orders:
+        if isinstance(sandwich_specs, str):
+            yield {"line": line_number, "order": order_id, "error": sandwich_specs}
+            continue
+        try:
+            sandwiches, total_order_cost = price_order(sandwich_specs, prices)
+        except ValueError as e:
+            yield {"line": line_number, "order": order_id, "error": str(e)}
+            continue
+        yield {
+            "line": line_number,
+            "order": order_id,
+            "sandwiches": [{"ingredients": ingredients, "sandwich_cost": sandwich_cost}
+                           for ingredients, sandwich_cost in sandwiches],
+            "total_order_cost": total_order_cost,
+        }
+
+
+def main():
+    """
+    Command line entry point: price every order in a file and write one JSON result per line.
+    """
+    parser = argparse.ArgumentParser(description="Price sandwich orders without the interactive menus.")
+    parser.add_argument("orders", help='.jsonl or .csv file of sandwich orders ("-" for stdin)')
+    parser.add_argument("--catalog", default=CATALOG_FILE, help="sandwich catalog file")
+    parser.add_argument("--output", default="-", help='file to write priced orders to ("-" for stdout)')
+    args = parser.parse_args()
+
+    try:
+        prices = load_prices(args.catalog)
+    except (OSError, ValueError) as e:
+        print(f"Error: Unable to load the sandwich catalog. Reason: {e}", file=sys.stderr)
+        sys.exit(1)
+    Sandwhich_Maker.use_prices(prices)  # Remembered prices from another catalog are thrown away
+
+    priced = errors = 0
+    start_time = time.perf_counter()
+    output = sys.stdout if args.output == "-" else open(args.output, "w")
+    try:
+        for result in price_orders(read_orders(args.orders), prices):
+            output.write(json.dumps(result) + "\n")
+            if "error" in result:
+                errors = errors + 1
+            else:
+                priced = priced + 1
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    seconds = time.perf_counter() - start_time
+
+    # The summary goes to stderr, so it never mixes with priced orders written to stdout
+    cache = price_sandwich.cache_info()
+    print(f"Priced {priced:,} order(s), rejected {errors:,} in {seconds:.2f} seconds "
+          f"({(priced + errors) / seconds if seconds else 0:,.0f} orders/sec).", file=sys.stderr)
+    print(f"Sandwich cache: {cache.hits:,} hit(s), {cache.misses:,} miss(es), "
+          f"{cache.currsize:,} of {cache.maxsize:,} remembered.", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
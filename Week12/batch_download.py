@@ -0,0 +1,252 @@
+"""
+Author: Lavell McGrone
+Date: 2026-10-18
+Description: Batch mode for data_download.py. Instead of asking for one URL at a time, it reads a file with one URL
+             per line and downloads the pages at the same time with a bounded pool of worker threads. Every worker
+             keeps its own requests.Session, so connections stay open (keep-alive) and are reused for the next page
+             from the same website. No website gets more than a few downloads at once (the per-host cap), so a long
+             list from one site doesn't hammer it or hold up the pages from the other sites.
+             Every downloaded page goes through process_parsing() from data_download.py, and each result is written
+             to the output file as soon as it is ready (one JSON object per line), so memory doesn't grow with the
+             number of URLs.
+
+Usage:       python data_download.py urls.txt [--output results.jsonl] [--workers 16] [--per-host 4]
+             python batch_download.py urls.txt ...          (same thing)
+             python batch_download.py --benchmark [--pages 400] [--hosts 4] [--delay 0.02]
+"""
+
+import argparse
+import collections
+import json
+import os
+import tempfile
+import threading
+import time
+import urllib.parse
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import fetch_retry
+from data_download import process_parsing
+
+REQUEST_TIMEOUT = 10  # Seconds, the same as the interactive program
+WORKERS = 16  # Downloads running at the same time
+PER_HOST = 4  # Downloads running at the same time against one website
+
+local = threading.local()  # Each worker thread keeps its own session (a Session shouldn't be shared by threads)
+
+
+def get_session():
+    """
+    :return: The requests.Session of the current worker thread (created on first use).
+    """
+    if not hasattr(local, "session"):
+        local.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=PER_HOST * 4, pool_maxsize=1)  # One open connection per website
+        local.session.mount("http://", adapter)
+        local.session.mount("https://", adapter)
+    return local.session
+
+
+def read_urls(path):
+    """
+    Read the URL list. Blank lines and lines starting with # are skipped.
+    :param path: Path of the file with one URL per line.
+    :return: A list of URLs.
+    """
+    urls = []
+    with open(path, "r", encoding="utf-8") as file:
+        for line in file:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                urls.append(line)
+    return urls
+
+
+def fetch_page(url, timeout=REQUEST_TIMEOUT):
+    """
+    Download one page with the same checks as process_webpage(), but report problems instead of asking for a new URL.
+    Failures are retried by the shared fetcher of fetch_retry.py, which all workers use, so its retry budget and
+    per-website circuit breakers cover the whole batch.
+    :param url: URL of the page.
+    :param timeout: Seconds to wait for the website.
+    :return: A tuple of (HTML text, None) on success, or (None, error message).
+    """
+    try:
+        response = fetch_retry.fetch(url, get_session().get, timeout)
+        if response.status_code != 200:
+            return None, f"Received status code {response.status_code}"
+        if "text/html" not in response.headers.get("Content-Type", ""):
+            return None, "The URL does not point to an HTML page"
+        return response.text, None
+    except requests.exceptions.RequestException as e:
+        return None, f"Error during webpage access: {e}"
+
+
+def fetch_all(urls, workers=WORKERS, per_host=PER_HOST, timeout=REQUEST_TIMEOUT):
+    """
+    Download pages with a pool of worker threads, never more than per_host at once from the same website.
+    A URL is only handed to a worker when its website is under the cap, so no worker sits waiting on a busy website
+    while pages from other websites are ready to go.
+    :param urls: URLs to download.
+    :param workers: Downloads running at the same time.
+    :param per_host: Downloads running at the same time against one website.
+    :param timeout: Seconds to wait for each website.
+    :return: A generator of (url, HTML text or None, error message or None), in the order the downloads finish.
+    """
+    waiting = {}  # Website -> URLs not started yet, the websites are taken in turns
+    for url in urls:
+        host = urllib.parse.urlsplit(url).netloc.lower()
+        waiting.setdefault(host, collections.deque()).append(url)
+    active = collections.Counter()  # Website -> downloads running now
+    running = {}  # Future -> (url, website)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        while waiting or running:
+            # Step 1: Start downloads until every worker is busy or every website with URLs left is at its cap.
+            started = True
+            while started and len(running) < workers:
+                started = False
+                for host in list(waiting):
+                    if len(running) >= workers:
+                        break
+                    if active[host] < per_host:
+                        url = waiting[host].popleft()
+                        if not waiting[host]:
+                            del waiting[host]
+                        active[host] = active[host] + 1
+                        running[pool.submit(fetch_page, url, timeout)] = (url, host)
+                        started = True
+
+            # Step 2: Hand back whatever finished, which frees a worker and a place under its website's cap.
+            done, unused_value = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                url, host = running.pop(future)
+                active[host] = active[host] - 1
+                html_content, error = future.result()
+                yield url, html_content, error
+
+
+def run_batch(urls, output_path, workers=WORKERS, per_host=PER_HOST, timeout=REQUEST_TIMEOUT):
+    """
+    Download, parse and save every URL. Each line of the output file is a JSON object with the URL and either the
+    extracted text or the error.
+    :param urls: URLs to download.
+    :param output_path: Path of the output file (JSON Lines).
+    :param workers: Downloads running at the same time.
+    :param per_host: Downloads running at the same time against one website.
+    :param timeout: Seconds to wait for each website.
+    :return: A dictionary with the number of "pages" saved, "failed" URLs, text "characters" and "seconds" taken.
+    """
+    summary = {"pages": 0, "failed": 0, "characters": 0}
+    start_time = time.perf_counter()
+    with open(output_path, "w", encoding="utf-8") as output:
+        # Pages are parsed here, one at a time, while the workers keep downloading the next ones
+        for url, html_content, error in fetch_all(urls, workers, per_host, timeout):
+            if error is None:
+                extracted_text = process_parsing(html_content, quiet=True)
+                record = {"url": url, "text": extracted_text}
+                summary["pages"] = summary["pages"] + 1
+                summary["characters"] = summary["characters"] + len(extracted_text)
+            else:
+                record = {"url": url, "error": error}
+                summary["failed"] = summary["failed"] + 1
+            output.write(json.dumps(record) + "\n")
+    summary["seconds"] = time.perf_counter() - start_time
+    return summary
+
+
+def one_at_a_time(urls, output_path, timeout=REQUEST_TIMEOUT):
+    """
+    The interactive program's way, for comparison: requests.get() opens a new connection for every page, and the
+    next page is only requested after this one is parsed.
+    :param urls: URLs to download.
+    :param output_path: Path of the output file (JSON Lines).
+    :param timeout: Seconds to wait for each website.
+    :return: Seconds taken.
+    """
+    start_time = time.perf_counter()
+    with open(output_path, "w", encoding="utf-8") as output:
+        for url in urls:
+            response = requests.get(url, timeout=timeout)
+            extracted_text = process_parsing(response.text, quiet=True)
+            output.write(json.dumps({"url": url, "text": extracted_text}) + "\n")
+    return time.perf_counter() - start_time
+
+
+def run_benchmark(pages=400, hosts=4, delay=0.02, workers=WORKERS, per_host=PER_HOST):
+    """
+    Compare one-at-a-time downloads with the batch mode against local stand-in websites serving synthetic pages.
+    :param pages: Number of URLs, spread evenly over the websites.
+    :param hosts: Number of stand-in websites (each one is a server on its own port).
+    :param delay: Seconds every stand-in website waits before answering, like a real network round trip.
+    :param workers: Downloads running at the same time in batch mode.
+    :param per_host: Downloads running at the same time against one website in batch mode.
+    """
+    from scraper_stand_in_server import start_stand_in_server, stop_stand_in_server
+
+    servers = [start_stand_in_server(delay) for unused_value in range(hosts)]
+    urls = [f"{servers[number % hosts][1]}/page/{number}" for number in range(pages)]
+    results = []
+    with tempfile.TemporaryDirectory() as temp_dir:
+        output_path = os.path.join(temp_dir, "results.jsonl")
+        seconds = one_at_a_time(urls, output_path)
+        results.append(("One at a time, new connection each", seconds))
+        with open(output_path, "r", encoding="utf-8") as file:
+            expected = {json.loads(line)["url"]: json.loads(line)["text"] for line in file}
+
+        for name, pool_size in (("Batch, 1 worker (keep-alive only)", 1),
+                                (f"Batch, {workers} workers, {per_host} per host", workers)):
+            local.__dict__.clear()  # Every run starts without open connections
+            summary = run_batch(urls, output_path, pool_size, per_host)
+            with open(output_path, "r", encoding="utf-8") as file:
+                saved = {json.loads(line)["url"]: json.loads(line).get("text") for line in file}
+            if saved != expected or summary["failed"]:
+                raise RuntimeError(f"{name}: the saved pages don't match the one-at-a-time run")
+            results.append((name, summary["seconds"]))
+
+    for server, unused_value in servers:
+        stop_stand_in_server(server)
+
+    print(f"\n{'Batch Download: ' + str(pages) + ' pages from ' + str(hosts) + ' websites':^70}")
+    print("=" * 70)
+    print(f"{'Mode':<40}{'Seconds':>12}{'Pages/sec':>18}")
+    print("-" * 70)
+    for name, seconds in results:
+        print(f"{name:<40}{seconds:>12.2f}{pages / seconds:>18,.1f}")
+    print("=" * 70)
+    print(f"Stand-in website delay: {delay * 1000:.0f} ms per request. Every mode saved the same text for every page.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Download, parse and save a list of webpages at the same time.")
+    parser.add_argument("url_file", nargs="?", help="file with one URL per line")
+    parser.add_argument("--output", default="results.jsonl", help="output file, one JSON object per line")
+    parser.add_argument("--workers", type=int, default=WORKERS, help="downloads running at the same time")
+    parser.add_argument("--per-host", type=int, default=PER_HOST, help="downloads at the same time per website")
+    parser.add_argument("--timeout", type=float, default=REQUEST_TIMEOUT, help="seconds to wait for a website")
+    parser.add_argument("--benchmark", action="store_true", help="run the throughput benchmark instead")
+    parser.add_argument("--pages", type=int, default=400, help="benchmark: number of pages")
+    parser.add_argument("--hosts", type=int, default=4, help="benchmark: number of stand-in websites")
+    parser.add_argument("--delay", type=float, default=0.02, help="benchmark: seconds of delay per request")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        run_benchmark(args.pages, args.hosts, args.delay, args.workers, args.per_host)
+        return
+    if not args.url_file:
+        parser.error("a URL file is needed (or --benchmark)")
+
+    urls = read_urls(args.url_file)
+    print(f"\nDownloading {len(urls)} webpage(s) with {args.workers} workers ({args.per_host} per website)...")
+    summary = run_batch(urls, args.output, args.workers, args.per_host, args.timeout)
+    print(f"Saved {summary['pages']} page(s) to {args.output} in {summary['seconds']:.1f} seconds.")
+    if summary["failed"]:
+        print(f"{summary['failed']} URL(s) failed, their errors are in the output file.")
+    fetch_retry.print_metrics(fetch_retry.get_fetcher())
+
+
+if __name__ == "__main__":
+    main()
@@ -7,9 +7,10 @@ involves using tools like BeautifulSoup to break down a webpage's HTML into read
 such as text or specific elements.
 """
 
-import requests  # For making HTTP requests
-from bs4 import BeautifulSoup  # For parsing HTML
-import pyinputplus as pyip  # For input validation
+# requests, BeautifulSoup and pyinputplus take a while to import, so each one is imported inside the function that
+# uses it. The first prompt comes up right away, and bs4 is only loaded when a whole page is parsed (batch mode).
+
+DISPLAY_LIMIT = 1000  # Characters of text shown to the user, so only that much of the page has to be read
 
 
 def main():
@@ -19,9 +20,12 @@ def main():
 
     while True:  # Create a loop for the following functions that will be later called.
         url = get_input()   # Input from the user
-        html_content = process_webpage(url)   # Process the input based on what is inserted, access input accordingly.
+        # Process the input based on what is inserted, access input accordingly.
+        # The page is streamed into the parser: the text is extracted piece by piece and parsing stops as soon as
+        # there is enough text to display, instead of building a tree of the whole (maybe huge) page first.
+        html_content = process_webpage(url, stream=True)
         #  Call the parsing function to extract readable text from the HTML content
-        extracted_text = process_parsing(html_content)
+        extracted_text = process_parsing(html_content, limit=DISPLAY_LIMIT)
         display_output(extracted_text)  # Display the extracted text to the user
         # Ask the user if they want to restart or exit the program
         # If the user chooses not to restart, print a goodbye message and exit
@@ -50,68 +54,102 @@ def get_input():  # Input Function
             print(f"Invalid input: {e}")
 
 
-def process_webpage(webpage_url):  # Processing Function 1: Download Webpage
-    try:
-        # Inform the user that the program is trying to access the webpage
-        print("\nAccessing the webpage...")
-
-        # Send a GET request to the URL and set a timeout for the request
-        response = requests.get(webpage_url, timeout=10)
-
-        # Check if the request was successful
-        # HTTP status code 200 indicates a successful response, the server has provided the requested webpage content.
-        # If the status code is not 200, it means something went wrong, for example,
-        # the webpage doesn't exist, there's a server issue, or the URL is invalid. This will prevent the program from
-        # processing invalid or incomplete data, which could lead to errors later in the code.
-        if response.status_code != 200:
-            print("Error: Failed to access the webpage. Please check the URL and try again.")
-            return process_webpage(get_input())  # Restart the process with a new URL
-
-        # Validate if the URL points to an HTML page
-        content_type = response.headers.get("Content-Type", "")
-        if "text/html" not in content_type:
-            print("Error: The URL does not point to an HTML page. Please try a different URL.")
-            return process_webpage(get_input())  # Restart the process with a new URL
-
-        # If no issues, confirm the webpage was successfully accessed
-        print("Webpage accessed successfully!")
-
-        # Return the HTML content of the webpage as text
-        return response.text
-
-    # Handle exceptions for request errors (i.e. invalid URL)
-    except requests.exceptions.RequestException as e:
-        # This block will execute if any request-related error occurs (like a bad URL)
-
-        # Inform the user about the error by printing the exception message (e)
-        print(f"Error during webpage access: {e}")
-
-        # After an error, restart the process by asking the user to input a new URL
-        return process_webpage(get_input())  # Loop the function again after taking new input from the user
-    except ValueError:  # If the webpage content is not HTML
-        # Notify the user that the page is not HTML
-        print("Error: The URL does not point to an HTML page.")
+def process_webpage(webpage_url, stream=False):  # Processing Function 1: Download Webpage
+    # stream=True returns the response itself instead of the whole page as text, to be read while parsing
+    import functools
+    import requests  # For making HTTP requests (loaded on first use)
+    import page_cache  # Saved pages are reused instead of downloading them again
+    import fetch_retry  # Failed downloads are tried again with backoff (loaded on first use)
 
-        # Ask for a new URL and retry
-        return process_webpage(get_input())  # Loop through the function again with the new input
-
-
-def process_parsing(html_content):  # Processing Function 2: Parse HTML Content
+    while True:  # Until a page was accessed: after an error the user enters a new URL and the loop goes around again
+        try:
+            # Inform the user that the program is trying to access the webpage
+            print("\nAccessing the webpage...")
+
+            # Send a GET request to the URL and set a timeout for the request
+            # It goes through the page cache: a saved copy is used while it is fresh, and after that the page is only
+            # downloaded again if the website says it changed. Set SCRAPER_OFFLINE=1 to only use saved pages.
+            # A failed download (timeout, dropped connection, 5xx) is tried a few more times with growing waits first,
+            # and a website that keeps failing is left alone for a while (fetch_retry.py).
+            # With stream=True a downloaded page stays unread until it is parsed, so parsing can still stop early;
+            # the cache only saves it if it was read to the end.
+            get_page = functools.partial(page_cache.get_page, stream=stream)
+            response = fetch_retry.fetch(webpage_url, get_page, timeout=10)
+
+            # Check if the request was successful
+            # HTTP status code 200 indicates a successful response, the server has provided the requested webpage
+            # content. If the status code is not 200, it means something went wrong, for example,
+            # the webpage doesn't exist, there's a server issue, or the URL is invalid. This will prevent the program
+            # from processing invalid or incomplete data, which could lead to errors later in the code.
+            if response.status_code != 200:
+                print("Error: Failed to access the webpage. Please check the URL and try again.")
+                webpage_url = get_input()  # Ask for a new URL and try again
+                continue
+
+            # Validate if the URL points to an HTML page
+            content_type = response.headers.get("Content-Type", "")
+            if "text/html" not in content_type:
+                print("Error: The URL does not point to an HTML page. Please try a different URL.")
+                webpage_url = get_input()  # Ask for a new URL and try again
+                continue
+
+            # If no issues, confirm the webpage was successfully accessed
+            print("Webpage accessed successfully!")
+
+            # Return the HTML content of the webpage as text (or the response, to be read while parsing)
+            return response if stream else response.text
+
+        # Handle exceptions for request errors (i.e. invalid URL)
+        except requests.exceptions.RequestException as e:
+            # This block will execute if any request-related error occurs (like a bad URL)
+
+            # Inform the user about the error by printing the exception message (e)
+            print(f"Error during webpage access: {e}")
+
+            # After an error, restart the process by asking the user to input a new URL
+            webpage_url = get_input()  # Go around the loop again after taking new input from the user
+        except ValueError:  # If the webpage content is not HTML
+            # Notify the user that the page is not HTML
+            print("Error: The URL does not point to an HTML page.")
+
+            # Ask for a new URL and retry
+            webpage_url = get_input()  # Go around the loop again with the new input
+
+
+def process_parsing(html_content, quiet=False, limit=None):  # Processing Function 2: Parse HTML Content
+    # quiet=True skips the progress messages, used by the batch mode that parses thousands of pages
+    # html_content can also be a streamed response from process_webpage(url, stream=True)
+    # limit=N only extracts the first N characters, and stops reading the page there
     try:
         # Step 1: Notify the user that the program is starting to parse the HTML content.
-        print("\nParsing the webpage content...")
+        if not quiet:
+            print("\nParsing the webpage content...")
 
-        # Step 2: Use BeautifulSoup to parse the HTML content, based on user input.
-        # Use BeautifulSoup library used to process and navigate HTML pages.
-        soup = BeautifulSoup(html_content, "html.parser")
+        if limit is not None or not isinstance(html_content, str):
+            # Step 2 and 3 (streaming): Read the HTML in pieces and pull the text out as it arrives, without
+            # building a tree of the whole page. The text is the same as BeautifulSoup's get_text() below.
+            import stream_text
+
+            if isinstance(html_content, str):
+                text_chunks = stream_text.iter_text([html_content], limit)
+            else:
+                text_chunks = stream_text.iter_response_text(html_content, limit)
+            extracted_text = "".join(text_chunks)
+        else:
+            from bs4 import BeautifulSoup  # For parsing HTML (loaded on first use)
 
-        # Step 3: Extract the text from the parsed HTML
-        # `soup.get_text()` will grab all visible text from the webpage and combine it into one large string.
-        # Use "\n"` for a new line for better readability.
-        extracted_text = soup.get_text(separator="\n").strip()  # Remove extra whitespace at the ends.
+            # Step 2: Use BeautifulSoup to parse the HTML content, based on user input.
+            # Use BeautifulSoup library used to process and navigate HTML pages.
+            soup = BeautifulSoup(html_content, "html.parser")
+
+            # Step 3: Extract the text from the parsed HTML
+            # `soup.get_text()` will grab all visible text from the webpage and combine it into one large string.
+            # Use "\n"` for a new line for better readability.
+            extracted_text = soup.get_text(separator="\n").strip()  # Remove extra whitespace at the ends.
 
         # Step 4: If parsing was successful, notify the user accordingly.
-        print("Parsing successful!")
+        if not quiet:
+            print("Parsing successful!")
 
         # Step 5: Return the extracted text so it can be used later.
         return extracted_text
@@ -121,9 +159,9 @@ def process_parsing(html_content):  # Processing Function 2: Parse HTML Content
         # The variable `e` stores the error message and shows specific error to the user.
         print(f"An error occurred during parsing: {e}")
 
-        # Step 7: Retry the parsing process by calling the same function again with the same input.
-        # If there was a failure in parsing process, the program should attempt to fix it by trying again.
-        return process_parsing(html_content)  # Restart parsing if it fails
+        # Step 7: Give back no text. Parsing the same input again would only fail the same way again (and calling
+        # this function again from here would never end), so the user can try another webpage instead.
+        return ""
 
 
 def display_output(extracted_text):   # Output Function
@@ -143,7 +181,7 @@ def display_output(extracted_text):   # Output Function
     # Step 3 (optional): Display the first 1000 characters of the extracted text for readability.
     # Slice `extracted_text[:1000]` to ensure only the first 1000 characters are shown.
     # In the case the website is very large
-    print(extracted_text[:1000])  # Display the first 1000 characters.
+    print(extracted_text[:DISPLAY_LIMIT])  # Display the first 1000 characters.
 
     # Step 4: Print another line of 40 dashes
     print("-" * 40)
@@ -155,9 +193,20 @@ def display_output(extracted_text):   # Output Function
 # Restart Program Prompt using pyinputplus
 # inputYesNo ensures the user provides a valid yes or no response.
 def restart_program():
+    import pyinputplus as pyip  # For input validation (loaded on first use)
+
     restart = pyip.inputYesNo("Would you like to scrape another webpage? (yes/no): ").lower()
     return restart == 'yes'
 
 # Run the Main Function
+# With a file of URLs on the command line, all of them are downloaded at once instead (batch mode), ex:
+#     python data_download.py urls.txt --output results.jsonl
 if __name__ == "__main__":
-    main()
+    import sys
+
+    if len(sys.argv) > 1:
+        import batch_download
+
+        batch_download.main()
+    else:
+        main()
@@ -0,0 +1,300 @@
+"""
+Author: Lavell McGrone
+Date: 2026-10-18
+Description: A fetch layer for the web scrapers that copes with flaky websites without hammering them. A failed
+             download (connection error, timeout, or a 429/500/502/503/504 answer) is tried again in a loop, not by
+             calling the function again, and the wait between tries grows exponentially with random jitter, so many
+             clients that failed together don't all come back at the same moment. A Retry-After header is respected.
+             Every website (host) has a circuit breaker: after several failures in a row the circuit opens and
+             requests to that website fail right away for a cooldown period, then a single trial request decides
+             whether it closes again. A retry budget keeps retries to a share of all requests, so a big outage
+             doesn't turn into several times the normal traffic.
+             Attempts, retries, failures and download latency (of the last 1000 attempts) are counted in the fetcher's
+             metrics.
+             One fetcher can be shared by many threads (batch mode).
+
+Usage:       python fetch_retry.py          (runs the scrapers' fetch layer against fault-injecting local websites)
+"""
+
+import collections
+import random
+import threading
+import time
+import urllib.parse
+
+import requests
+
+REQUEST_TIMEOUT = 10  # Seconds, the same as the scrapers
+RETRY_STATUSES = (429, 500, 502, 503, 504)  # Answers that mean "try again later", anything else is final
+# Errors worth another try. Anything else (ex: a URL without http://) fails the same way every time.
+RETRY_ERRORS = (requests.exceptions.ConnectionError, requests.exceptions.Timeout,
+                requests.exceptions.ChunkedEncodingError)
+LATENCY_SAMPLES = 1000  # Attempts kept for the latency percentiles, so a long run doesn't keep every one of them
+
+fetcher = None  # The shared fetcher, created on first use
+
+
+def new_fetcher(max_attempts=4, base_delay=0.25, max_delay=8.0, failure_threshold=5, cooldown=30.0,
+                budget_ratio=0.2, min_retries=10, sleep=time.sleep):
+    """
+    :param max_attempts: Tries per request, the first one included.
+    :param base_delay: Seconds of the first backoff; every retry doubles it (before the jitter).
+    :param max_delay: Longest wait between two tries, also for Retry-After.
+    :param failure_threshold: Failures in a row that open a website's circuit.
+    :param cooldown: Seconds an open circuit fails requests right away before letting a trial request through.
+    :param budget_ratio: Retries allowed as a share of all requests, ex: 0.2 allows 1 retry per 5 requests...
+    :param min_retries: ...plus this many, so a few early failures can still be retried.
+    :param sleep: Function used to wait (time.sleep).
+    :return: The fetcher dictionary.
+    """
+    return {
+        "settings": {"max_attempts": max_attempts, "base_delay": base_delay, "max_delay": max_delay,
+                     "failure_threshold": failure_threshold, "cooldown": cooldown, "budget_ratio": budget_ratio,
+                     "min_retries": min_retries, "sleep": sleep},
+        "hosts": {},  # Website -> circuit breaker
+        "metrics": {"requests": 0, "attempts": 0, "retries": 0, "successes": 0, "failures": 0,
+                    "short_circuited": 0, "budget_exhausted": 0, "circuits_opened": 0},
+        "latencies": collections.deque(maxlen=LATENCY_SAMPLES),  # Seconds of the most recent attempts
+        "lock": threading.Lock(),
+    }
+
+
+def get_fetcher():
+    """
+    :return: The shared fetcher (created on first use with the default settings).
+    """
+    global fetcher
+    if fetcher is None:
+        fetcher = new_fetcher()
+    return fetcher
+
+
+def backoff_delay(settings, retry_number, response=None):
+    """
+    Seconds to wait before a retry: exponential backoff with full jitter (a random time between 0 and the backoff),
+    or what the website asked for with Retry-After.
+    :param settings: The fetcher settings.
+    :param retry_number: 0 for the first retry, 1 for the second, ...
+    :param response: The failed response, if there was one.
+    :return: Seconds to wait.
+    """
+    if response is not None and response.headers.get("Retry-After", "").isdecimal():
+        return min(settings["max_delay"], int(response.headers["Retry-After"]))
+    return random.uniform(0, min(settings["max_delay"], settings["base_delay"] * 2 ** retry_number))
+
+
+def allow_request(fetcher, host, now):
+    """
+    Ask the website's circuit breaker whether a request may go out.
+    Closed: yes. Open: no, until the cooldown is over; then it is half-open and one trial request may go out.
+    :return: True if the request may go out.
+    """
+    with fetcher["lock"]:
+        breaker = fetcher["hosts"].setdefault(host, {"state": "closed", "failures": 0, "opened_at": 0.0,
+                                                     "trial": False})
+        if breaker["state"] == "closed":
+            return True
+        if breaker["state"] == "open" and now - breaker["opened_at"] < fetcher["settings"]["cooldown"]:
+            return False
+        if breaker["trial"]:
+            return False  # Another thread is already sending the trial request
+        breaker["state"] = "half-open"
+        breaker["trial"] = True
+        return True
+
+
+def record_result(fetcher, host, succeeded, now):
+    """
+    Tell the website's circuit breaker how an attempt went.
+    A success closes the circuit. A failure opens it after failure_threshold failures in a row, or right away when it
+    was the trial request. None means the attempt says nothing about the website (ex: a broken URL).
+    """
+    with fetcher["lock"]:
+        breaker = fetcher["hosts"][host]
+        breaker["trial"] = False
+        if succeeded is None:
+            return
+        if succeeded:
+            breaker["state"] = "closed"
+            breaker["failures"] = 0
+            return
+        breaker["failures"] = breaker["failures"] + 1
+        if breaker["state"] == "half-open" or breaker["failures"] >= fetcher["settings"]["failure_threshold"]:
+            if breaker["state"] != "open":
+                fetcher["metrics"]["circuits_opened"] = fetcher["metrics"]["circuits_opened"] + 1
+            breaker["state"] = "open"
+            breaker["opened_at"] = now
+
+
+def take_retry(fetcher):
+    """
+    Take one retry from the retry budget.
+    :return: True if the budget allows another retry.
+    """
+    with fetcher["lock"]:
+        metrics = fetcher["metrics"]
+        settings = fetcher["settings"]
+        if metrics["retries"] >= settings["budget_ratio"] * metrics["requests"] + settings["min_retries"]:
+            metrics["budget_exhausted"] = metrics["budget_exhausted"] + 1
+            return False
+        metrics["retries"] = metrics["retries"] + 1
+        return True
+
+
+def count(fetcher, name):
+    with fetcher["lock"]:
+        fetcher["metrics"][name] = fetcher["metrics"][name] + 1
+
+
+def fetch(url, get=None, timeout=REQUEST_TIMEOUT, fetcher=None):
+    """
+    Download a page, retrying failures with backoff, as long as the website's circuit and the retry budget allow it.
+    :param url: URL of the page.
+    :param get: Function that does one download, get(url, timeout=...) -> requests.Response (default requests.get),
+                ex: page_cache.get_page or a session's get.
+    :param timeout: Seconds to wait for the website on every try.
+    :param fetcher: The fetcher to use (default: the shared one).
+    :return: The response. After the last try it can still be a 429/5xx response; a 404 etc. is returned right away.
+    :raises requests.exceptions.RequestException: The error of the last try (errors that aren't RETRY_ERRORS are
+            not tried again), or a ConnectionError if the website's circuit is open.
+    """
+    fetcher = fetcher or get_fetcher()
+    get = get or requests.get
+    settings = fetcher["settings"]
+    host = urllib.parse.urlsplit(url).netloc.lower()
+    count(fetcher, "requests")
+
+    retry_number = 0
+    while True:
+        if not allow_request(fetcher, host, time.monotonic()):
+            count(fetcher, "short_circuited")
+            raise requests.exceptions.ConnectionError(f"{host} is failing, not trying again for a while "
+                                                      f"(circuit open)")
+
+        start_time = time.perf_counter()
+        response = None
+        error = None
+        try:
+            response = get(url, timeout=timeout)
+        except requests.exceptions.RequestException as e:
+            error = e
+        with fetcher["lock"]:
+            fetcher["latencies"].append(time.perf_counter() - start_time)
+            fetcher["metrics"]["attempts"] = fetcher["metrics"]["attempts"] + 1
+
+        if error is not None and not isinstance(error, RETRY_ERRORS):
+            record_result(fetcher, host, None, time.monotonic())
+            count(fetcher, "failures")
+            raise error  # Trying again wouldn't help
+
+        failed = error is not None or response.status_code in RETRY_STATUSES
+        record_result(fetcher, host, not failed, time.monotonic())
+        if not failed:
+            count(fetcher, "successes")
+            return response
+
+        if retry_number + 1 >= settings["max_attempts"] or not take_retry(fetcher):
+            count(fetcher, "failures")
+            if error is not None:
+                raise error
+            return response
+        delay = backoff_delay(settings, retry_number, response)  # Before closing, it reads Retry-After
+        if response is not None:
+            response.close()  # Give the connection back to the pool instead of leaking it while waiting
+        settings["sleep"](delay)
+        retry_number = retry_number + 1
+
+
+def print_metrics(fetcher, title="Fetch Metrics"):
+    """
+    Display the attempts, retries and latency of a fetcher.
+    :param fetcher: The fetcher dictionary.
+    :param title: Heading of the table.
+    """
+    metrics = fetcher["metrics"]
+    latencies = sorted(fetcher["latencies"])
+    print(f"\n{title:^60}")
+    print("=" * 60)
+    for name in ("requests", "attempts", "retries", "successes", "failures", "short_circuited", "budget_exhausted",
+                 "circuits_opened"):
+        print(f"{name.replace('_', ' ').capitalize():<40}{metrics[name]:>20,}")
+    if latencies:
+        print(f"{'Latency p50 (ms)':<40}{latencies[len(latencies) // 2] * 1000:>20.1f}")
+        print(f"{'Latency p99 (ms)':<40}{latencies[int(len(latencies) * 0.99)] * 1000:>20.1f}")
+    print("=" * 60)
+
+
+def run_scenario(name, faults, urls_per_run, settings, seed):
+    """
+    Fetch pages from a fault-injecting stand-in website with one fetcher.
+    :return: A tuple of (name, pages downloaded, failed requests, requests the website received, seconds, fetcher).
+    """
+    from scraper_stand_in_server import start_stand_in_server, stop_stand_in_server
+
+    server, base_url = start_stand_in_server(faults=faults, seed=seed)
+    session = requests.Session()
+    run_fetcher = new_fetcher(**settings)
+    pages = 0
+    failed = 0
+    start_time = time.perf_counter()
+    for number in range(urls_per_run):
+        try:
+            response = fetch(f"{base_url}/page/{number}", session.get, timeout=0.5, fetcher=run_fetcher)
+            if response.status_code == 200:
+                pages = pages + 1
+            else:
+                failed = failed + 1
+        except requests.exceptions.RequestException:
+            failed = failed + 1
+    seconds = time.perf_counter() - start_time
+    session.close()
+    stop_stand_in_server(server)
+    return name, pages, failed, server.settings["requests"], seconds, run_fetcher
+
+
+def run_benchmark(requests_per_run=200):
+    """
+    Run the fetch layer against fault-injecting local websites and check that it behaves:
+    retries turn a flaky website into (almost) no failures, a dead website is only asked a handful of times once its
+    circuit opens, and without circuit breaking the retry budget still caps the extra traffic.
+    :param requests_per_run: Pages requested in every scenario.
+    """
+    random.seed(0)  # Same jitter every run
+    fast = {"base_delay": 0.005, "max_delay": 0.05, "cooldown": 0.2}  # Short waits, so the benchmark runs quickly
+    flaky = {"error_rate": 0.1, "reset_rate": 0.04, "hang_rate": 0.01, "hang_seconds": 1.0}  # 15% of requests fail
+    dead = {"error_rate": 1.0}
+    results = [
+        run_scenario("Flaky website, no retries", flaky, requests_per_run, dict(fast, max_attempts=1), 1),
+        run_scenario("Flaky website, fetch layer", flaky, requests_per_run, fast, 1),
+        run_scenario("Dead website, retries only", dead, requests_per_run, dict(fast, failure_threshold=10 ** 9), 2),
+        run_scenario("Dead website, fetch layer", dead, requests_per_run, fast, 2),
+    ]
+
+    print(f"\n{'Fetch Layer: ' + str(requests_per_run) + ' pages per scenario':^84}")
+    print("=" * 84)
+    print(f"{'Scenario':<30}{'Pages':>8}{'Failed':>8}{'Server hits':>13}{'Retries':>9}{'Circuit':>9}"
+          f"{'p99 (ms)':>10}{'Sec':>7}")
+    print("-" * 84)
+    for name, pages, failed, server_requests, seconds, run_fetcher in results:
+        metrics = run_fetcher["metrics"]
+        latencies = sorted(run_fetcher["latencies"])
+        p99 = latencies[int(len(latencies) * 0.99)] * 1000 if latencies else 0
+        print(f"{name:<30}{pages:>8}{failed:>8}{server_requests:>13,}{metrics['retries']:>9,}"
+              f"{metrics['short_circuited']:>9,}{p99:>10.1f}{seconds:>7.2f}")
+    print("=" * 84)
+    print("Server hits: requests the website received. Circuit: requests failed right away by an open circuit.")
+
+    # Check that the numbers show what the table is meant to show (test_fetch_retry.py tests each behavior alone)
+    flaky_plain, flaky_layer, dead_plain, dead_layer = results
+    if flaky_layer[1] <= flaky_plain[1]:
+        raise RuntimeError("Retries didn't get more pages from the flaky website")
+    budget = 0.2 * requests_per_run + 10
+    if dead_plain[5]["metrics"]["retries"] > budget:
+        raise RuntimeError(f"More than {budget:.0f} retries were sent to the dead website")
+    if dead_layer[3] >= dead_plain[3] / 4:
+        raise RuntimeError("The circuit breaker didn't spare the dead website")
+    print("Checks passed: retries help, the retry budget caps retries and open circuits spare a dead website.")
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,268 @@
+"""
+Author: Lavell McGrone
+Date: 2026-10-18
+Description: Targeted forecast extraction for weather_data.py and weather_data_revised.py. They used to build a
+             BeautifulSoup tree of the whole forecast page and then walk it twice with find_all(class_=...), once for
+             the forecast-label elements and once for the forecast-text elements, while the detailed forecast is a
+             small part of the page. Here only those elements are kept, and labels and texts come out of one pass:
+             - "stream": html.parser's tokenizer goes over the page once and only collects the text inside elements
+               with the forecast classes, without building any tree (no bs4 needed). It stops reading once the last
+               forecast element is closed, so the footer of the page is skipped.
+             - "strainer": BeautifulSoup with a SoupStrainer, so the tree only holds the forecast elements.
+             - "lxml": the same strainer with the lxml parser, which tokenizes in C. Only offered when lxml is
+               installed (pip install lxml), and only used when asked for.
+             The default is "stream".
+             "stream" and "strainer" give the same lists as [element.get_text() for element in soup.find_all(...)],
+             the benchmark checks it. lxml fixes broken HTML its own way, so on badly broken pages it can differ.
+
+Usage:       python forecast_extract.py [corpus folder]
+             Benchmark over a folder of saved forecast pages (*.html). Without a folder, a corpus of synthetic forecast
+             pages is saved in a temporary folder first.
+"""
+
+import importlib.util
+import os
+import re
+import sys
+import tempfile
+import time
+
+from stream_text import TextTokenizer
+
+FORECAST_CLASSES = ("forecast-label", "forecast-text")
+# Matches an element with either class, whether the parser hands over the whole class attribute or one class at a time
+FORECAST_CLASS_PATTERN = re.compile(r"(^|\s)forecast-(label|text)(\s|$)")
+# Tags that never have content, BeautifulSoup closes them right away (the same list as bs4's HTML tree builder)
+VOID_TAGS = ("area", "base", "br", "col", "embed", "hr", "img", "input", "keygen", "link", "menuitem", "meta", "param",
+             "source", "track", "wbr", "basefont", "bgsound", "command", "frame", "image", "isindex", "nextid",
+             "spacer")
+
+
+class ForecastTokenizer(TextTokenizer):
+    """
+    One pass over a forecast page that only collects the text of forecast-label and forecast-text elements.
+    The open tags are kept on a stack like BeautifulSoup keeps them, so an end tag closes everything opened after
+    its start tag, and every finished string goes to the forecast elements that are open at that moment.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.open_tags = []  # (tag, list of text parts if it is a forecast element, else None)
+        self.capturing = 0  # Open forecast elements
+        self.labels = []  # Text parts of every forecast-label, in page order
+        self.texts = []  # Text parts of every forecast-text, in page order
+
+    def hand_out_strings(self):
+        strings = self.take_strings()
+        if strings and self.capturing:
+            for unused_tag, parts in self.open_tags:
+                if parts is not None:
+                    parts.extend(strings)
+
+    def handle_starttag(self, tag, attrs):
+        super().handle_starttag(tag, attrs)
+        self.hand_out_strings()
+        classes = []
+        for name, value in attrs:
+            if name == "class" and value:
+                classes = value.split()
+        parts = None
+        if FORECAST_CLASSES[0] in classes or FORECAST_CLASSES[1] in classes:
+            parts = []
+            if FORECAST_CLASSES[0] in classes:
+                self.labels.append(parts)
+            if FORECAST_CLASSES[1] in classes:
+                self.texts.append(parts)
+        if tag in VOID_TAGS:
+            return  # Closed right away, so it never holds text
+        self.open_tags.append((tag, parts))
+        if parts is not None:
+            self.capturing = self.capturing + 1
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_TAGS:
+            self.handle_endtag(tag)  # <div class="forecast-text"/> is an empty element
+
+    def handle_endtag(self, tag):
+        super().handle_endtag(tag)
+        self.hand_out_strings()
+        for position in range(len(self.open_tags) - 1, -1, -1):
+            if self.open_tags[position][0] == tag:
+                for unused_tag, parts in self.open_tags[position:]:
+                    if parts is not None:
+                        self.capturing = self.capturing - 1
+                del self.open_tags[position:]
+                break  # An end tag without a start tag is ignored
+
+    def handle_comment(self, data):
+        super().handle_comment(data)
+        self.hand_out_strings()
+
+    def handle_decl(self, decl):
+        super().handle_decl(decl)
+        self.hand_out_strings()
+
+    def handle_pi(self, data):
+        super().handle_pi(data)
+        self.hand_out_strings()
+
+    def unknown_decl(self, data):
+        super().unknown_decl(data)
+        self.hand_out_strings()
+
+    def close(self):
+        super().close()
+        self.hand_out_strings()
+
+
+def lxml_installed():
+    """
+    :return: True if the lxml parser can be used by BeautifulSoup.
+    """
+    return importlib.util.find_spec("lxml") is not None
+
+
+def extract_with_stream(html, chunk_size=4096):
+    """
+    :return: A tuple of (forecast labels, forecast texts), from one pass of ForecastTokenizer.
+    """
+    tokenizer = ForecastTokenizer()
+    # Nothing after the last forecast class name in the page can end up in the forecast, so the rest (usually the
+    # footer) is only read as far as needed to close the forecast elements that are still open.
+    end = max(html.rfind(FORECAST_CLASSES[0]), html.rfind(FORECAST_CLASSES[1]))
+    if end < 0:
+        return [], []
+    end = end + len(FORECAST_CLASSES[0])
+    tokenizer.feed(html[:end])
+    while end < len(html) and (tokenizer.capturing or "<" in tokenizer.rawdata):  # rawdata: a tag not finished yet
+        tokenizer.feed(html[end:end + chunk_size])
+        end = end + chunk_size
+    tokenizer.close()
+    return ["".join(parts) for parts in tokenizer.labels], ["".join(parts) for parts in tokenizer.texts]
+
+
+def extract_with_strainer(html, parser="html.parser"):
+    """
+    :return: A tuple of (forecast labels, forecast texts), from a tree that only holds the forecast elements.
+    """
+    from bs4 import BeautifulSoup, SoupStrainer
+
+    soup = BeautifulSoup(html, parser, parse_only=SoupStrainer(class_=FORECAST_CLASS_PATTERN))
+    labels = []
+    texts = []
+    for element in soup.find_all(class_=list(FORECAST_CLASSES)):  # One walk over the (small) tree for both
+        classes = element.get("class", [])
+        if FORECAST_CLASSES[0] in classes:
+            labels.append(element.get_text())
+        if FORECAST_CLASSES[1] in classes:
+            texts.append(element.get_text())
+    return labels, texts
+
+
+def extract_with_find_all(html):
+    """
+    The old way, for comparison: the whole tree, then one find_all() walk per class.
+    """
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, "html.parser")
+    forecast_labels = [label.get_text() for label in soup.find_all(class_="forecast-label")]
+    forecast_text = [text.get_text() for text in soup.find_all(class_="forecast-text")]
+    return forecast_labels, forecast_text
+
+
+BACKENDS = {
+    "stream": extract_with_stream,
+    "strainer": extract_with_strainer,
+    "lxml": lambda html: extract_with_strainer(html, "lxml"),
+}
+
+
+def extract_forecast(html, backend="stream"):
+    """
+    Pull the detailed forecast out of a forecast page.
+    :param html: The page as text.
+    :param backend: "stream", "strainer" or "lxml" (see the description at the top).
+    :return: A tuple of (forecast labels, forecast texts), ex: (["Tonight", ...], ["Mostly clear, ...", ...]).
+    :raises ValueError: If the backend is unknown, or it is "lxml" and lxml is not installed.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown forecast parser backend: {backend!r}")
+    if backend == "lxml" and not lxml_installed():
+        raise ValueError("The lxml backend needs lxml (pip install lxml)")
+    return BACKENDS[backend](html)
+
+
+def save_synthetic_corpus(folder, pages=200):
+    """
+    Save synthetic forecast pages, one per made-up ZIP code, as a corpus for the benchmark.
+    :param folder: Folder to save the pages in.
+    :param pages: Number of pages.
+    """
+    from scraper_stand_in_server import make_forecast_page
+
+    for number in range(pages):
+        with open(os.path.join(folder, f"forecast_{55000 + number}.html"), "wb") as file:
+            file.write(make_forecast_page(f"/forecast/{55000 + number}"))
+
+
+def read_corpus(folder):
+    """
+    :return: The text of every .html file in a folder, sorted by name.
+    """
+    pages = []
+    for name in sorted(os.listdir(folder)):
+        if name.endswith(".html"):
+            with open(os.path.join(folder, name), "r", encoding="utf-8", errors="replace") as file:
+                pages.append(file.read())
+    return pages
+
+
+def run_benchmark(corpus_folder=None, repeats=3):
+    """
+    Time every backend over a corpus of forecast pages and check that they all match the find_all() way.
+    :param corpus_folder: Folder of saved forecast pages, or None to save a synthetic corpus first.
+    :param repeats: Passes over the corpus per backend (the best one counts).
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        if corpus_folder is None:
+            corpus_folder = temp_dir
+            save_synthetic_corpus(corpus_folder)
+        pages = read_corpus(corpus_folder)
+    if not pages:
+        print(f"No .html pages found in {corpus_folder}")
+        return
+    megabytes = sum(len(page) for page in pages) / 1_000_000
+
+    expected = [extract_with_find_all(page) for page in pages]
+    candidates = [("find_all x2 (whole tree)", extract_with_find_all)]
+    for name in BACKENDS:
+        if name != "lxml" or lxml_installed():
+            candidates.append((name, BACKENDS[name]))
+
+    results = []
+    for name, function in candidates:
+        best = None
+        for unused_value in range(repeats):
+            start_time = time.perf_counter()
+            extracted = [function(page) for page in pages]
+            seconds = time.perf_counter() - start_time
+            best = seconds if best is None else min(best, seconds)
+        if extracted != expected:
+            raise RuntimeError(f"The {name} backend didn't extract the same forecast as find_all()")
+        results.append((name, best))
+
+    print(f"\n{'Forecast Extraction: ' + str(len(pages)) + ' pages, ' + format(megabytes, '.1f') + ' MB':^70}")
+    print("=" * 70)
+    print(f"{'Backend':<30}{'Seconds':>12}{'Pages/sec':>14}{'Speedup':>14}")
+    print("-" * 70)
+    for name, seconds in results:
+        print(f"{name:<30}{seconds:>12.3f}{len(pages) / seconds:>14,.1f}{results[0][1] / seconds:>13.1f}x")
+    print("=" * 70)
+    print("Every backend extracted the same labels and texts." +
+          ("" if lxml_installed() else " lxml is not installed, so its backend was skipped."))
+
+
+if __name__ == "__main__":
+    run_benchmark(sys.argv[1] if len(sys.argv) > 1 else None)
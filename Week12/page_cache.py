@@ -0,0 +1,599 @@
+"""
+Author: Lavell McGrone
+Date: 2026-10-18
+Description: Shared on-disk HTTP cache for the web scrapers (data_download.py, weather_data.py,
+             weather_data_revised.py and the Week 13 poem demo), so running them again doesn't download the same page
+             again. The cache index is keyed by URL, and every page body is saved under the SHA-256 of its bytes
+             (content-addressed), so pages that are byte-for-byte the same, ex: one page behind several URLs with
+             different tracking parameters, are stored only once.
+             A saved page is used without asking the server while it is fresh (Cache-Control max-age, Expires, or a
+             tenth of its age since Last-Modified). After that the server is asked with a conditional GET (ETag /
+             Last-Modified), and a 304 Not Modified answer reuses the saved body. Pages marked no-store are never
+             saved, and no-cache pages are always checked first. When the cache is bigger than its size limit, the
+             least recently used pages are removed (LRU), and a body file is deleted as soon as no URL uses it.
+             When the website is down or answers with a 5xx error, the saved copy is kept and used (unless the page
+             is must-revalidate); it is only dropped when the page is gone (404, 410) or sent again as no-store.
+             A streamed download (stream=True) is saved while the scraper reads it, and only if it is read to the end.
+             Several scrapers can share the folder: when the index is written, the one on disk is read again and only
+             the URLs this run changed are written over it. Cache hits are written once, when the program ends.
+             In offline mode only saved pages are used and the network is never touched: set SCRAPER_OFFLINE=1.
+             The folder is ~/.scraper_cache, or SCRAPER_CACHE_DIR; the size limit is SCRAPER_CACHE_MAX_MB (200 MB).
+
+Usage:       python page_cache.py stats          (hit rate and bytes saved so far)
+             python page_cache.py clear
+             python page_cache.py benchmark
+"""
+
+import atexit
+import email.utils
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import time
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+CACHE_DIR = os.environ.get("SCRAPER_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".scraper_cache"))
+MAX_CACHE_BYTES = int(os.environ.get("SCRAPER_CACHE_MAX_MB", "200")) * 1_000_000
+OFFLINE = os.environ.get("SCRAPER_OFFLINE") == "1"
+REQUEST_TIMEOUT = 10
+MAX_HEURISTIC_SECONDS = 24 * 60 * 60  # A page without Cache-Control or Expires is fresh for at most a day
+SAVED_HEADERS = ("Content-Type", "ETag", "Last-Modified", "Cache-Control", "Expires", "Date")
+NEW_STATS = {"requests": 0, "hits": 0, "revalidated": 0, "downloads": 0, "stale_served": 0, "offline_misses": 0,
+             "bytes_downloaded": 0, "bytes_saved": 0, "evicted": 0}
+
+caches = {}  # Cache folder -> open cache, so the index is only read once per run
+session = None  # One shared session, so connections are reused
+
+
+def get_session():
+    """
+    :return: The shared requests.Session (created on first use).
+    """
+    global session
+    if session is None:
+        session = requests.Session()
+    return session
+
+
+def write_file_atomically(path, data):
+    """
+    Write bytes to a temporary file first and then rename it, so a crash never leaves half a file behind.
+    :param path: Path of the file to write.
+    :param data: Bytes to write.
+    """
+    temp_path = f"{path}.{os.getpid()}.tmp"  # Another scraper may be saving the same file at the same moment
+    with open(temp_path, "wb") as file:
+        file.write(data)
+    os.replace(temp_path, path)
+
+
+def read_index(cache_dir):
+    """
+    :return: The index saved in a cache folder, or None if there is none yet (or a broken one).
+    """
+    try:
+        with open(os.path.join(cache_dir, "index.json"), "r", encoding="utf-8") as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return None
+
+
+def open_cache(cache_dir=CACHE_DIR, max_bytes=MAX_CACHE_BYTES):
+    """
+    Open a cache folder. The index lists every saved URL with its headers, the hash of its body, when it was saved
+    and when it was last used; the bodies are files named after their hash.
+    :param cache_dir: Folder of the cache.
+    :param max_bytes: Size limit of the saved bodies.
+    :return: The cache dictionary.
+    """
+    cache = caches.get(cache_dir)
+    if cache is not None:
+        return cache
+    os.makedirs(os.path.join(cache_dir, "bodies"), exist_ok=True)
+    index = read_index(cache_dir) or {}  # Without an index, start empty: the pages are saved again as they come back
+    stats = dict(NEW_STATS, **index.get("stats", {}))
+    cache = {"dir": cache_dir, "max_bytes": max_bytes, "entries": index.get("entries", {}), "stats": stats,
+             "saved_stats": dict(stats),  # The statistics as they were on disk, to write only this run's counts
+             "changed": set(),  # URLs this run saved or used since the index was written
+             "removed": set()}  # URLs this run removed since the index was written
+    caches[cache_dir] = cache
+    atexit.register(save_changes, cache)  # Cache hits only change the index in memory until then
+    return cache
+
+
+def save_index(cache):
+    """
+    Write the index. Other scrapers may have written it since it was read, so it is read again and only the URLs
+    this run changed or removed (and this run's counts) go over it, instead of replacing it with this run's copy.
+    :param cache: The cache dictionary.
+    """
+    index = read_index(cache["dir"])
+    entries = cache["entries"] if index is None else index.get("entries", {})
+    for url in cache["removed"]:
+        entries.pop(url, None)
+    for url in cache["changed"]:
+        if url in cache["entries"]:
+            entries[url] = cache["entries"][url]
+    stats = dict(NEW_STATS, **(index or {}).get("stats", {}))
+    for name in stats:
+        stats[name] = stats[name] + cache["stats"][name] - cache["saved_stats"][name]
+    data = json.dumps({"entries": entries, "stats": stats}).encode("utf-8")
+    write_file_atomically(os.path.join(cache["dir"], "index.json"), data)
+    cache["entries"] = entries
+    cache["stats"] = stats
+    cache["saved_stats"] = dict(stats)
+    cache["changed"] = set()
+    cache["removed"] = set()
+
+
+def save_changes(cache):
+    """
+    Write the index if anything changed since it was last written (called when the program ends).
+    :param cache: The cache dictionary.
+    """
+    if cache["changed"] or cache["removed"] or cache["stats"] != cache["saved_stats"]:
+        try:
+            save_index(cache)
+        except OSError:
+            pass  # The folder is gone, ex: a temporary cache of the benchmark
+
+
+def body_path(cache, digest):
+    return os.path.join(cache["dir"], "bodies", digest)
+
+
+def parse_cache_control(value):
+    """
+    :param value: A Cache-Control header, ex: "max-age=300, must-revalidate".
+    :return: A dictionary of directive -> value (True for directives without a value), names in lower case.
+    """
+    directives = {}
+    for part in (value or "").split(","):
+        name, unused_value, argument = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = argument.strip('"') if argument else True
+    return directives
+
+
+def parse_date(value):
+    """
+    :return: Seconds since the epoch for an HTTP date, or None if it is missing or broken.
+    """
+    try:
+        return email.utils.parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+def freshness_lifetime(headers, now):
+    """
+    How long a page may be used without asking the server, following the rules of HTTP caching.
+    :param headers: Response headers.
+    :param now: Time the page was received.
+    :return: Seconds the page stays fresh (0 means: always ask first).
+    """
+    directives = parse_cache_control(headers.get("Cache-Control"))
+    if "no-cache" in directives:
+        return 0
+    if "max-age" in directives:
+        try:
+            return max(0, int(directives["max-age"]))
+        except ValueError:
+            return 0
+    date = parse_date(headers.get("Date")) or now
+    expires = parse_date(headers.get("Expires"))
+    if headers.get("Expires") is not None:
+        return max(0, expires - date) if expires is not None else 0  # A broken Expires means "already expired"
+    last_modified = parse_date(headers.get("Last-Modified"))
+    if last_modified is not None:
+        return min(max(0, date - last_modified) / 10, MAX_HEURISTIC_SECONDS)
+    return 0
+
+
+def is_storable(response):
+    """
+    :return: True if the response may be saved: a complete 200 page that is not marked no-store.
+    """
+    if response.status_code != 200 or response.headers.get("Vary", "").strip() == "*":
+        return False
+    return "no-store" not in parse_cache_control(response.headers.get("Cache-Control"))
+
+
+def is_replaced(response):
+    """
+    :return: True if the response replaces a saved copy that can't be kept: the page is gone (404 or 410), or it
+             was sent again in a form that may not be saved (ex: marked no-store). Other errors leave it alone.
+    """
+    if response.status_code in (404, 410):
+        return True
+    return response.status_code == 200 and not is_storable(response)
+
+
+def may_serve_stale(entry):
+    """
+    :param entry: The saved entry of the page, or None.
+    :return: True if the saved copy may be used after it expired, when the server can't give a new one.
+    """
+    return entry is not None and "must-revalidate" not in parse_cache_control(entry["headers"].get("Cache-Control"))
+
+
+def cached_response(url, entry, body):
+    """
+    Build a requests.Response from a saved page, so the scrapers can use it exactly like a downloaded one
+    (status_code, headers, text, content, iter_content).
+    """
+    response = requests.Response()
+    response.status_code = 200
+    response.reason = "OK"
+    response.url = url
+    response.headers = CaseInsensitiveDict(entry["headers"])
+    response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+    response._content = body  # The body is already read, as with requests.get(url, stream=False)
+    response._content_consumed = True
+    return response
+
+
+def read_body(cache, entry):
+    """
+    :return: The saved body of an entry, or None if the file is missing or doesn't match its hash.
+    """
+    try:
+        with open(body_path(cache, entry["body"]), "rb") as file:
+            body = file.read()
+    except OSError:
+        return None
+    if hashlib.sha256(body).hexdigest() != entry["body"]:
+        return None
+    return body
+
+
+def release_body(cache, digest):
+    """
+    Delete a body file if no saved URL uses it anymore.
+    :return: True if the body is no longer stored.
+    """
+    for entry in cache["entries"].values():
+        if entry["body"] == digest:
+            return False
+    try:
+        os.remove(body_path(cache, digest))
+    except OSError:
+        pass
+    return True
+
+
+def remove_entry(cache, url):
+    """
+    Remove a saved URL, and its body file if no other URL uses the same bytes.
+    :return: True if the body file was deleted.
+    """
+    entry = cache["entries"].pop(url)
+    cache["changed"].discard(url)
+    cache["removed"].add(url)
+    return release_body(cache, entry["body"])
+
+
+def store_page(cache, url, headers, digest, size, now):
+    """
+    Save the index entry of a downloaded page whose body file is already written. The body the URL had before is
+    deleted if no other URL uses it.
+    """
+    old_entry = cache["entries"].get(url)
+    cache["entries"][url] = {
+        "body": digest,
+        "size": size,
+        "headers": {name: headers[name] for name in SAVED_HEADERS if name in headers},
+        "stored_at": now,
+        "lifetime": freshness_lifetime(headers, now),
+        "last_used": now,
+    }
+    cache["changed"].add(url)
+    cache["removed"].discard(url)
+    if old_entry is not None and old_entry["body"] != digest:
+        release_body(cache, old_entry["body"])
+    evict(cache, keep=url)
+
+
+def store_body(cache, body):
+    """
+    Write a body file, unless another URL saved the same bytes already.
+    :return: The SHA-256 of the body (its file name).
+    """
+    digest = hashlib.sha256(body).hexdigest()
+    if not os.path.exists(body_path(cache, digest)):
+        write_file_atomically(body_path(cache, digest), body)
+    return digest
+
+
+def save_while_reading(cache, url, response, now):
+    """
+    Save a streamed download (stream=True) while the scraper reads it: every chunk from iter_content() also goes to
+    a temporary file, and the page is saved once the last chunk was read. A download stopped early (ex: when there
+    is enough text to display) is not saved, so the cache never holds half a page, and memory stays bounded.
+    """
+    read_chunks = response.iter_content
+
+    def saved_chunks(chunk_size):
+        temp_path = body_path(cache, f"{os.getpid()}-{id(response)}.part")
+        hasher = hashlib.sha256()
+        size = 0
+        complete = False
+        try:
+            with open(temp_path, "wb") as file:
+                for chunk in read_chunks(chunk_size):
+                    file.write(chunk)
+                    hasher.update(chunk)
+                    size = size + len(chunk)
+                    yield chunk
+            digest = hasher.hexdigest()
+            if os.path.exists(body_path(cache, digest)):
+                os.remove(temp_path)  # Another URL saved the same bytes already
+            else:
+                os.replace(temp_path, body_path(cache, digest))
+            complete = True
+            store_page(cache, url, response.headers, digest, size, now)
+        finally:
+            cache["stats"]["bytes_downloaded"] = cache["stats"]["bytes_downloaded"] + size
+            if complete:
+                save_index(cache)
+            else:
+                try:
+                    os.remove(temp_path)
+                except OSError:
+                    pass
+
+    def iter_content(chunk_size=1, decode_unicode=False):
+        chunks = saved_chunks(chunk_size)
+        if decode_unicode:
+            return requests.utils.stream_decode_response_unicode(chunks, response)
+        return chunks
+
+    response.iter_content = iter_content  # response.content and response.text read through it as well
+
+
+def cache_size(cache):
+    """
+    :return: Bytes used by the saved bodies (a body shared by several URLs counts once).
+    """
+    sizes = {}
+    for entry in cache["entries"].values():
+        sizes[entry["body"]] = entry["size"]
+    return sum(sizes.values())
+
+
+def evict(cache, keep=None):
+    """
+    Remove the least recently used pages until the cache fits its size limit. A body file is deleted when no URL
+    uses it anymore.
+    :param cache: The cache dictionary.
+    :param keep: URL that must stay (the page being saved right now).
+    """
+    total = cache_size(cache)
+    if total <= cache["max_bytes"]:
+        return
+
+    for url in sorted(cache["entries"], key=lambda name: cache["entries"][name]["last_used"]):
+        if total <= cache["max_bytes"]:
+            break
+        if url == keep:
+            continue
+        size = cache["entries"][url]["size"]
+        cache["stats"]["evicted"] = cache["stats"]["evicted"] + 1
+        if remove_entry(cache, url):
+            total = total - size
+
+
+def get_page(url, timeout=REQUEST_TIMEOUT, offline=None, cache_dir=CACHE_DIR, stream=False):
+    """
+    Get a webpage through the cache, like requests.get(url, timeout=timeout, stream=stream).
+    :param url: URL of the page.
+    :param timeout: Seconds to wait for the server.
+    :param offline: True to only use saved pages (None: use SCRAPER_OFFLINE).
+    :param cache_dir: Folder of the cache.
+    :param stream: True to leave a downloaded body unread, to be read in pieces (it is saved once it is read to the
+                   end). A saved page is returned already read, as it comes from disk.
+    :return: A requests.Response, from the cache or from the server.
+    :raises requests.exceptions.RequestException: If the page can't be downloaded and no saved copy can be used,
+            ex: in offline mode when the page was never saved.
+    """
+    cache = open_cache(cache_dir)
+    stats = cache["stats"]
+    offline = OFFLINE if offline is None else offline
+    now = time.time()
+    stats["requests"] = stats["requests"] + 1
+
+    entry = cache["entries"].get(url)
+    body = read_body(cache, entry) if entry is not None else None
+    if entry is not None and body is None:
+        remove_entry(cache, url)  # Its body file is gone (or broken), so the entry is useless
+        entry = None
+
+    # Step 1: A fresh saved copy (or any saved copy in offline mode) is used without touching the network.
+    if entry is not None and (offline or now - entry["stored_at"] < entry["lifetime"]):
+        stats["hits"] = stats["hits"] + 1
+        stats["bytes_saved"] = stats["bytes_saved"] + entry["size"]
+        entry["last_used"] = now
+        cache["changed"].add(url)  # Written when the program ends, not on every hit
+        return cached_response(url, entry, body)
+    if offline:
+        stats["offline_misses"] = stats["offline_misses"] + 1
+        # Not a ConnectionError: the network wasn't tried, so there is nothing to retry
+        raise requests.exceptions.RequestException(f"Offline mode: {url} is not in the page cache")
+
+    # Step 2: Ask the server, sending the validators of the saved copy (conditional GET).
+    headers = {}
+    if entry is not None:
+        if entry["headers"].get("ETag"):
+            headers["If-None-Match"] = entry["headers"]["ETag"]
+        if entry["headers"].get("Last-Modified"):
+            headers["If-Modified-Since"] = entry["headers"]["Last-Modified"]
+    try:
+        response = get_session().get(url, headers=headers, timeout=timeout, stream=stream)
+    except requests.exceptions.RequestException as e:
+        # The server can't be reached: a stale copy is better than nothing, unless the page forbids it.
+        if not may_serve_stale(entry):
+            raise
+        print(f"Warning: Unable to reach the website ({e}). Using the saved copy.")
+        stats["stale_served"] = stats["stale_served"] + 1
+        return cached_response(url, entry, body)
+
+    # Step 3a: 304 Not Modified, the saved copy is still correct: refresh its headers and use it.
+    if response.status_code == 304 and entry is not None:
+        response.close()
+        for name in SAVED_HEADERS:
+            if name in response.headers:
+                entry["headers"][name] = response.headers[name]
+        entry["stored_at"] = now
+        entry["lifetime"] = freshness_lifetime(CaseInsensitiveDict(entry["headers"]), now)
+        entry["last_used"] = now
+        cache["changed"].add(url)
+        stats["revalidated"] = stats["revalidated"] + 1
+        stats["bytes_saved"] = stats["bytes_saved"] + entry["size"]
+        save_index(cache)
+        return cached_response(url, entry, body)
+
+    # Step 3b: A server error says nothing about the page, so the saved copy is kept, and used if it may be stale.
+    if response.status_code >= 500 and entry is not None:
+        if may_serve_stale(entry):
+            response.close()
+            print(f"Warning: The website answered {response.status_code}. Using the saved copy.")
+            stats["stale_served"] = stats["stale_served"] + 1
+            return cached_response(url, entry, body)
+        return response
+
+    # Step 3c: A new page was sent. Save it if it may be saved.
+    stats["downloads"] = stats["downloads"] + 1
+    if url in cache["entries"] and is_replaced(response):
+        remove_entry(cache, url)  # The page is gone, or changed to something that can't be saved
+    if stream and is_storable(response):
+        save_while_reading(cache, url, response, now)  # Saved (and counted) once the scraper read all of it
+    elif not stream:
+        stats["bytes_downloaded"] = stats["bytes_downloaded"] + len(response.content)
+        if is_storable(response):
+            store_page(cache, url, response.headers, store_body(cache, response.content), len(response.content), now)
+    save_index(cache)
+    return response
+
+
+def print_stats(cache):
+    """
+    Display the hit rate and the bytes saved.
+    :param cache: The cache dictionary.
+    """
+    stats = cache["stats"]
+    served = stats["hits"] + stats["revalidated"] + stats["stale_served"]
+    hit_rate = served / stats["requests"] * 100 if stats["requests"] else 0
+    unique_bodies = len({entry["body"] for entry in cache["entries"].values()})
+    print(f"\n{'Page Cache: ' + cache['dir']:^60}")
+    print("=" * 60)
+    print(f"{'Requests':<40}{stats['requests']:>20,}")
+    print(f"{'  Fresh hits':<40}{stats['hits']:>20,}")
+    print(f"{'  Revalidated (304)':<40}{stats['revalidated']:>20,}")
+    print(f"{'  Stale copy (website down or failing)':<40}{stats['stale_served']:>20,}")
+    print(f"{'  Downloaded':<40}{stats['downloads']:>20,}")
+    print(f"{'  Offline misses':<40}{stats['offline_misses']:>20,}")
+    print(f"{'Hit rate':<40}{hit_rate:>19.1f}%")
+    print(f"{'Bytes saved (not downloaded)':<40}{stats['bytes_saved']:>20,}")
+    print(f"{'Bytes downloaded':<40}{stats['bytes_downloaded']:>20,}")
+    print("-" * 60)
+    print(f"{'Saved URLs':<40}{len(cache['entries']):>20,}")
+    print(f"{'Stored bodies (same bytes stored once)':<40}{unique_bodies:>20,}")
+    print(f"{'Cache size (bytes)':<40}{cache_size(cache):>20,}")
+    print(f"{'Evicted (least recently used)':<40}{stats['evicted']:>20,}")
+    print("=" * 60)
+
+
+def clear_cache(cache_dir=CACHE_DIR):
+    """
+    Remove every saved page and reset the statistics.
+    :param cache_dir: Folder of the cache.
+    """
+    cache = open_cache(cache_dir)
+    for name in os.listdir(os.path.join(cache_dir, "bodies")):  # Also files left behind by older versions
+        try:
+            os.remove(os.path.join(cache_dir, "bodies", name))
+        except OSError:
+            pass
+    cache["entries"] = {}
+    cache["stats"] = dict(NEW_STATS)
+    cache["saved_stats"] = dict(NEW_STATS)
+    cache["changed"] = set()
+    cache["removed"] = set()
+    data = json.dumps({"entries": {}, "stats": cache["stats"]}).encode("utf-8")
+    write_file_atomically(os.path.join(cache_dir, "index.json"), data)  # Not merged: everything is removed
+
+
+def run_benchmark(pages=50, variants=2, delay=0.02):
+    """
+    Visit every URL several times against a local stand-in website and show what the cache saved each round.
+    Every page is reachable under a few URLs that only differ in a tracking parameter, so the bodies are identical.
+    :param pages: Number of different pages.
+    :param variants: URLs per page (?ref=0, ?ref=1, ...).
+    :param delay: Seconds the stand-in website waits before answering.
+    """
+    from scraper_stand_in_server import start_stand_in_server, stop_stand_in_server
+
+    server, base_url = start_stand_in_server(delay, max_age=300)
+    urls = [f"{base_url}/page/{number}?ref={variant}" for variant in range(variants) for number in range(pages)]
+    rounds = []
+
+    def visit(name, cache_dir, offline=False):
+        counts_before = (server.settings["requests"], server.settings["bytes_sent"])
+        start_time = time.perf_counter()
+        for url in urls:
+            get_page(url, offline=offline, cache_dir=cache_dir)
+        rounds.append((name, time.perf_counter() - start_time, server.settings["requests"] - counts_before[0],
+                       server.settings["bytes_sent"] - counts_before[1]))
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache_dir = os.path.join(temp_dir, "cache")
+        visit("Cold (empty cache)", cache_dir)
+        visit("Warm (fresh, max-age=300)", cache_dir)
+        for url, entry in caches[cache_dir]["entries"].items():
+            entry["stored_at"] = entry["stored_at"] - 3600  # An hour later: every page is stale
+            caches[cache_dir]["changed"].add(url)
+        visit("An hour later (revalidate, 304)", cache_dir)
+        stop_stand_in_server(server)
+        visit("Offline, website down", cache_dir, offline=True)
+
+        print(f"\n{'Page Cache: ' + str(len(urls)) + ' URLs (' + str(pages) + ' different pages) per round':^76}")
+        print("=" * 76)
+        print(f"{'Round':<34}{'Seconds':>10}{'Server requests':>16}{'Bytes sent':>16}")
+        print("-" * 76)
+        for name, seconds, server_requests, bytes_sent in rounds:
+            print(f"{name:<34}{seconds:>10.2f}{server_requests:>16,}{bytes_sent:>16,}")
+        print("=" * 76)
+        print_stats(caches[cache_dir])
+
+        # A cache that only fits a few pages keeps the most recently used ones.
+        small_dir = os.path.join(temp_dir, "small")
+        server, base_url = start_stand_in_server()
+        page_size = len(get_page(f"{base_url}/page/0", cache_dir=small_dir).content)
+        small = caches[small_dir]
+        small["max_bytes"] = page_size * 10
+        for number in range(1, pages):
+            get_page(f"{base_url}/page/{number}", cache_dir=small_dir)
+        stop_stand_in_server(server)
+        print(f"LRU with room for about 10 pages: {len(small['entries'])} kept, {small['stats']['evicted']} evicted, "
+              f"{cache_size(small):,} of {small['max_bytes']:,} bytes used.")
+
+
+def main():
+    command = sys.argv[1] if len(sys.argv) > 1 else "stats"
+    if command == "stats":
+        print_stats(open_cache())
+    elif command == "clear":
+        clear_cache()
+        print(f"The page cache in {CACHE_DIR} is empty.")
+    elif command == "benchmark":
+        run_benchmark()
+    else:
+        print("Usage: python page_cache.py [stats | clear | benchmark]")
+
+
+if __name__ == "__main__":
+    main()
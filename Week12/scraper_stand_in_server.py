@@ -0,0 +1,206 @@
+"""
+Author: Lavell McGrone
+Date: 2026-10-18
+Description: A small local HTTP server that stands in for the websites the scrapers download. Every path gets a
+             made-up HTML page (a title, a menu, paragraphs of text, some script and style), generated from the path,
+             so the same URL always returns the same page. The query string is ignored, so /page/1?ref=news and
+             /page/1 are the same page, like tracking parameters on a real website. Paths under /forecast/ get a
+             forecast page laid out like the National Weather Service's (the page weather_data.py scrapes), with a
+             detailed forecast in forecast-label / forecast-text rows. Pages come with an ETag and an
+             optional Cache-Control max-age, and conditional GETs are answered with 304 Not Modified. It keeps
+             connections alive, can be slowed down on purpose, and runs in a background thread so benchmarks can talk
+             to it without the internet.
+             It can also misbehave on purpose (fault injection), like a flaky website: a share of the requests gets a
+             503 Service Unavailable (or another error status, with an optional Retry-After), has its connection
+             dropped without an answer, or hangs for longer than a client's timeout. The faults are picked by a
+             seeded random generator, so every run sees the same ones.
+"""
+
+import hashlib
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# A well-behaved server: no faults unless start_stand_in_server() is asked for them
+NO_FAULTS = {"error_rate": 0.0, "error_status": 503, "reset_rate": 0.0, "hang_rate": 0.0, "hang_seconds": 2.0,
+             "retry_after": None}
+
+WORDS = ("forecast", "pizza", "river", "north", "cloudy", "market", "student", "library", "python", "winter",
+         "sunny", "coffee", "garden", "station", "evening", "report", "wind", "breeze", "city", "program")
+
+
+def make_page(path, paragraphs=40):
+    """
+    Build the synthetic HTML page for a path.
+    :param path: URL path, ex: "/page/17". The same path always gives the same page, whatever the query string.
+    :param paragraphs: Number of text paragraphs in the page.
+    :return: The page as bytes.
+    """
+    path = path.split("?")[0]
+    generator = random.Random(path)
+    parts = [f"<!DOCTYPE html><html><head><title>Stand-in page {path}</title>",
+             "<style>body { font-family: sans-serif; } .forecast-label { font-weight: bold; }</style>",
+             "<script>var visits = 0; function count() { visits = visits + 1; }</script></head><body>",
+             "<nav><ul><li><a href='/'>Home</a></li><li><a href='/news'>News</a></li></ul></nav>",
+             f"<h1>Page {path}</h1>"]
+    for unused_value in range(paragraphs):
+        sentence = " ".join(generator.choice(WORDS) for unused_word in range(generator.randint(20, 60)))
+        parts.append(f"<p class='text'>{sentence.capitalize()}.</p>")
+    parts.append("<footer>Served by the stand-in server</footer></body></html>")
+    return "\n".join(parts).encode("utf-8")
+
+
+PERIODS = ("Today", "Tonight", "Monday", "Monday Night", "Tuesday", "Tuesday Night", "Wednesday", "Wednesday Night",
+           "Thursday", "Thursday Night", "Friday", "Friday Night", "Saturday", "Saturday Night")
+SKIES = ("Sunny", "Mostly sunny", "Partly cloudy", "Mostly cloudy", "Cloudy", "A chance of showers",
+         "Showers and thunderstorms likely", "Patchy fog", "Light snow")
+
+
+def make_forecast_page(path, links=1200):
+    """
+    Build a synthetic forecast page for a path, laid out like forecast.weather.gov: scripts and styles, a long menu,
+    the seven-day tombstones, current conditions, the detailed forecast rows and a footer full of links.
+    :param path: URL path, ex: "/forecast/55401". The same path always gives the same page, whatever the query string.
+    :param links: Number of links in the menu and footer (most of a real page is not the forecast).
+    :return: The page as bytes.
+    """
+    path = path.split("?")[0]
+    generator = random.Random(path)
+    temperatures = [generator.randint(20, 90) for unused_value in PERIODS]
+    parts = [f"<!DOCTYPE html><html lang='en'><head><title>7-Day Forecast for {path}</title>",
+             "<meta charset='utf-8'><link rel='stylesheet' href='/css/bootstrap.css'>",
+             "<style>.forecast-label { font-weight: bold; } .tombstone-container { float: left; }</style>",
+             "<script>var forecast = {'labels': ['<b>none</b>']}; function load() { return forecast; }</script>",
+             "</head><body><header><nav class='navbar'><ul>"]
+    for number in range(links // 2):
+        parts.append(f"<li><a href='/menu/{number}'>Menu item {number}</a></li>")
+    parts.append("</ul></nav></header><div id='seven-day-forecast'><ul id='seven-day-forecast-list'>")
+    for period, temperature in zip(PERIODS[:9], temperatures):
+        parts.append(f"<li class='forecast-tombstone'><div class='tombstone-container'>"
+                     f"<p class='period-name'>{period}</p><p><img src='/icons/{period[:3].lower()}.png' alt=''></p>"
+                     f"<p class='short-desc'>{generator.choice(SKIES)}</p>"
+                     f"<p class='temp temp-high'>High: {temperature} &deg;F</p></div></li>")
+    parts.append("</ul></div><div id='current_conditions-summary'><table><tr><td>Humidity</td>"
+                 f"<td>{generator.randint(10, 100)}%</td></tr><tr><td>Wind Speed</td>"
+                 f"<td>NW {generator.randint(0, 25)} mph</td></tr></table></div>")
+    parts.append("<div id='detailed-forecast'><h2 class='panel-title'>Detailed Forecast</h2>"
+                 "<div class='panel-body' id='detailed-forecast-body'>")
+    for number, (period, temperature) in enumerate(zip(PERIODS, temperatures)):
+        row = "row-odd" if number % 2 == 0 else "row-even"
+        text = (f"{generator.choice(SKIES)}, with a {'high' if 'Night' not in period else 'low'} near {temperature}. "
+                f"{generator.choice(('North', 'South', 'East', 'West'))} wind {generator.randint(0, 10)} to "
+                f"{generator.randint(10, 25)} mph. Chance of precipitation is {generator.randint(0, 10) * 10}%.")
+        parts.append(f"<div class='row {row} row-forecast'><div class='col-sm-2 forecast-label'><b>{period}</b>"
+                     f"</div><div class='col-sm-10 forecast-text'>{text}</div></div>")
+    parts.append("</div></div><footer><ul>")
+    for number in range(links - links // 2):
+        parts.append(f"<li><a href='/footer/{number}'>Footer link {number}</a></li>")
+    parts.append("</ul><p>National Weather Service (stand-in)</p></footer></body></html>")
+    return "\n".join(parts).encode("utf-8")
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """
+    Answers every GET request with the synthetic page for its path.
+    """
+    protocol_version = "HTTP/1.1"  # Keep-alive, so pooled sessions can reuse their connections
+    disable_nagle_algorithm = True  # Headers and body are sent separately, don't let the body wait for an ACK
+
+    def do_GET(self):
+        settings = self.server.settings
+        with settings["lock"]:
+            settings["requests"] = settings["requests"] + 1
+            draw = settings["random"].random()
+        faults = settings["faults"]
+        if draw < faults["error_rate"]:
+            self.send_response(faults["error_status"])
+            if faults["retry_after"] is not None:
+                self.send_header("Retry-After", str(faults["retry_after"]))
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        draw = draw - faults["error_rate"]
+        if draw < faults["reset_rate"]:
+            self.close_connection = True  # Hang up without answering
+            return
+        draw = draw - faults["reset_rate"]
+        if draw < faults["hang_rate"]:
+            time.sleep(faults["hang_seconds"])  # Longer than the client waits, so it times out
+        if settings["delay"]:
+            time.sleep(settings["delay"])  # Pretend to be a website on the other side of the internet
+
+        path = self.path.split("?")[0]
+        with settings["lock"]:
+            page = settings["pages"].get(path)
+            if page is None:  # Every page is only built once, so large pages don't slow down the benchmarks
+                if path.startswith("/forecast/"):
+                    body = make_forecast_page(path)
+                else:
+                    body = make_page(path, settings["paragraphs"])
+                page = (body, '"' + hashlib.sha1(body).hexdigest() + '"')
+                settings["pages"][path] = page
+        body, etag = page
+
+        # Conditional GET: the client already has this version, so only send the headers back
+        if self.headers.get("If-None-Match") == etag:
+            with settings["lock"]:
+                settings["not_modified"] = settings["not_modified"] + 1
+            self.send_response(304)
+            self.send_cache_headers(etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        with settings["lock"]:
+            settings["bytes_sent"] = settings["bytes_sent"] + len(body)
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_cache_headers(etag)
+        self.end_headers()
+        try:
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True  # The client stopped reading early, ex: it had enough text
+
+    def send_cache_headers(self, etag):
+        self.send_header("ETag", etag)
+        if self.server.settings["max_age"] is not None:
+            self.send_header("Cache-Control", f"max-age={self.server.settings['max_age']}")
+
+    def log_message(self, format, *args):
+        pass  # Keep the console quiet while benchmarks run
+
+
+def start_stand_in_server(delay=0.0, paragraphs=40, max_age=None, faults=None, seed=0):
+    """
+    Start the stand-in server on a free local port in a background thread.
+    :param delay: Seconds to wait before answering each request.
+    :param paragraphs: Number of text paragraphs in every page.
+    :param max_age: Seconds pages may be cached (sent as Cache-Control: max-age), or None to send no Cache-Control.
+    :param faults: Share of requests (0 to 1) that fail, ex: {"error_rate": 0.3, "reset_rate": 0.1}. The keys are
+                   "error_rate" (answered with "error_status", 503 by default), "reset_rate" (connection dropped),
+                   "hang_rate" (no answer for "hang_seconds") and "retry_after" (seconds sent with every error answer,
+                   None for no header).
+    :param seed: Seed of the random generator that picks the faults.
+    :return: A tuple of (server, base URL). server.settings counts the "requests" it answered, how many were
+             "not_modified" (304) and the "bytes_sent" in page bodies. Change the settings to change the server
+             while it runs.
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    server.daemon_threads = True
+    server.settings = {"delay": delay, "paragraphs": paragraphs, "max_age": max_age, "pages": {}, "requests": 0,
+                       "not_modified": 0, "bytes_sent": 0, "lock": threading.Lock(), "random": random.Random(seed),
+                       "faults": dict(NO_FAULTS, **(faults or {}))}
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def stop_stand_in_server(server):
+    """
+    Stop the stand-in server and free its port.
+    :param server: The server returned by start_stand_in_server().
+    """
+    server.shutdown()
+    server.server_close()
@@ -0,0 +1,244 @@
+"""
+Author: Lavell McGrone
+Date: 2026-10-18
+Description: Streaming HTML-to-text extraction. BeautifulSoup builds a tree of the whole page before get_text() can
+             return anything, so a page of several megabytes costs many times its size in memory, even when only the
+             first 1000 characters are shown. Here the page is read in chunks (iter_content), every chunk goes
+             through an incremental HTML tokenizer (html.parser, the same one BeautifulSoup uses with "html.parser"),
+             and the text comes out as a generator while the page is still downloading. With a limit, the download
+             stops as soon as enough text was found.
+             The text is the same as BeautifulSoup(html, "html.parser").get_text(separator="\n").strip(): script,
+             style and template contents, comments and the doctype are left out, and text that is only whitespace
+             becomes a single newline or space (except inside <pre> and <textarea>).
+
+Usage:       python stream_text.py          (benchmark: peak memory and time against the BeautifulSoup path)
+"""
+
+import codecs
+import time
+import tracemalloc
+from html.parser import HTMLParser
+
+CHUNK_SIZE = 16 * 1024  # Bytes read from the response at a time
+HIDDEN_TAGS = ("script", "style", "template")  # get_text() leaves out the text inside these
+PRESERVE_WHITESPACE_TAGS = ("pre", "textarea")
+ASCII_SPACES = " \n\t\x0c\r"
+
+
+class TextTokenizer(HTMLParser):
+    """
+    Collects the text strings of an HTML page as it is fed, without building a tree.
+    Text between two tags can arrive in several pieces, so the pieces are joined and the finished string is only
+    handed out at the next tag, comment or declaration, the same way BeautifulSoup ends its strings.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.pending = []  # Pieces of the string that is being read
+        self.finished = []  # Finished strings that were not taken yet
+        self.hidden = 0  # Open script/style/template tags
+        self.preserve = 0  # Open pre/textarea tags
+
+    def end_string(self):
+        if not self.pending:
+            return
+        text = "".join(self.pending)
+        self.pending = []
+        if self.hidden:
+            return
+        if not self.preserve and text.strip(ASCII_SPACES) == "":
+            text = "\n" if "\n" in text else " "
+        self.finished.append(text)
+
+    def handle_starttag(self, tag, attrs):
+        self.end_string()
+        if tag in HIDDEN_TAGS:
+            self.hidden = self.hidden + 1
+        elif tag in PRESERVE_WHITESPACE_TAGS:
+            self.preserve = self.preserve + 1
+
+    def handle_startendtag(self, tag, attrs):
+        self.end_string()  # <br/> and friends have no text inside
+
+    def handle_endtag(self, tag):
+        self.end_string()
+        if tag in HIDDEN_TAGS and self.hidden:
+            self.hidden = self.hidden - 1
+        elif tag in PRESERVE_WHITESPACE_TAGS and self.preserve:
+            self.preserve = self.preserve - 1
+
+    def handle_data(self, data):
+        self.pending.append(data)
+
+    def handle_comment(self, data):
+        self.end_string()
+
+    def handle_decl(self, decl):
+        self.end_string()
+
+    def handle_pi(self, data):
+        self.end_string()
+
+    def unknown_decl(self, data):
+        self.end_string()
+        if data.startswith("CDATA[") and not self.hidden:
+            self.finished.append(data[len("CDATA["):])  # get_text() keeps CDATA sections
+
+    def take_strings(self):
+        """
+        :return: The strings finished since the last call.
+        """
+        strings = self.finished
+        self.finished = []
+        return strings
+
+    def close(self):
+        super().close()
+        self.end_string()  # Text after the last tag
+
+
+def iter_text(html_pieces, limit=None, separator="\n"):
+    """
+    Turn HTML, given in pieces, into text as it arrives.
+    :param html_pieces: An iterable of strings, ex: a whole page as [html] or the decoded chunks of a download.
+    :param limit: Stop after this many characters of text (None for the whole page). Nothing after that is read.
+    :param separator: Put between two strings, like get_text(separator=...).
+    :return: A generator of text chunks. Joined together they are get_text(separator).strip(), cut at the limit.
+    """
+    tokenizer = TextTokenizer()
+    started = False  # Leading whitespace is dropped until the first real text
+    first = True  # No separator before the first string
+    held = ""  # Whitespace at the end is held back until more text follows, so it can be dropped at the very end
+    produced = 0
+    finished = False
+    html_pieces = iter(html_pieces)
+
+    while not finished:
+        piece = next(html_pieces, None)
+        if piece is None:
+            tokenizer.close()
+            finished = True
+        else:
+            tokenizer.feed(piece)
+
+        for string in tokenizer.take_strings():
+            text = string if first else separator + string
+            first = False
+            if not started:
+                text = text.lstrip()
+                if not text:
+                    continue
+                started = True
+            body = text.rstrip()
+            if not body:
+                held = held + text
+                continue
+            chunk = held + body
+            held = text[len(body):]
+            if limit is not None and produced + len(chunk) >= limit:
+                yield chunk[:limit - produced]
+                return  # Enough text: stop reading the page
+            produced = produced + len(chunk)
+            yield chunk
+
+
+def iter_response_text(response, limit=None, chunk_size=CHUNK_SIZE, separator="\n"):
+    """
+    Extract the text of a streamed download, ex: requests.get(url, stream=True).
+    The bytes are decoded with the encoding requests would use for response.text when the server names one.
+    :param response: A requests.Response opened with stream=True.
+    :param limit: Stop after this many characters of text (None for the whole page). The rest is never downloaded.
+    :param chunk_size: Bytes read at a time.
+    :param separator: Put between two strings, like get_text(separator=...).
+    :return: A generator of text chunks.
+    """
+    decoder = codecs.getincrementaldecoder(response.encoding or "utf-8")(errors="replace")
+
+    def decoded_chunks():
+        for chunk in response.iter_content(chunk_size):
+            yield decoder.decode(chunk)
+        yield decoder.decode(b"", final=True)
+
+    try:
+        yield from iter_text(decoded_chunks(), limit, separator)
+    finally:
+        response.close()  # Also after stopping early, so the rest of the page is not downloaded
+
+
+def soup_text(url, limit=None):
+    """
+    The old way, for comparison: download the whole page, build the tree, take all the text, then cut it.
+    :param url: URL of the page.
+    :param limit: Characters to keep (None for all).
+    :return: The text.
+    """
+    import requests
+    from bs4 import BeautifulSoup
+
+    response = requests.get(url, timeout=10)
+    text = BeautifulSoup(response.text, "html.parser").get_text(separator="\n").strip()
+    return text if limit is None else text[:limit]
+
+
+def streamed_text(url, limit=None):
+    """
+    :param url: URL of the page.
+    :param limit: Characters to keep (None for all).
+    :return: The text, extracted while the page downloads.
+    """
+    import requests
+
+    return "".join(iter_response_text(requests.get(url, timeout=10, stream=True), limit))
+
+
+def measure(function, url, limit):
+    """
+    :return: A tuple of (text, seconds, peak bytes allocated). The time is measured without tracemalloc running.
+    """
+    start_time = time.perf_counter()
+    text = function(url, limit)
+    seconds = time.perf_counter() - start_time
+    tracemalloc.start()
+    function(url, limit)
+    unused_value, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return text, seconds, peak
+
+
+def run_benchmark(paragraphs=20_000, limit=1000):
+    """
+    Compare peak memory and time of the soup path and the streaming path on a large page from the stand-in server.
+    :param paragraphs: Paragraphs in the page (20,000 is about 6 MB of HTML).
+    :param limit: Characters shown by data_download.py.
+    """
+    from scraper_stand_in_server import make_page, start_stand_in_server, stop_stand_in_server
+
+    server, base_url = start_stand_in_server(paragraphs=paragraphs)
+    url = base_url + "/page/large"
+    page_size = len(make_page("/page/large", paragraphs))
+    soup_text(url)  # Warm up: the server builds the page on the first request
+
+    results = []
+    for name, function, text_limit in (("BeautifulSoup, whole page", soup_text, None),
+                                       ("Streaming, whole page", streamed_text, None),
+                                       (f"BeautifulSoup, first {limit:,} chars", soup_text, limit),
+                                       (f"Streaming, first {limit:,} chars", streamed_text, limit)):
+        text, seconds, peak = measure(function, url, text_limit)
+        results.append((name, text, seconds, peak))
+    stop_stand_in_server(server)
+
+    if results[0][1] != results[1][1] or results[2][1] != results[3][1]:
+        raise RuntimeError("The streaming text doesn't match BeautifulSoup's get_text()")
+
+    print(f"\n{'HTML to Text: ' + format(page_size / 1_000_000, '.1f') + ' MB page':^76}")
+    print("=" * 76)
+    print(f"{'Path':<36}{'Time (ms)':>14}{'Peak memory (MB)':>26}")
+    print("-" * 76)
+    for name, unused_value, seconds, peak in results:
+        print(f"{name:<36}{seconds * 1000:>14.1f}{peak / 1_000_000:>26.2f}")
+    print("=" * 76)
+    print("Both paths produced the same text. Peak memory is what Python allocated (tracemalloc).")
+
+
+if __name__ == "__main__":
+    run_benchmark()
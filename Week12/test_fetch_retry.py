@@ -0,0 +1,136 @@
+"""
+Author: Lavell McGrone
+Date: 2026-10-18
+Description: Tests of fetch_retry.py against the fault-injecting stand-in server (scraper_stand_in_server.py),
+             which is switched between healthy and failing while a test runs. No internet needed.
+
+Usage:       python -m pytest test_fetch_retry.py
+"""
+
+import time
+
+import pytest
+import requests
+
+import fetch_retry
+from scraper_stand_in_server import start_stand_in_server, stop_stand_in_server
+
+
+@pytest.fixture
+def server():
+    server, base_url = start_stand_in_server()
+    yield server, base_url
+    stop_stand_in_server(server)
+
+
+def no_wait(seconds):
+    pass
+
+
+def test_retry_then_success(server):
+    server, base_url = server
+    server.settings["faults"]["error_rate"] = 1.0
+
+    def heal(seconds):  # The website comes back while the fetcher waits to retry
+        server.settings["faults"]["error_rate"] = 0.0
+
+    fetcher = fetch_retry.new_fetcher(sleep=heal)
+    response = fetch_retry.fetch(f"{base_url}/page/1", fetcher=fetcher)
+    assert response.status_code == 200
+    assert server.settings["requests"] == 2
+    assert fetcher["metrics"]["retries"] == 1
+    assert fetcher["metrics"]["successes"] == 1
+
+
+def test_connection_errors_are_retried(server):
+    server, base_url = server
+    server.settings["faults"]["reset_rate"] = 1.0
+
+    def heal(seconds):
+        server.settings["faults"]["reset_rate"] = 0.0
+
+    fetcher = fetch_retry.new_fetcher(sleep=heal)
+    assert fetch_retry.fetch(f"{base_url}/page/1", fetcher=fetcher).status_code == 200
+    assert fetcher["metrics"]["retries"] == 1
+
+
+def test_retry_budget_runs_out(server):
+    server, base_url = server
+    server.settings["faults"]["error_rate"] = 1.0
+    fetcher = fetch_retry.new_fetcher(max_attempts=4, budget_ratio=0.0, min_retries=2, failure_threshold=10 ** 9,
+                                      sleep=no_wait)
+
+    first = fetch_retry.fetch(f"{base_url}/page/1", fetcher=fetcher)
+    second = fetch_retry.fetch(f"{base_url}/page/2", fetcher=fetcher)
+    assert first.status_code == 503 and second.status_code == 503  # The last answer is handed back
+    assert fetcher["metrics"]["retries"] == 2
+    assert fetcher["metrics"]["budget_exhausted"] == 2
+    assert server.settings["requests"] == 4  # 1 + 2 retries, then 1 without a retry
+
+
+def test_circuit_opens_half_opens_and_closes(server):
+    server, base_url = server
+    server.settings["faults"]["error_rate"] = 1.0
+    fetcher = fetch_retry.new_fetcher(max_attempts=1, failure_threshold=2, cooldown=0.2, sleep=no_wait)
+    host = base_url.split("//")[1]
+    url = f"{base_url}/page/1"
+
+    fetch_retry.fetch(url, fetcher=fetcher)
+    assert fetcher["hosts"][host]["state"] == "closed"
+    fetch_retry.fetch(url, fetcher=fetcher)
+    assert fetcher["hosts"][host]["state"] == "open"
+
+    # Open: requests fail right away, without reaching the website
+    with pytest.raises(requests.exceptions.ConnectionError):
+        fetch_retry.fetch(url, fetcher=fetcher)
+    assert server.settings["requests"] == 2
+    assert fetcher["metrics"]["short_circuited"] == 1
+
+    # After the cooldown one trial request goes out while the circuit is half-open; it fails, so it opens again
+    time.sleep(0.25)
+    states = []
+
+    def get(url, timeout):
+        states.append(fetcher["hosts"][host]["state"])
+        return requests.get(url, timeout=timeout)
+
+    fetch_retry.fetch(url, get, fetcher=fetcher)
+    assert states == ["half-open"]
+    assert fetcher["hosts"][host]["state"] == "open"
+
+    # The next trial succeeds and closes the circuit
+    server.settings["faults"]["error_rate"] = 0.0
+    time.sleep(0.25)
+    assert fetch_retry.fetch(url, get, fetcher=fetcher).status_code == 200
+    assert states == ["half-open", "half-open"]
+    assert fetcher["hosts"][host]["state"] == "closed"
+    assert fetcher["hosts"][host]["failures"] == 0
+    assert fetcher["metrics"]["circuits_opened"] == 2
+
+
+def test_client_errors_are_not_retried(server):
+    server, base_url = server
+    server.settings["faults"].update(error_rate=1.0, error_status=404)
+    fetcher = fetch_retry.new_fetcher(failure_threshold=1, sleep=no_wait)
+
+    assert fetch_retry.fetch(f"{base_url}/page/1", fetcher=fetcher).status_code == 404
+    assert server.settings["requests"] == 1
+    assert fetcher["metrics"]["retries"] == 0
+    assert fetcher["hosts"][base_url.split("//")[1]]["state"] == "closed"  # A 404 says nothing about the website
+
+
+def test_broken_urls_are_not_retried():
+    fetcher = fetch_retry.new_fetcher(sleep=no_wait)
+    with pytest.raises(requests.exceptions.MissingSchema):
+        fetch_retry.fetch("www.example.com", fetcher=fetcher)
+    assert fetcher["metrics"]["attempts"] == 1
+
+
+def test_latencies_are_capped(server):
+    server, base_url = server
+    fetcher = fetch_retry.new_fetcher()
+    session = requests.Session()
+    for number in range(fetch_retry.LATENCY_SAMPLES + 50):
+        fetch_retry.fetch(f"{base_url}/page/{number % 5}", session.get, fetcher=fetcher)
+    assert fetcher["metrics"]["attempts"] == fetch_retry.LATENCY_SAMPLES + 50
+    assert len(fetcher["latencies"]) == fetch_retry.LATENCY_SAMPLES
@@ -6,9 +6,8 @@ If successful, it displays the weather conditions and time periods in a formatte
 prompted to try again.
 """
 
-import requests  # For making HTTP requests
-from bs4 import BeautifulSoup  # For parsing HTML
-import pyinputplus as pyip  # For input validation
+# requests, the forecast parser and pyinputplus take a while to import, so each one is imported inside the function
+# that uses it. The first prompt comes up right away, and the parser is only loaded once there is a page to parse.
 
 
 def main():
@@ -53,50 +52,60 @@ def process_webpage(webpage_url):  # Processing Function: Download and Parse Web
     This function is supposed to access the provided URL and extract weather data.
     If unsuccessful, it should handle errors and prompts the user to try again.
     """
-    try:
-        # Step 1: Inform the user that the program is attempting to access the webpage
-        print("\nAccessing the webpage...")
+    import requests  # For making HTTP requests (loaded on first use)
+    import page_cache  # Saved pages are reused instead of downloading them again
+    import fetch_retry  # Failed downloads are tried again with backoff (loaded on first use)
 
-        # Step 2: Send a GET request to the provided URL with a timeout of 10 seconds
-        response = requests.get(webpage_url, timeout=10)
-
-        # Step 3: Check if the status code is not 200 (success). If it's not, inform the user and restart.
-        # HTTP status code 200 indicates a successful response, the server has provided the requested webpage content.
-        # If the status code is not 200, it means something went wrong, for example,
-        # the webpage doesn't exist, there's a server issue, or the URL is invalid. This will prevent the program from
-        # processing invalid or incomplete data, which could lead to errors later in the code.
-        if response.status_code != 200:
-            print(f"Error encountered - Received status code {response.status_code}.")
-            print("The webpage could not be accessed. Please try again with a valid URL.")
-            return process_webpage(get_input())  # Restart with a new URL
-
-        # Step 4: Check if the content type of the response is not HTML
-        if "text/html" not in response.headers.get("Content-Type", ""):
-            print("Error encountered - The URL does not point to an HTML page.")
-            print("Please try again with a valid URL pointing to an HTML page.")
-            return process_webpage(get_input())  # Restart with a new URL
-
-        # Step 5: If the status code is 200 and content type is valid, inform the user of success
-        print("Webpage accessed successfully!")
-        print("\nExtracting forecast data from the webpage...")
-
-        # Step 6: Parse the HTML content using BeautifulSoup
-        soup = BeautifulSoup(response.text, "html.parser")
-
-        # Step 7: Extract forecast labels (time periods) from elements with the class 'forecast-label'
-        forecast_labels = [label.get_text() for label in soup.find_all(class_="forecast-label")]
-
-        # Step 8: Extract forecast text (weather descriptions) from elements with the class 'forecast-text'
-        forecast_text = [text.get_text() for text in soup.find_all(class_="forecast-text")]
-
-        # Step 9: Return the two lists (labels and text) for further processing
-        return forecast_labels, forecast_text
-
-    except requests.exceptions.RequestException as e:
-        # Step 10: Handle any request-related errors (invalid URL or network crashes)
-        print(f"Error during webpage access: {e}")
-        print("Please check the URL or your internet connection and try again.")
-        return process_webpage(get_input())  # Restart with a new URL
+    while True:  # Until a page was accessed: after an error the user enters a new URL and the loop goes around again
+        try:
+            # Step 1: Inform the user that the program is attempting to access the webpage
+            print("\nAccessing the webpage...")
+
+            # Step 2: Send a GET request to the provided URL with a timeout of 10 seconds
+            # It goes through the page cache: a saved copy is used while it is fresh, and after that the page is only
+            # downloaded again if the website says it changed. Set SCRAPER_OFFLINE=1 to only use saved pages.
+            # A failed download (timeout, dropped connection, 5xx) is tried a few more times with growing waits first,
+            # and a website that keeps failing is left alone for a while (fetch_retry.py).
+            response = fetch_retry.fetch(webpage_url, page_cache.get_page, timeout=10)
+
+            # Step 3: Check if the status code is not 200 (success). If it's not, inform the user and restart.
+            # HTTP status code 200 indicates a successful response, the server has provided the requested webpage
+            # content. If the status code is not 200, it means something went wrong, for example,
+            # the webpage doesn't exist, there's a server issue, or the URL is invalid. This will prevent the program
+            # from processing invalid or incomplete data, which could lead to errors later in the code.
+            if response.status_code != 200:
+                print(f"Error encountered - Received status code {response.status_code}.")
+                print("The webpage could not be accessed. Please try again with a valid URL.")
+                webpage_url = get_input()  # Ask for a new URL and try again
+                continue
+
+            # Step 4: Check if the content type of the response is not HTML
+            if "text/html" not in response.headers.get("Content-Type", ""):
+                print("Error encountered - The URL does not point to an HTML page.")
+                print("Please try again with a valid URL pointing to an HTML page.")
+                webpage_url = get_input()  # Ask for a new URL and try again
+                continue
+
+            # Step 5: If the status code is 200 and content type is valid, inform the user of success
+            print("Webpage accessed successfully!")
+            print("\nExtracting forecast data from the webpage...")
+
+            import forecast_extract  # For pulling out the forecast (loaded on first use, once there is a page)
+
+            # Step 6: Parse the HTML content in one pass that only keeps the forecast elements, instead of building
+            # a tree of the whole page and searching it once per class (forecast_extract.py).
+            # Step 7 and 8: Forecast labels (time periods) come from the elements with the class 'forecast-label', and
+            # forecast text (weather descriptions) from the elements with the class 'forecast-text'.
+            forecast_labels, forecast_text = forecast_extract.extract_forecast(response.text)
+
+            # Step 9: Return the two lists (labels and text) for further processing
+            return forecast_labels, forecast_text
+
+        except requests.exceptions.RequestException as e:
+            # Step 10: Handle any request-related errors (invalid URL or network crashes)
+            print(f"Error during webpage access: {e}")
+            print("Please check the URL or your internet connection and try again.")
+            webpage_url = get_input()  # Ask for a new URL and try again
 
 
 def display_output(forecast_labels, forecast_text):
@@ -131,6 +140,8 @@ def display_output(forecast_labels, forecast_text):
 # Restart Program Prompt using pyinputplus
 # inputYesNo ensures the user provides a valid yes or no response.
 def restart_program():
+    import pyinputplus as pyip  # For input validation (loaded on first use)
+
     restart = pyip.inputYesNo("Would you like to scrape another webpage? (yes/no): ").lower()
     return restart == 'yes'
 
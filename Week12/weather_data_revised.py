@@ -6,9 +6,8 @@ If successful, it displays the weather conditions and time periods in a formatte
 prompted to try again.  
 """
 
-import requests  # For making HTTP requests
-from bs4 import BeautifulSoup  # For parsing HTML content
-import pyinputplus as pyip  # For input validation
+# requests, the forecast parser and pyinputplus take a while to import, so each one is imported inside the function
+# that uses it. The first prompt comes up right away, and the parser is only loaded once there is a page to parse.
 
 
 def main():
@@ -46,9 +45,16 @@ def get_input():
 
 def process_webpage(webpage_url):
     """Downloads and parses the weather forecast webpage."""
+    import requests  # For making HTTP requests (loaded on first use)
+    import page_cache  # Saved pages are reused instead of downloading them again
+    import fetch_retry  # Failed downloads are tried again with backoff (loaded on first use)
+
     try:
         print("\nAccessing the webpage...")
-        response = requests.get(webpage_url, timeout=10)  # Make HTTP GET request with a 10-second timeout
+        # Make HTTP GET request with a 10-second timeout, through the page cache (saved pages are reused while fresh)
+        # A failed download (timeout, dropped connection, 5xx) is tried a few more times with growing waits first,
+        # and a website that keeps failing is left alone for a while (fetch_retry.py).
+        response = fetch_retry.fetch(webpage_url, page_cache.get_page, timeout=10)
 
         if response.status_code != 200:  # Check if the response status is successful
             print(f"Error: Received status code {response.status_code}. Please try again.")
@@ -59,11 +65,10 @@ def process_webpage(webpage_url):
             return None, None
 
         print("Webpage accessed successfully! Extracting forecast data...\n")
-        soup = BeautifulSoup(response.text, "html.parser")  # Parse the HTML content
+        import forecast_extract  # For pulling the forecast out of the page (loaded on first use)
 
-        # Extract forecast labels and descriptions from HTML elements
-        forecast_labels = [label.get_text() for label in soup.find_all(class_="forecast-label")]
-        forecast_text = [text.get_text() for text in soup.find_all(class_="forecast-text")]
+        # Extract forecast labels and descriptions from HTML elements, in one pass that only keeps those elements
+        forecast_labels, forecast_text = forecast_extract.extract_forecast(response.text)
 
         return forecast_labels, forecast_text  # Return extracted data
 
@@ -91,6 +96,8 @@ def display_output(forecast_labels, forecast_text):
 
 def restart_program():
     """Prompts the user to decide whether to restart the program."""
+    import pyinputplus as pyip  # For input validation (loaded on first use)
+
     return pyip.inputYesNo("Would you like to scrape another webpage? (yes/no): ").lower() == 'yes'
 
 